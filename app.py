@@ -1,6 +1,13 @@
+import os
+import re
+import time
+import threading
+import uuid
+from functools import partial
 from flask import Flask, render_template, request, jsonify
 from flask_cors import CORS
 import numpy as np
+import scipy.sparse as sp
 import traceback
 
 # --- Import các phương thức của Máy tính ma trận ---
@@ -8,6 +15,11 @@ from numerical_methods.linear_algebra.direct_methods.gauss_elimination import so
 from numerical_methods.linear_algebra.direct_methods.gauss_jordan import solve_gauss_jordan
 from numerical_methods.linear_algebra.direct_methods.lu_decomposition import solve_lu
 from numerical_methods.linear_algebra.direct_methods.cholesky import solve_cholesky
+from numerical_methods.linear_algebra.direct_methods.batch_solve import solve_batch
+from numerical_methods.linear_algebra.direct_methods.sparse_direct import solve_sparse_lu, solve_sparse_cholesky
+from numerical_methods.linear_algebra.direct_methods.structured import solve_structured
+from numerical_methods.linear_algebra.direct_methods.reordering import solve_with_rcm
+from numerical_methods.linear_algebra.direct_methods.out_of_core_lu import solve_lu_out_of_core
 from numerical_methods.linear_algebra.eigen.svd import calculate_svd
 from numerical_methods.linear_algebra.eigen.danilevsky import danilevsky_algorithm
 
@@ -29,18 +41,26 @@ from numerical_methods.root_finding.secant import solve_secant
 from numerical_methods.root_finding.newton import solve_newton
 from numerical_methods.root_finding.simple_iteration import solve_simple_iteration
 from utils.expression_parser import get_derivative
+from utils.matrix_parser import parse_matrix, should_densify, densify, DENSE_FALLBACK_MAX_SIZE, SMALL_MATRIX_SIZE
 
 from numerical_methods.nonlinear_systems.newton import solve_newton_system
 from numerical_methods.nonlinear_systems.newton_modified import solve_newton_modified_system
 from numerical_methods.nonlinear_systems.simple_iteration import solve_simple_iteration_system
+from numerical_methods.nonlinear_systems.newton_krylov import solve_newton_krylov_system
+from numerical_methods.nonlinear_systems.homotopy import solve_homotopy_system
 
 from numerical_methods.linear_algebra.iterative_methods.jacobi import solve_jacobi
 from numerical_methods.linear_algebra.iterative_methods.gauss_seidel import solve_gauss_seidel
+from numerical_methods.linear_algebra.iterative_methods.multicolor_gauss_seidel import solve_multicolor_gauss_seidel
+from numerical_methods.linear_algebra.iterative_methods.sor import solve_sor, solve_ssor
+from numerical_methods.linear_algebra.iterative_methods.pcg import solve_pcg
+from numerical_methods.linear_algebra.iterative_methods.krylov import solve_gmres, solve_bicgstab
 
 from numerical_methods.root_finding.polynomial_root_finding import solve_polynomial
 
 from numerical_methods.linear_algebra.eigen.power_method import power_iteration_deflation, power_method_single
 from numerical_methods.linear_algebra.iterative_methods.simple_iteration import solve_simple_iteration as solve_simple_iteration_hpt
+from numerical_methods.linear_algebra.least_squares.tsqr import TSQRAccumulator, solve_tsqr, solve_tsqr_npy
 
 
 
@@ -51,33 +71,106 @@ CORS(app)
 def index():
     return render_template('index.html')
 
-def hpt_solver(solver_function):
+def parse_flag(value, default=False):
+    """Cờ bật/tắt từ JSON: nhận true/false hoặc chuỗi/số ("true", "1", 1, ...); bool("false") là True nên không dùng bool()."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes', 'on')
+    return value in (True, 1)
+
+PRECHECK_FALLBACKS = ('reject', 'krylov')
+
+def precheck_options(data, keys):
+    """
+    Lấy các khóa trong keys từ request cho phương pháp lặp: "precheck" được đọc
+    bằng parse_flag (mặc định bật), "fallback" phải thuộc PRECHECK_FALLBACKS.
+
+    Returns:
+        tuple: (options, thông báo lỗi hoặc None)
+    """
+    options = {key: data[key] for key in keys if key in data}
+    if 'precheck' in options:
+        options['precheck'] = parse_flag(options['precheck'], default=True)
+    if options.get('fallback') is None:
+        options.pop('fallback', None)
+    elif options['fallback'] not in PRECHECK_FALLBACKS:
+        return options, f"Tham số fallback không hợp lệ: {options['fallback']!r} (chỉ nhận 'reject' hoặc 'krylov')."
+    return options, None
+
+def hpt_solver(solver_function, sparse_solver=None, structured_solver=None, forwarded_options=()):
+    """
+    Ma trận A có thể gửi ở dạng thưa (COO/CSR, xem utils.matrix_parser). Khi đó A
+    được giữ nguyên dạng thưa và giải bằng sparse_solver, trừ khi A đủ dày hoặc
+    đủ nhỏ (tự động chuyển về dạng đầy đủ). Nếu A thưa suy biến và không quá lớn,
+    dùng lại thuật toán đầy đủ để phân loại nghiệm.
+
+    Trước đó, structured_solver (nếu có) thử các đường nhanh theo cấu trúc của A
+    (dải, Toeplitz, khối chéo). Tham số "detect_structure" của request: "auto"
+    (mặc định, chỉ với ma trận lớn hơn SMALL_MATRIX_SIZE để giữ các bước trung
+    gian cho ma trận nhỏ), true (luôn thử) hoặc false (không thử).
+
+    Các khóa trong forwarded_options (ví dụ "precision") được chuyển từ request
+    sang solver_function dưới dạng tham số có tên.
+
+    Với "reorder": "rcm", hệ được sắp xếp lại bằng Reverse Cuthill–McKee trước
+    mọi bộ giải ở trên (xem solve_with_rcm).
+    """
     data = request.get_json()
     if not data or 'matrix_a' not in data or 'matrix_b' not in data:
         return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu ma trận A hoặc B."}), 400
     try:
-        matrix_a = np.array(data['matrix_a'], dtype=float)
-        matrix_b = np.array(data['matrix_b'], dtype=float)
-        result = solver_function(matrix_a, matrix_b)
+        matrix_a = parse_matrix(data['matrix_a'])
+        matrix_b = densify(parse_matrix(data['matrix_b']))
+        options = {key: data[key] for key in forwarded_options if key in data}
+        if options:
+            solver_function = partial(solver_function, **options)
+        if data.get('reorder') == 'rcm':
+            solver_function = partial(solve_with_rcm, solver_function)
+            sparse_solver = sparse_solver and partial(solve_with_rcm, sparse_solver)
+            structured_solver = structured_solver and partial(solve_with_rcm, structured_solver)
+        detect_structure = data.get('detect_structure', 'auto')
+        if detect_structure == 'auto':
+            detect_structure = matrix_a.ndim == 2 and max(matrix_a.shape) > SMALL_MATRIX_SIZE
+        result = structured_solver(matrix_a, matrix_b) if structured_solver is not None and detect_structure else None
+        if result is None:
+            if sp.issparse(matrix_a) and (sparse_solver is None or should_densify(matrix_a)):
+                matrix_a = matrix_a.toarray()
+            if sp.issparse(matrix_a):
+                result = sparse_solver(matrix_a, matrix_b)
+                if result.get('singular') and max(matrix_a.shape) <= DENSE_FALLBACK_MAX_SIZE:
+                    result = solver_function(matrix_a.toarray(), matrix_b)
+            else:
+                result = solver_function(matrix_a, matrix_b)
         result['success'] = True if 'error' not in result else False
         return jsonify(result)
     except Exception as e:
         print("Lỗi khi xử lý request HPT:", traceback.format_exc())
         return jsonify({"success": False, "error": f"Lỗi: {str(e)}"}), 500
 
-def iterative_hpt_solver(solver_function):
+def iterative_hpt_solver(solver_function, accepts_sparse=False, forwarded_options=()):
+    """
+    Các khóa trong forwarded_options (ví dụ "omega") được chuyển từ request sang
+    solver_function dưới dạng tham số có tên.
+    """
     data = request.get_json()
     if not data or 'matrix_a' not in data or 'matrix_b' not in data or 'x0' not in data:
         return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu ma trận A, B hoặc vector X₀."}), 400
+    options, error = precheck_options(data, forwarded_options)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
     try:
-        matrix_a = np.array(data['matrix_a'], dtype=float)
-        matrix_b = np.array(data['matrix_b'], dtype=float)
+        # A thưa (COO/CSR) chỉ được giữ nguyên khi phương pháp hỗ trợ và A đủ thưa
+        matrix_a = parse_matrix(data['matrix_a'])
+        if sp.issparse(matrix_a) and (not accepts_sparse or should_densify(matrix_a)):
+            matrix_a = matrix_a.toarray()
+        matrix_b = densify(parse_matrix(data['matrix_b']))
         x0 = np.array(data['x0'], dtype=float)
         
         eps = float(data.get('tolerance', 1e-5))
         max_iter = int(data.get('max_iter', 100))
             
-        result = solver_function(matrix_a, matrix_b, x0, eps=eps, max_iter=max_iter)
+        result = solver_function(matrix_a, matrix_b, x0, eps=eps, max_iter=max_iter, **options)
         result['success'] = True if 'error' not in result else False
         return jsonify(result)
     except Exception as e:
@@ -90,7 +183,8 @@ def inverse_solver(solver_function):
     if not data or 'matrix_a' not in data:
         return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu ma trận A."}), 400
     try:
-        matrix_a = np.array(data['matrix_a'], dtype=float)
+        # Ma trận nghịch đảo nói chung là đầy đủ, nên A thưa (COO/CSR) được chuyển về dạng đầy đủ
+        matrix_a = densify(parse_matrix(data['matrix_a']))
         
         # Lấy các tham số bổ sung (cho phương pháp lặp)
         params = {}
@@ -112,6 +206,9 @@ def iterative_hpt_solver_simple_iteration(solver_function):
     data = request.get_json()
     if not data or 'matrix_b' not in data or 'matrix_d' not in data or 'x0' not in data:
         return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu ma trận B, d hoặc vector X₀."}), 400
+    options, error = precheck_options(data, ('precheck', 'fallback', 'acceleration', 'spectral_bounds'))
+    if error:
+        return jsonify({"success": False, "error": error}), 400
     try:
         matrix_B = np.array(data['matrix_b'], dtype=float)
         matrix_d = np.array(data['matrix_d'], dtype=float)
@@ -124,7 +221,7 @@ def iterative_hpt_solver_simple_iteration(solver_function):
         # END: LẤY LỰA CHỌN
             
         # START: TRUYỀN LỰA CHỌN VÀO HÀM SOLVER
-        result = solver_function(matrix_B, matrix_d, x0, eps=eps, max_iter=max_iter, norm_choice=norm_choice)
+        result = solver_function(matrix_B, matrix_d, x0, eps=eps, max_iter=max_iter, norm_choice=norm_choice, **options)
         # END: TRUYỀN LỰA CHỌN
         
         result['success'] = True if 'error' not in result else False
@@ -136,11 +233,36 @@ def iterative_hpt_solver_simple_iteration(solver_function):
 
 @app.route('/matrix/iterative/jacobi', methods=['POST'])
 def handle_iterative_jacobi():
-    return iterative_hpt_solver(solve_jacobi)
+    return iterative_hpt_solver(solve_jacobi, accepts_sparse=True, forwarded_options=('precheck', 'fallback'))
 
 @app.route('/matrix/iterative/gauss-seidel', methods=['POST'])
 def handle_iterative_gauss_seidel():
-    return iterative_hpt_solver(solve_gauss_seidel)
+    return iterative_hpt_solver(solve_gauss_seidel, forwarded_options=('precheck', 'fallback'))
+
+@app.route('/matrix/iterative/gauss-seidel-multicolor', methods=['POST'])
+def handle_iterative_gauss_seidel_multicolor():
+    return iterative_hpt_solver(solve_multicolor_gauss_seidel, accepts_sparse=True,
+                                forwarded_options=('precheck', 'fallback', 'max_workers'))
+
+@app.route('/matrix/iterative/sor', methods=['POST'])
+def handle_iterative_sor():
+    return iterative_hpt_solver(solve_sor, accepts_sparse=True, forwarded_options=('omega',))
+
+@app.route('/matrix/iterative/ssor', methods=['POST'])
+def handle_iterative_ssor():
+    return iterative_hpt_solver(solve_ssor, accepts_sparse=True, forwarded_options=('omega',))
+
+@app.route('/matrix/iterative/pcg', methods=['POST'])
+def handle_iterative_pcg():
+    return iterative_hpt_solver(solve_pcg, accepts_sparse=True, forwarded_options=('preconditioner', 'omega'))
+
+@app.route('/matrix/iterative/gmres', methods=['POST'])
+def handle_iterative_gmres():
+    return iterative_hpt_solver(solve_gmres, accepts_sparse=True, forwarded_options=('restart', 'preconditioner'))
+
+@app.route('/matrix/iterative/bicgstab', methods=['POST'])
+def handle_iterative_bicgstab():
+    return iterative_hpt_solver(solve_bicgstab, accepts_sparse=True, forwarded_options=('preconditioner',))
 
 @app.route('/matrix/svd', methods=['POST'])
 def handle_svd_calculation():
@@ -173,19 +295,29 @@ def handle_svd_calculation():
 
 @app.route('/matrix/gauss-jordan', methods=['POST'])
 def handle_gauss_jordan_calculation():
-    return hpt_solver(solve_gauss_jordan)
+    return hpt_solver(solve_gauss_jordan, sparse_solver=solve_sparse_lu, structured_solver=solve_structured)
 
 @app.route('/matrix/gauss-elimination', methods=['POST'])
 def handle_gauss_elimination_calculation():
-    return hpt_solver(solve_gauss_elimination)
+    return hpt_solver(solve_gauss_elimination, sparse_solver=solve_sparse_lu, structured_solver=solve_structured)
 
 @app.route('/matrix/lu-decomposition', methods=['POST'])
 def handle_lu_decomposition_calculation():
-    return hpt_solver(solve_lu)
+    return hpt_solver(solve_lu, sparse_solver=solve_sparse_lu, structured_solver=solve_structured,
+                      forwarded_options=('precision',))
 
 @app.route('/matrix/cholesky', methods=['POST'])
 def handle_cholesky_calculation():
-    return hpt_solver(solve_cholesky)
+    return hpt_solver(solve_cholesky, sparse_solver=solve_sparse_cholesky, structured_solver=partial(solve_structured, spd=True),
+                      forwarded_options=('precision',))
+
+@app.route('/matrix/ldlt', methods=['POST'])
+def handle_ldlt_calculation():
+    return hpt_solver(partial(solve_cholesky, mode='ldlt'), sparse_solver=partial(solve_sparse_cholesky, mode='ldlt'), structured_solver=solve_structured)
+
+@app.route('/matrix/batch-solve', methods=['POST'])
+def handle_batch_solve():
+    return hpt_solver(solve_batch)
 
 @app.route('/matrix/danilevsky', methods=['POST'])
 def handle_danilevsky():
@@ -295,18 +427,28 @@ def solve_nonlinear_system():
         method = data.get('method')
         n = int(data.get('n'))
         expressions = data.get('expressions') # list of strings
+        if method == 'homotopy':
+            # PP đồng luân tìm mọi nghiệm, không cần X₀ và điều kiện dừng
+            return jsonify(solve_homotopy_system(n, expressions))
+
         x0 = [float(x) for x in data.get('x0')] # list of numbers
         stop_option = data.get('stop_option') # 'absolute_error', 'relative_error', 'iterations'
         stop_value = float(data.get('stop_value'))
 
+        norm_choice = data.get('norm_choice', 'infinity')
+        jacobian_mode = data.get('jacobian_mode', 'symbolic')
+        line_search = parse_flag(data.get('line_search'))
+
         if stop_option == 'iterations':
             stop_value = int(stop_value)
 
         result = {}
         if method == 'newton':
-            result = solve_newton_system(n, expressions, x0, stop_option, stop_value)
+            result = solve_newton_system(n, expressions, x0, stop_option, stop_value, norm_choice, jacobian_mode=jacobian_mode, line_search=line_search)
         elif method == 'newton_modified':
-            result = solve_newton_modified_system(n, expressions, x0, stop_option, stop_value)
+            result = solve_newton_modified_system(n, expressions, x0, stop_option, stop_value, norm_choice, jacobian_mode=jacobian_mode)
+        elif method == 'newton_krylov':
+            result = solve_newton_krylov_system(n, expressions, x0, stop_option, stop_value, norm_choice)
         elif method == 'simple_iteration':
             a0 = [float(a) for a in data.get('a0')]
             b0 = [float(b) for b in data.get('b0')]
@@ -405,5 +547,205 @@ def handle_svd_approximation():
         print("Lỗi khi xử lý SVD approximation:", traceback.format_exc())
         return jsonify({"success": False, "error": f"Lỗi: {str(e)}"}), 500
 
+# --- BÌNH PHƯƠNG TỐI THIỂU (TSQR) ---
+# Thư mục chứa các tệp .npy được phép đọc trực tiếp trên máy chủ
+DATA_DIR = os.path.abspath(os.environ.get('NUMERICAL_DATA_DIR', 'data'))
+# Các phiên tải lên theo từng khối hàng: session_id -> {"accumulator": TSQRAccumulator
+# (chỉ giữ nhân tử R), "lock": khóa riêng của phiên, "last_used": thời điểm dùng gần nhất}.
+# TSQR_SESSIONS_LOCK chỉ bảo vệ từ điển; phép QR của mỗi khối chạy dưới khóa của phiên.
+TSQR_SESSIONS = {}
+TSQR_SESSIONS_LOCK = threading.Lock()
+# Phiên không được dùng trong TSQR_SESSION_TTL giây bị hủy
+TSQR_SESSION_TTL = float(os.environ.get('TSQR_SESSION_TTL_MINUTES', 60)) * 60
+
+def purge_expired_tsqr_sessions():
+    """Hủy các phiên TSQR bị bỏ dở (gọi khi đang giữ TSQR_SESSIONS_LOCK)."""
+    now = time.time()
+    for session_id in [sid for sid, session in TSQR_SESSIONS.items() if now - session["last_used"] > TSQR_SESSION_TTL]:
+        del TSQR_SESSIONS[session_id]
+
+def resolve_data_path(name):
+    """Đường dẫn tuyệt đối của một tệp trong DATA_DIR (không cho phép ra ngoài thư mục này)."""
+    path = os.path.abspath(os.path.join(DATA_DIR, name))
+    if os.path.commonpath([path, DATA_DIR]) != DATA_DIR:
+        raise ValueError(f"Tệp '{name}' nằm ngoài thư mục dữ liệu.")
+    return path
+
+@app.route('/least-squares/tsqr', methods=['POST'])
+def handle_tsqr():
+    data = request.get_json()
+    if not data or 'matrix_a' not in data or 'matrix_b' not in data:
+        return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu ma trận A hoặc B."}), 400
+    try:
+        initial_rows = int(data['initial_rows']) if data.get('initial_rows') is not None else None
+        result = solve_tsqr(data['matrix_a'], data['matrix_b'], block_rows=int(data.get('block_rows', 10000)),
+                            initial_r=data.get('initial_r'), initial_rows=initial_rows)
+        return jsonify(result)
+    except Exception as e:
+        print("Lỗi khi xử lý TSQR:", traceback.format_exc())
+        return jsonify({"success": False, "error": f"Lỗi: {str(e)}"}), 500
+
+@app.route('/least-squares/tsqr/npy', methods=['POST'])
+def handle_tsqr_npy():
+    data = request.get_json()
+    if not data or 'path_a' not in data or 'path_b' not in data:
+        return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu tên tệp .npy của A hoặc B."}), 400
+    try:
+        path_a, path_b = resolve_data_path(data['path_a']), resolve_data_path(data['path_b'])
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    try:
+        result = solve_tsqr_npy(path_a, path_b, block_rows=int(data.get('block_rows', 100000)))
+        return jsonify(result)
+    except Exception as e:
+        print("Lỗi khi xử lý TSQR (.npy):", traceback.format_exc())
+        return jsonify({"success": False, "error": f"Lỗi: {str(e)}"}), 500
+
+@app.route('/least-squares/tsqr/session', methods=['POST'])
+def handle_tsqr_session_create():
+    data = request.get_json()
+    if not data or 'num_cols' not in data:
+        return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu số cột của A (num_cols)."}), 400
+    try:
+        initial_rows = int(data['initial_rows']) if data.get('initial_rows') is not None else None
+        accumulator = TSQRAccumulator(int(data['num_cols']), int(data.get('num_rhs', 1)), initial_r=data.get('initial_r'),
+                                      initial_rows=initial_rows)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    session_id = uuid.uuid4().hex
+    with TSQR_SESSIONS_LOCK:
+        purge_expired_tsqr_sessions()
+        TSQR_SESSIONS[session_id] = {"accumulator": accumulator, "lock": threading.Lock(), "last_used": time.time()}
+    return jsonify({"success": True, "session_id": session_id, "expires_after_seconds": TSQR_SESSION_TTL})
+
+@app.route('/least-squares/tsqr/session/<session_id>/chunk', methods=['POST'])
+def handle_tsqr_session_chunk(session_id):
+    data = request.get_json()
+    if not data or 'matrix_a' not in data or 'matrix_b' not in data:
+        return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu khối hàng của A hoặc B."}), 400
+    with TSQR_SESSIONS_LOCK:
+        purge_expired_tsqr_sessions()
+        session = TSQR_SESSIONS.get(session_id)
+        if session is not None:
+            session["last_used"] = time.time()
+    if session is None:
+        return jsonify({"success": False, "error": "Phiên TSQR không tồn tại hoặc đã kết thúc."}), 404
+    try:
+        block_rows = int(data.get('block_rows', 10000))
+        A_chunk = np.array(data['matrix_a'], dtype=float)
+        B_chunk = np.array(data['matrix_b'], dtype=float).reshape(A_chunk.shape[0], -1)
+        accumulator = session["accumulator"]
+        with session["lock"]:
+            accumulator.add_blocks((A_chunk[i:i + block_rows], B_chunk[i:i + block_rows])
+                                   for i in range(0, A_chunk.shape[0], block_rows))
+            rows, num_blocks = accumulator.num_rows, accumulator.num_blocks
+        with TSQR_SESSIONS_LOCK:
+            session["last_used"] = time.time()
+        return jsonify({"success": True, "rows": rows, "num_blocks": num_blocks})
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        print("Lỗi khi xử lý khối TSQR:", traceback.format_exc())
+        return jsonify({"success": False, "error": f"Lỗi: {str(e)}"}), 500
+
+@app.route('/least-squares/tsqr/session/<session_id>/finish', methods=['POST'])
+def handle_tsqr_session_finish(session_id):
+    with TSQR_SESSIONS_LOCK:
+        purge_expired_tsqr_sessions()
+        session = TSQR_SESSIONS.pop(session_id, None)
+    if session is None:
+        return jsonify({"success": False, "error": "Phiên TSQR không tồn tại hoặc đã kết thúc."}), 404
+    # Chờ khối đang được xử lý (nếu có) của phiên này
+    with session["lock"]:
+        return jsonify(session["accumulator"].solve())
+
+# Tệp A tải lên (<matrix_id>.npy) và tệp phân tích (<id>.lu.npy, <id>.perm.npy) bị xóa
+# khi không được dùng trong OOC_FILE_TTL giây
+OOC_FILE_TTL = float(os.environ.get('OOC_FILE_TTL_HOURS', 24)) * 3600
+OOC_FILE_PATTERN = re.compile(r'^([0-9a-f]{32})(?:\.lu|\.perm)?\.npy$')
+
+def ooc_files(matrix_id):
+    """Các tệp của một ma trận tải lên: A, LU và hoán vị (chỉ những tệp đang tồn tại)."""
+    stem = os.path.splitext(resolve_data_path(matrix_id))[0]
+    return [path for path in (stem + '.npy', stem + '.lu.npy', stem + '.perm.npy') if os.path.exists(path)]
+
+def purge_expired_ooc_files():
+    """Xóa các nhóm tệp tải lên mà tệp được dùng gần nhất đã quá OOC_FILE_TTL."""
+    if not os.path.isdir(DATA_DIR):
+        return
+    groups = {}
+    for name in os.listdir(DATA_DIR):
+        match = OOC_FILE_PATTERN.match(name)
+        if match:
+            groups.setdefault(match.group(1), []).append(os.path.join(DATA_DIR, name))
+    now = time.time()
+    for paths in groups.values():
+        try:
+            if now - max(os.path.getmtime(path) for path in paths) > OOC_FILE_TTL:
+                for path in paths:
+                    os.remove(path)
+        except OSError:
+            pass
+
+@app.route('/matrix/ooc-lu/upload', methods=['POST'])
+def handle_ooc_lu_upload():
+    """
+    Nhận ma trận A dạng .npy (tệp trong form 'file' hoặc thân yêu cầu nhị phân) và
+    ghi thẳng xuống DATA_DIR theo từng đoạn, không nạp toàn bộ vào bộ nhớ.
+    """
+    stream = request.files['file'].stream if 'file' in request.files else request.stream
+    os.makedirs(DATA_DIR, exist_ok=True)
+    purge_expired_ooc_files()
+    matrix_id = f"{uuid.uuid4().hex}.npy"
+    path = resolve_data_path(matrix_id)
+    with open(path, 'wb') as f:
+        while True:
+            chunk = stream.read(1 << 20)
+            if not chunk:
+                break
+            f.write(chunk)
+    try:
+        A = np.load(path, mmap_mode='r')
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError("Ma trận A phải là ma trận vuông.")
+    except Exception as e:
+        os.remove(path)
+        return jsonify({"success": False, "error": f"Tệp .npy không hợp lệ: {str(e)}"}), 400
+    return jsonify({"success": True, "matrix_id": matrix_id, "shape": list(A.shape)})
+
+@app.route('/matrix/ooc-lu', methods=['POST'])
+def handle_ooc_lu():
+    data = request.get_json()
+    if not data or 'matrix_id' not in data or 'matrix_b' not in data:
+        return jsonify({"success": False, "error": "Dữ liệu không hợp lệ: Thiếu mã tệp của A (matrix_id) hoặc ma trận B."}), 400
+    purge_expired_ooc_files()
+    try:
+        path_a = resolve_data_path(data['matrix_id'])
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    if not os.path.exists(path_a):
+        return jsonify({"success": False, "error": "Không tìm thấy tệp của ma trận A."}), 404
+    try:
+        result = solve_lu_out_of_core(path_a, data['matrix_b'], memory_budget_mb=float(data.get('memory_budget_mb', 256)),
+                                      reuse_factorization=parse_flag(data.get('reuse_factorization'), default=True))
+        # Đánh dấu các tệp phân tích vừa được dùng (tệp A giữ nguyên mtime để việc dùng lại LU vẫn hợp lệ)
+        for path in ooc_files(data['matrix_id'])[1:]:
+            os.utime(path)
+        return jsonify(result)
+    except Exception as e:
+        print("Lỗi khi xử lý LU ngoài bộ nhớ:", traceback.format_exc())
+        return jsonify({"success": False, "error": f"Lỗi: {str(e)}"}), 500
+
+@app.route('/matrix/ooc-lu/<matrix_id>', methods=['DELETE'])
+def handle_ooc_lu_delete(matrix_id):
+    if not re.fullmatch(r'[0-9a-f]{32}\.npy', matrix_id):
+        return jsonify({"success": False, "error": "Mã tệp của ma trận A không hợp lệ."}), 400
+    paths = ooc_files(matrix_id)
+    if not paths:
+        return jsonify({"success": False, "error": "Không tìm thấy tệp của ma trận A."}), 404
+    for path in paths:
+        os.remove(path)
+    return jsonify({"success": True, "removed": len(paths)})
+
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+So sánh số bước lặp và thời gian của phép lặp đơn x = Bx + d thông thường với tăng
+tốc Chebyshev (acceleration='chebyshev') trên ma trận lặp Jacobi của bài toán
+Poisson 1D/2D (B đối xứng, ρ(B) gần 1), cùng số bước dự đoán từ khoảng phổ.
+Lặp đơn giữ phân tích trước (precheck) vì ||B||∞ = 1: khi đó ngưỡng dừng dùng ρ(B).
+
+Chạy: PYTHONPATH=. python benchmarks/bench_chebyshev.py --n 30
+"""
+import argparse
+import time
+import numpy as np
+
+from numerical_methods.linear_algebra.iterative_methods.simple_iteration import solve_simple_iteration
+
+def poisson_jacobi(n, dim):
+    """B = I - D⁻¹A và d = D⁻¹b với A là ma trận Poisson 1D (n ẩn) hoặc 2D (n² ẩn)."""
+    T = 2 * np.identity(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+    A = T if dim == 1 else np.kron(T, np.identity(n)) + np.kron(np.identity(n), T)
+    diag = np.diag(A)
+    B = np.identity(A.shape[0]) - A / diag[:, None]
+    d = np.ones(A.shape[0]) / diag
+    return B, d
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=30)
+    parser.add_argument('--eps', type=float, default=1e-6)
+    parser.add_argument('--max-iter', type=int, default=200000)
+    args = parser.parse_args()
+
+    for dim in (1, 2):
+        B, d = poisson_jacobi(args.n, dim)
+        size = B.shape[0]
+        x_exact = np.linalg.solve(np.identity(size) - B, d)
+        x0 = np.zeros(size)
+        plain, plain_time = timed(solve_simple_iteration, B, d, x0, eps=args.eps, max_iter=args.max_iter,
+                                  norm_choice='inf')
+        cheb, cheb_time = timed(solve_simple_iteration, B, d, x0, eps=args.eps, max_iter=args.max_iter,
+                                norm_choice='inf', acceleration='chebyshev')
+        info = cheb['acceleration']
+        print(f"Poisson {dim}D, {size} ẩn, phổ B ⊂ [{info['spectral_bounds'][0]:.6f}, "
+              f"{info['spectral_bounds'][1]:.6f}] ({info['spectral_bounds_source']})")
+        for name, result, elapsed in (("Lặp đơn", plain, plain_time), ("Chebyshev", cheb, cheb_time)):
+            error = np.max(np.abs(np.array(result['solution']).ravel() - x_exact))
+            print(f"  {name:<10}: {result['iterations']:>7} bước, {elapsed:.3f}s, sai số thực {error:.1e}")
+        print(f"  Dự đoán: lặp đơn ≈ {info['plain_iterations_estimate']} bước (tốc độ {info['plain_convergence_rate']:.6f}), "
+              f"Chebyshev ≈ {info['predicted_iterations']} bước (tốc độ {info['convergence_rate']:.6f}); "
+              f"giảm {plain['iterations'] / cheb['iterations']:.1f} lần số bước")
+
+if __name__ == '__main__':
+    main()
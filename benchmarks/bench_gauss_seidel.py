@@ -0,0 +1,87 @@
+"""
+So sánh bước lặp Gauss-Seidel theo từng hàng (vòng lặp Python, như cài đặt cũ) với
+một lần thế tiến (D + L)·X = B - U·X trên mọi vế phải (gauss_seidel_sweep), cho
+giải hệ nhiều vế phải và tìm ma trận nghịch đảo.
+
+Chạy: PYTHONPATH=. python benchmarks/bench_gauss_seidel.py --n 1000
+"""
+import argparse
+import time
+import numpy as np
+
+from numerical_methods.linear_algebra.iterative_methods.gauss_seidel import gauss_seidel_sweep, solve_gauss_seidel
+from numerical_methods.linear_algebra.inverse.gauss_seidel_inverse import solve_inverse_gauss_seidel
+
+def row_loop_sweep(A, B, X):
+    """Bước lặp Gauss-Seidel theo từng hàng (cài đặt trước đây)."""
+    X = X.copy()
+    X_prev = X.copy()
+    for j in range(A.shape[0]):
+        sum1 = np.dot(A[j, :j], X[:j, :])
+        sum2 = np.dot(A[j, j+1:], X_prev[j+1:, :])
+        X[j, :] = (B[j, :] - sum1 - sum2) / A[j, j]
+    return X
+
+def column_loop_sweep(A, X):
+    """Bước lặp Gauss-Seidel cho nghịch đảo, từng cột của E và từng hàng (cài đặt trước đây)."""
+    X = X.copy()
+    n = A.shape[0]
+    for j in range(n):
+        x_col = X[:, j].copy()
+        for row in range(n):
+            rhs = 1.0 if row == j else 0.0
+            x_col[row] = (rhs - np.dot(A[row, :row], x_col[:row]) - np.dot(A[row, row+1:], x_col[row+1:])) / A[row, row]
+        X[:, j] = x_col
+    return X
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=1000)
+    parser.add_argument('--rhs', type=int, default=10)
+    args = parser.parse_args()
+    n = args.n
+    rng = np.random.default_rng(0)
+    A = rng.uniform(-1, 1, (n, n))
+    A += np.diag(np.sum(np.abs(A), axis=1) + 1.0)
+    B = rng.uniform(-1, 1, (n, args.rhs))
+    lower, upper = np.tril(A), np.triu(A, 1)
+
+    # Riêng một bước lặp (không tính bảng lặp và hệ số co)
+    X = np.zeros((n, args.rhs))
+    _, old_time = timed(row_loop_sweep, A, B, X)
+    _, new_time = timed(gauss_seidel_sweep, lower, upper, B, X)
+    print(f"Một bước lặp, {args.rhs} vế phải: theo hàng {old_time * 1e3:.1f}ms, thế tiến {new_time * 1e3:.1f}ms "
+          f"(nhanh hơn {old_time / new_time:.1f} lần)")
+    X0 = A.T / (np.linalg.norm(A, 1) * np.linalg.norm(A, np.inf))
+    _, old_time = timed(column_loop_sweep, A, X0)
+    _, new_time = timed(gauss_seidel_sweep, lower, upper, np.identity(n), X0)
+    print(f"Một bước lặp nghịch đảo ({n} cột): theo cột và hàng {old_time:.2f}s, thế tiến {new_time * 1e3:.1f}ms "
+          f"(nhanh hơn {old_time / new_time:.1f} lần)")
+
+    result, new_time = timed(solve_gauss_seidel, A, B, np.zeros((n, args.rhs)), eps=1e-10, precheck=False)
+    sweeps = result['iterations']
+    X = np.zeros((n, args.rhs))
+    start = time.perf_counter()
+    for _ in range(sweeps):
+        X = row_loop_sweep(A, B, X)
+    old_time = time.perf_counter() - start
+    print(f"Toàn bộ giải hệ n={n}, {args.rhs} vế phải, {sweeps} bước lặp: theo hàng {old_time:.2f}s, "
+          f"thế tiến {new_time:.3f}s (nhanh hơn {old_time / new_time:.1f} lần), "
+          f"chênh lệch {np.max(np.abs(X - np.array(result['solution']))):.1e}")
+
+    result, new_time = timed(solve_inverse_gauss_seidel, A, eps=1e-8)
+    sweeps = len(result['steps'][-1]['table'])
+    # Vòng lặp cũ tốn O(n²) lời gọi Python mỗi bước: chỉ đo một bước rồi nhân lên
+    X0 = A.T / (np.linalg.norm(A, 2) ** 2)
+    _, one_sweep = timed(column_loop_sweep, A, X0)
+    old_time = one_sweep * sweeps
+    print(f"Toàn bộ nghịch đảo n={n}, {sweeps} bước lặp: theo cột và hàng ≈ {old_time:.1f}s (ước lượng từ 1 bước), "
+          f"thế tiến {new_time:.3f}s (nhanh hơn {old_time / new_time:.1f} lần)")
+
+if __name__ == '__main__':
+    main()
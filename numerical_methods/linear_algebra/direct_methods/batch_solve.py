@@ -0,0 +1,77 @@
+import numpy as np
+
+def solve_batch(matrix_a, matrix_b):
+    """
+    Giải đồng thời nhiều hệ phương trình độc lập A_k X_k = B_k (k = 1..K).
+
+    Các ma trận được xếp chồng thành mảng 3 chiều, và mọi phép tính đều chạy
+    trên cả chồng (LAPACK theo lô), nên một yêu cầu thay thế được hàng nghìn
+    yêu cầu giải từng hệ nhỏ:
+      1. Số điều kiện κ₁(A_k) của cả chồng được tính bằng một lời gọi np.linalg.cond
+         (nghịch đảo qua phân rã LU, A_k suy biến cho κ₁ = ∞). Hệ có 1/κ₁ < √ε bị đánh
+         dấu nghi suy biến; mọi A_k có hạng thiếu (theo SVD) đều nằm trong số này.
+      2. Chỉ các hệ bị đánh dấu mới tính hạng bằng matrix_rank (SVD).
+      3. Các hệ hạng đủ được giải bằng một lời gọi np.linalg.solve (phân rã LU).
+      4. Các hệ suy biến được phân loại bằng hạng của [A_k|B_k]: vô nghiệm, hoặc
+         vô số nghiệm (trả về nghiệm có chuẩn nhỏ nhất bằng giả nghịch đảo).
+
+    Args:
+        matrix_a (np.ndarray): Mảng (K, n, n).
+        matrix_b (np.ndarray): Mảng (K, n) hoặc (K, n, r).
+
+    Returns:
+        dict: Trạng thái ('unique', 'singular', 'inconsistent') và nghiệm của từng hệ.
+    """
+    try:
+        A = np.asarray(matrix_a, dtype=float)
+        B = np.asarray(matrix_b, dtype=float)
+        if A.ndim != 3 or A.shape[1] != A.shape[2]:
+            return {"success": False, "error": "Ma trận A phải là mảng 3 chiều (K, n, n) gồm K ma trận vuông."}
+        vector_rhs = B.ndim == 2
+        if vector_rhs:
+            B = B[:, :, None]
+        if B.ndim != 3 or B.shape[:2] != A.shape[:2]:
+            return {"success": False, "error": f"Ma trận B phải có dạng ({A.shape[0]}, {A.shape[1]}) hoặc ({A.shape[0]}, {A.shape[1]}, r)."}
+
+        num_systems, n, _ = A.shape
+        X = np.full(B.shape, np.nan)
+        status = np.full(num_systems, 'unique', dtype=object)
+
+        rank_A = np.full(num_systems, n, dtype=int)
+        if num_systems and n:
+            cond = np.linalg.cond(A, 1)
+            flagged = np.flatnonzero(~(cond * np.sqrt(np.finfo(float).eps) < 1))
+            if flagged.size:
+                rank_A[flagged] = np.linalg.matrix_rank(A[flagged])
+        regular = rank_A == n
+        if np.any(regular):
+            X[regular] = np.linalg.solve(A[regular], B[regular])
+
+        deficient = np.flatnonzero(~regular)
+        if deficient.size:
+            rank_AB = np.linalg.matrix_rank(np.concatenate((A[deficient], B[deficient]), axis=2))
+            inconsistent = rank_AB > rank_A[deficient]
+            status[deficient[inconsistent]] = 'inconsistent'
+            singular = deficient[~inconsistent]
+            status[singular] = 'singular'
+            if singular.size:
+                X[singular] = np.linalg.pinv(A[singular]) @ B[singular]
+
+        if vector_rhs:
+            X = X[:, :, 0]
+        solutions = [X[k].tolist() if status[k] != 'inconsistent' else None for k in range(num_systems)]
+        counts = {s: int(np.sum(status == s)) for s in ('unique', 'singular', 'inconsistent')}
+        return {
+            "success": True,
+            "num_systems": num_systems,
+            "statuses": status.tolist(),
+            "ranks": rank_A.tolist(),
+            "solutions": solutions,
+            "counts": counts,
+            "message": f"Đã giải {num_systems} hệ: {counts['unique']} hệ có nghiệm duy nhất, "
+                       f"{counts['singular']} hệ suy biến (vô số nghiệm, trả về nghiệm chuẩn nhỏ nhất), "
+                       f"{counts['inconsistent']} hệ vô nghiệm."
+        }
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi nghiêm trọng: {traceback.format_exc()}"}
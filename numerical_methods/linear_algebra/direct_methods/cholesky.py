@@ -1,55 +1,174 @@
 import numpy as np
+import scipy.linalg
 import cmath
 
+from numerical_methods.linear_algebra.direct_methods.step_trace import StepTrace
+from numerical_methods.linear_algebra.direct_methods.mixed_precision import FLOAT32_MAX, iterative_refinement, scaled_low_precision
+from numerical_methods.linear_algebra.condition import condition_from_cholesky
+
 def serialize_matrix(matrix):
     import numpy as np
     matrix = np.atleast_2d(matrix)
-    def safe_number(val):
-        if isinstance(val, (float, np.floating)):
-            if np.isnan(val):
-                return "NaN"
-            if np.isposinf(val):
-                return "Infinity"
-            if np.isneginf(val):
-                return "-Infinity"
-            return float(val)
-        return val
+    def safe_array(arr):
+        # Chỉ chuyển từng phần tử khi có NaN/±Infinity (không hợp lệ trong JSON)
+        arr = np.asarray(arr, dtype=float)
+        if np.all(np.isfinite(arr)):
+            return arr.tolist()
+        out = arr.astype(object)
+        out[np.isnan(arr)] = "NaN"
+        out[np.isposinf(arr)] = "Infinity"
+        out[np.isneginf(arr)] = "-Infinity"
+        return out.tolist()
     if np.iscomplexobj(matrix):
-        def complex_to_dict(c):
-            return {'re': safe_number(c.real), 'im': safe_number(c.imag)}
-        return [[complex_to_dict(cell) for cell in row] for row in matrix]
-    return [[safe_number(cell) for cell in row] for row in matrix]
+        re, im = safe_array(matrix.real), safe_array(matrix.imag)
+        return [[{'re': r, 'im': i} for r, i in zip(row_re, row_im)] for row_re, row_im in zip(re, im)]
+    return safe_array(matrix)
+
+def spd_precheck(M):
+    """
+    Kiểm tra nhanh (O(n²)) các điều kiện cần để M đối xứng xác định dương.
+
+    M xác định dương thì mọi phần tử chéo dương và mọi định thức con chính cấp 2
+    dương, tức |m_ij| < sqrt(m_ii·m_jj). Trả về thông báo lỗi hoặc None.
+    """
+    diag = np.diag(M)
+    if np.any(diag <= 0):
+        i = int(np.argmax(diag <= 0))
+        return f"Phần tử chéo M[{i},{i}] = {diag[i]:.6g} không dương, ma trận không xác định dương."
+    bound = np.sqrt(np.outer(diag, diag))
+    np.fill_diagonal(bound, np.inf)
+    if np.any(np.abs(M) >= bound):
+        i, j = np.unravel_index(np.argmax(np.abs(M) - bound), M.shape)
+        return f"|M[{i},{j}]| ≥ √(M[{i},{i}]·M[{j},{j}]), ma trận không xác định dương."
+    return None
+
+def pivot_tolerance(A):
+    """
+    Ngưỡng trụ tương đối n·ε·max(a_ii): với ma trận nửa xác định dương suy biến, các
+    trụ lẽ ra bằng 0 chỉ còn là sai số làm tròn cỡ ε·max(a_ii), nên không thể chỉ
+    kiểm tra trụ ≤ 0.
+    """
+    diag = np.abs(np.diag(A))
+    return A.shape[0] * np.finfo(float).eps * (diag.max() if diag.size else 0.0)
 
-def cholesky_decomposition(A):
+def _cholesky_right_looking(A, record_steps=False, pivot_tol=0.0):
+    """
+    Phân tích Cholesky theo cột (right-looking), ghi đè tam giác dưới của A.
+
+    Bước j: L[j,j] = √a_jj, L[j+1:, j] = a[j+1:, j] / L[j,j], rồi cập nhật
+    phần còn lại A[j+1:, j+1:] -= l·lᵀ bằng một phép nhân ngoài.
+    Trụ a_jj ≤ pivot_tol được coi là không xác định dương (xem `pivot_tolerance`).
+    Khi record_steps=True, trả về một `StepTrace` (mỗi bước chỉ lưu cột j của L).
+    """
+    n = A.shape[0]
+    if record_steps:
+        L = np.zeros((n, n))
+        steps = StepTrace(L=L)
+    else:
+        steps = None
+    for j in range(n):
+        if A[j, j] <= pivot_tol:
+            raise ValueError("Ma trận không xác định dương (hoặc suy biến), không thể phân tích Cholesky.")
+        A[j, j] = np.sqrt(A[j, j])
+        A[j+1:, j] /= A[j, j]
+        A[j+1:, j+1:] -= np.outer(A[j+1:, j], A[j+1:, j])
+        if record_steps:
+            L[j:, j] = A[j:, j]
+            steps.record({'step': j+1}, L=L)
+    return steps
+
+def _cholesky_blocked(A, block_size, pivot_tol=0.0):
+    """
+    Phân tích Cholesky theo khối: phân tích khối chéo A11 = L11·L11ᵀ, tính
+    L21 = A21·L11⁻ᵀ bằng giải hệ tam giác, rồi A22 -= L21·L21ᵀ (một phép GEMM).
+    """
+    n = A.shape[0]
+    for k in range(0, n, block_size):
+        kb = min(k + block_size, n)
+        _cholesky_right_looking(A[k:kb, k:kb], pivot_tol=pivot_tol)
+        if kb < n:
+            L11 = np.tril(A[k:kb, k:kb])
+            A[kb:, k:kb] = scipy.linalg.solve_triangular(L11, A[kb:, k:kb].T, lower=True).T
+            A[kb:, kb:] -= A[kb:, k:kb] @ A[kb:, k:kb].T
+    return np.tril(A)
+
+def cholesky_decomposition(A, record_steps=True, block_size=64):
     """
     Phân tích Cholesky: A = LL^T, trả về L và các bước trung gian.
+
+    Khi record_steps=True, bước j lưu L sau khi tính xong cột j (thuật toán cột)
+    vào một `StepTrace`. Khi record_steps=False, dùng thuật toán khối và không
+    lưu bước trung gian (steps = None).
     """
-    n = len(A)
-    L = np.zeros((n, n))
-    steps = []
-    for i in range(n):
-        for j in range(i+1):
-            if i == j:
-                sum_ = sum(L[i][k]**2 for k in range(j))
-                L[i][j] = np.sqrt(A[i][i] - sum_)
-            else:
-                sum_ = sum(L[i][k]*L[j][k] for k in range(j))
-                L[i][j] = (A[i][j] - sum_) / L[j][j]
-        steps.append({
-            'step': i+1,
-            'L': L.copy()
-        })
-    return L, steps
-
-def solve_cholesky(matrix_a, matrix_b):
+    A = np.array(A, dtype=float)
+    pivot_tol = pivot_tolerance(A)
+    if record_steps:
+        steps = _cholesky_right_looking(A, record_steps=True, pivot_tol=pivot_tol)
+        return np.tril(A), steps
+    return _cholesky_blocked(A, block_size, pivot_tol), None
+
+def ldlt_decomposition(A):
+    """
+    Phân tích LDLᵀ không căn bậc hai: A = L·D·Lᵀ với L tam giác dưới đơn vị, D đường chéo.
+
+    Dùng được cho ma trận đối xứng không xác định dấu, miễn là các định thức con
+    chính (không pivoting) khác 0 (|D[j,j]| lớn hơn ngưỡng `pivot_tolerance`).
+    """
+    A = np.array(A, dtype=float)
+    n = A.shape[0]
+    pivot_tol = pivot_tolerance(A)
+    for j in range(n):
+        d = A[j, j]
+        if abs(d) <= pivot_tol:
+            raise ValueError(f"Phần tử D[{j},{j}] = 0, không thể phân tích LDLᵀ.")
+        l = A[j+1:, j] / d
+        A[j+1:, j+1:] -= d * np.outer(l, l)
+        A[j+1:, j] = l
+    return np.tril(A, -1) + np.eye(n), np.diag(A).copy()
+
+def _solve_cholesky_mixed(M, d):
+    """
+    Phân tích Cholesky M = L·Lᵀ ở float32 rồi tinh chỉnh lặp với phần dư float64.
+
+    Returns:
+        tuple: (X, thông tin tinh chỉnh); X là None nếu cần chuyển sang float64.
+    """
+    info = {"precision": "mixed", "refinement_iterations": 0, "backward_error": None, "fallback": True}
+    if not np.all(np.isfinite(M)) or np.max(np.abs(M), initial=0.0) > FLOAT32_MAX:
+        info["reason"] = "Các phần tử của M vượt quá phạm vi float32."
+        return None, info
+    try:
+        factor32 = scipy.linalg.cho_factor(M.astype(np.float32), lower=True, check_finite=False)
+    except np.linalg.LinAlgError:
+        info["reason"] = "Phân tích Cholesky float32 thất bại."
+        return None, info
+    if condition_from_cholesky(np.tril(factor32[0]).astype(float), np.linalg.norm(M, 1))["ill_conditioned"]:
+        info["reason"] = "M có điều kiện kém, cần phân tích float64."
+        return None, info
+    solve_low = scaled_low_precision(lambda R: scipy.linalg.cho_solve(factor32, R, check_finite=False))
+    X, iterations, berr, converged = iterative_refinement(M, d, solve_low)
+    info.update(refinement_iterations=iterations, backward_error=berr, fallback=not converged)
+    if not converged:
+        info["reason"] = "Tinh chỉnh lặp chững lại (M có thể điều kiện kém)."
+        return None, info
+    return X, info
+
+def solve_cholesky(matrix_a, matrix_b, mode='cholesky', precision='double'):
     """
     Giải hệ phương trình AX=B bằng phương pháp Cholesky.
     Đảm bảo mọi giá trị trả về đều JSON serializable.
+
+    Args:
+        mode (str): 'cholesky' (M = UᵀU) hoặc 'ldlt' (M = LDLᵀ, không cần căn
+            bậc hai và không yêu cầu M xác định dương).
+        precision (str): 'double' hoặc 'mixed' (chỉ với mode='cholesky'): phân tích
+            ở float32 và tinh chỉnh lặp về độ chính xác float64, tự động chuyển
+            sang phân tích float64 nếu tinh chỉnh không hội tụ.
     """
     try:
         # Nếu đầu vào là list, chuyển sang np.ndarray
-        matrix_a = np.array(matrix_a)
-        matrix_b = np.array(matrix_b)
+        matrix_a = np.array(matrix_a, dtype=float)
+        matrix_b = np.array(matrix_b, dtype=float)
 
         # Nếu B là vector, reshape về cột
         if matrix_b.ndim == 1:
@@ -65,53 +184,89 @@ def solve_cholesky(matrix_a, matrix_b):
             M = matrix_a.T @ matrix_a
             d = matrix_a.T @ matrix_b
 
-        n = M.shape[0]
+        if mode == 'ldlt':
+            try:
+                L, D = ldlt_decomposition(M)
+            except ValueError as e:
+                return {"success": False, "error": str(e)}
+            y = scipy.linalg.solve_triangular(L, d, lower=True, unit_diagonal=True)
+            x = scipy.linalg.solve_triangular(L.T, y / D[:, None], lower=False, unit_diagonal=True)
+            return {
+                "success": True,
+                "status": "unique_solution",
+                "message": "Hệ có nghiệm duy nhất tìm bằng phân tách LDLᵀ.",
+                "transformation_message": transformation_message,
+                "solution": serialize_matrix(x),
+                "decomposition": {
+                    "L": serialize_matrix(L),
+                    "D": serialize_matrix(D)[0],
+                    "M": serialize_matrix(M),
+                    "d": serialize_matrix(d)
+                },
+                "intermediate_y": serialize_matrix(y)
+            }
+
+        # Loại sớm các ma trận chắc chắn không xác định dương (O(n²))
+        precheck_error = spd_precheck(M)
+        if precheck_error:
+            if not is_symmetric:
+                precheck_error = "Ma trận A không đối xứng và ma trận AᵀA tạo ra không xác định dương. Không thể giải bằng Cholesky."
+            return {"success": False, "error": precheck_error}
 
-        # Kiểm tra xác định dương bằng giá trị riêng
+        mixed_info = None
+        if precision == 'mixed':
+            x, mixed_info = _solve_cholesky_mixed(M, d)
+            if x is not None:
+                return {
+                    "success": True,
+                    "status": "unique_solution",
+                    "message": f"Hệ có nghiệm duy nhất (phân tách Cholesky float32, tinh chỉnh lặp {mixed_info['refinement_iterations']} bước, sai số ngược {mixed_info['backward_error']:.2e}).",
+                    "transformation_message": transformation_message,
+                    "solution": serialize_matrix(x),
+                    "intermediate_y": None,
+                    "mixed_precision": mixed_info
+                }
+
+        # Bước phân tách Cholesky M = U^T * U (U = Lᵀ)
         try:
-            eigenvalues = np.linalg.eigvalsh(M)
-            if np.min(eigenvalues) <= 1e-12:
-                if not is_symmetric:
-                    err_msg = "Ma trận A không đối xứng và ma trận AᵀA tạo ra không xác định dương. Không thể giải bằng Cholesky."
-                else:
-                    err_msg = "Ma trận không xác định dương (có giá trị riêng không dương). Không thể giải bằng Cholesky."
-                return {"success": False, "error": err_msg}
-        except np.linalg.LinAlgError:
-            return {"success": False, "error": "Lỗi tính toán giá trị riêng. Ma trận có vấn đề về số học."}
-
-        # Bước phân tách Cholesky M = U^T * U
-        U = np.zeros((n, n), dtype=float)
-        for i in range(n):
-            sum_k = U[:i, i].T.conjugate() @ U[:i, i]
-            val_inside_sqrt = M[i, i] - sum_k
-            if val_inside_sqrt <= 0:
-                return {"success": False, "error": "Ma trận không xác định dương, không thể phân tích Cholesky."}
-            U[i, i] = np.sqrt(val_inside_sqrt)
-            for j in range(i + 1, n):
-                sum_k = U[:i, i].T.conjugate() @ U[:i, j]
-                U[i, j] = (M[i, j] - sum_k) / U[i, i]
+            L, _ = cholesky_decomposition(M, record_steps=False)
+        except ValueError:
+            if not is_symmetric:
+                return {"success": False, "error": "Ma trận A không đối xứng và ma trận AᵀA tạo ra không xác định dương. Không thể giải bằng Cholesky."}
+            return {"success": False, "error": "Ma trận không xác định dương (hoặc suy biến), không thể phân tích Cholesky."}
+        U = L.T
+
+        # Ước lượng số điều kiện từ chính thừa số L (O(n²)), như solve_lu
+        condition = condition_from_cholesky(L, np.linalg.norm(M, 1))
+        if condition["singular"]:
+            return {"success": False, "error": "Ma trận suy biến (rcond ≈ 0), không thể giải bằng Cholesky.",
+                    "condition_estimate": condition}
+        message = "Hệ có nghiệm duy nhất tìm bằng phân tách Cholesky."
+        if condition["ill_conditioned"]:
+            message = message[:-1] + f"; cảnh báo: M có điều kiện kém (κ₁(M) ≈ {condition['condition_number_1']:.2e})."
 
         decomposition_steps = {
             "U": serialize_matrix(U),
-            "Ut": serialize_matrix(U.T.conjugate()),
+            "Ut": serialize_matrix(L),
             "M": serialize_matrix(M),
             "d": serialize_matrix(d)
         }
 
         # Giải hệ
-        Ut = U.T.conjugate()
-        y = np.linalg.solve(Ut, d)
-        x = np.linalg.solve(U, y)
+        y = scipy.linalg.solve_triangular(L, d, lower=True)
+        x = scipy.linalg.solve_triangular(U, y, lower=False)
 
         # Đảm bảo mọi giá trị trả về đều là kiểu Python cơ bản
         return {
             "success": True,
             "status": "unique_solution",
-            "message": "Hệ có nghiệm duy nhất tìm bằng phân tách Cholesky.",
+            "message": message,
             "transformation_message": transformation_message,
             "solution": serialize_matrix(x),
             "decomposition": decomposition_steps,
-            "intermediate_y": serialize_matrix(y)
+            "intermediate_y": serialize_matrix(y),
+            "mixed_precision": mixed_info,
+            "condition_estimate": condition
         }
 
     except Exception as e:
@@ -122,8 +277,3 @@ def zero_small(x, tol=1e-15):
     x = np.array(x)
     x[np.abs(x) < tol] = 0.0
     return x
-
-# Trong tất cả các hàm trả về kết quả số, hãy áp dụng zero_small trước khi trả về.
-# Ví dụ:
-# return zero_small(result)
-# hoặc nếu trả về dict, hãy zero_small cho từng trường số/mảng số.
\ No newline at end of file
@@ -1,5 +1,7 @@
 import numpy as np
 
+from numerical_methods.linear_algebra.direct_methods.step_trace import StepTrace
+
 def zero_small(x, tol=1e-15):
     x = np.array(x)
     x[np.abs(x) < tol] = 0.0
@@ -16,22 +18,20 @@ def solve_gauss_elimination(matrix_a, matrix_b):
         num_vars = matrix_a.shape[1]
         num_b_cols = matrix_b.shape[1]
         
-        forward_steps = []
-        forward_steps.append({ "message": "Ma trận bổ sung ban đầu [A|B]:", "matrix": augmented_matrix.copy().tolist() })
+        # Các bước được lưu dạng nén: chỉ phần ma trận thay đổi so với bước trước
+        forward_steps = StepTrace(matrix=augmented_matrix)
+        forward_steps.record({ "message": "Ma trận bổ sung ban đầu [A|B]:" }, matrix=augmented_matrix)
         
         pivot_row = 0
         pivot_columns = []
         col_index = 0
         while pivot_row < num_rows and col_index < num_vars:
             if abs(augmented_matrix[pivot_row, col_index]) < ZERO_TOLERANCE:
-                swap_with_row = -1
-                for k in range(pivot_row + 1, num_rows):
-                    if abs(augmented_matrix[k, col_index]) > ZERO_TOLERANCE:
-                        swap_with_row = k
-                        break
+                candidates = np.flatnonzero(np.abs(augmented_matrix[pivot_row + 1:, col_index]) > ZERO_TOLERANCE)
+                swap_with_row = pivot_row + 1 + candidates[0] if candidates.size else -1
                 if swap_with_row != -1:
                     augmented_matrix[[pivot_row, swap_with_row]] = augmented_matrix[[swap_with_row, pivot_row]]
-                    forward_steps.append({ "message": f"Bước {len(forward_steps)}: Đổi hàng {pivot_row + 1} và {swap_with_row + 1} để có phần tử giải khác 0.", "matrix": augmented_matrix.copy().tolist() })
+                    forward_steps.record({ "message": f"Bước {len(forward_steps)}: Đổi hàng {pivot_row + 1} và {swap_with_row + 1} để có phần tử giải khác 0." }, matrix=augmented_matrix)
             
             pivot_element = augmented_matrix[pivot_row, col_index]
             if abs(pivot_element) < ZERO_TOLERANCE:
@@ -39,20 +39,21 @@ def solve_gauss_elimination(matrix_a, matrix_b):
                 continue
             
             pivot_columns.append(col_index)
-            for i in range(pivot_row + 1, num_rows):
-                factor = augmented_matrix[i, col_index] / pivot_element
-                if abs(factor) > ZERO_TOLERANCE:
-                    augmented_matrix[i, :] -= factor * augmented_matrix[pivot_row, :]
+            # Khử toàn bộ phần bên dưới bằng một phép cập nhật hạng 1 (bỏ qua các hệ số quá nhỏ)
+            factors = augmented_matrix[pivot_row + 1:, col_index] / pivot_element
+            factors[np.abs(factors) <= ZERO_TOLERANCE] = 0.0
+            augmented_matrix[pivot_row + 1:, :] -= np.outer(factors, augmented_matrix[pivot_row, :])
             
             augmented_matrix[np.abs(augmented_matrix) < ZERO_TOLERANCE] = 0.0
-            forward_steps.append({ "message": f"Bước {len(forward_steps)}: Dùng hàng {pivot_row+1} để khử các phần tử trong cột {col_index+1}.", "matrix": augmented_matrix.copy().tolist() })
+            forward_steps.record({ "message": f"Bước {len(forward_steps)}: Dùng hàng {pivot_row+1} để khử các phần tử trong cột {col_index+1}." }, matrix=augmented_matrix)
             pivot_row += 1
             col_index += 1
 
         rank = pivot_row
+        forward_trace = forward_steps.to_dict()
         for r in range(rank, num_rows):
             if np.any(np.abs(augmented_matrix[r, num_vars:]) > ZERO_TOLERANCE):
-                return { "success": True, "status": "no_solution", "message": f"Hệ phương trình vô nghiệm (Hạng(A) < Hạng([A|B])).", "forward_steps": forward_steps, "backward_steps": [] }
+                return { "success": True, "status": "no_solution", "message": f"Hệ phương trình vô nghiệm (Hạng(A) < Hạng([A|B])).", "forward_trace": forward_trace, "backward_steps": [], "solution_matrix": augmented_matrix.tolist() }
         
         backward_steps = []
         if rank < num_vars: # VÔ SỐ NGHIỆM
@@ -79,7 +80,7 @@ def solve_gauss_elimination(matrix_a, matrix_b):
             return {
                 "success": True, "status": "infinite_solutions",
                 "message": f"Hệ có vô số nghiệm (Hạng={rank} < Số ẩn={num_vars}).",
-                "forward_steps": forward_steps, "backward_steps": [],
+                "forward_trace": forward_trace, "backward_steps": [],
                 "general_solution": {
                     "particular_solution": Xp.tolist(),
                     "null_space_vectors": null_space_vectors.tolist(),
@@ -96,7 +97,7 @@ def solve_gauss_elimination(matrix_a, matrix_b):
             
             return {
                 "success": True, "status": "unique_solution", "message": "Hệ phương trình có nghiệm duy nhất.",
-                "solution": solution.tolist(), "forward_steps": forward_steps, "backward_steps": backward_steps
+                "solution": solution.tolist(), "forward_trace": forward_trace, "backward_steps": backward_steps
             }
     except Exception as e:
         import traceback
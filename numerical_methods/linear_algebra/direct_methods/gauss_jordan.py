@@ -1,5 +1,7 @@
 import numpy as np
 
+from numerical_methods.linear_algebra.direct_methods.step_trace import StepTrace
+
 def zero_small(x, tol=1e-15):
     x = np.array(x)
     x[np.abs(x) < tol] = 0.0
@@ -25,7 +27,9 @@ def solve_gauss_jordan(matrix_a, matrix_b):
         num_vars = matrix_a.shape[1]
         num_b_cols = matrix_b.shape[1]
         
-        intermediate_steps = [{"message": "Ma trận bổ sung ban đầu [A|B]:", "matrix": augmented_matrix.copy().tolist()}]
+        # Các bước được lưu dạng nén: chỉ phần ma trận thay đổi so với bước trước
+        intermediate_steps = StepTrace(matrix=augmented_matrix)
+        intermediate_steps.record({"message": "Ma trận bổ sung ban đầu [A|B]:"}, matrix=augmented_matrix)
 
         pivoted_rows = []
         pivoted_cols = []
@@ -33,27 +37,21 @@ def solve_gauss_jordan(matrix_a, matrix_b):
         # --- QUÁ TRÌNH KHỬ GAUSS-JORDAN ---
         max_pivots = min(num_rows, num_vars)
         for step in range(max_pivots):
+            # Ưu tiên phần tử bằng 1, nếu không có thì chọn phần tử có trị tuyệt đối lớn nhất
+            # (duyệt theo thứ tự hàng rồi cột trên các hàng/cột chưa chọn pivot)
+            free_rows = np.setdiff1d(np.arange(num_rows), pivoted_rows)
+            free_cols = np.setdiff1d(np.arange(num_vars), pivoted_cols)
+            sub_matrix = augmented_matrix[np.ix_(free_rows, free_cols)]
             pivot_r, pivot_c = -1, -1
-            found_one = False
-            for r in range(num_rows):
-                if r in pivoted_rows: continue
-                for c in range(num_vars):
-                    if c in pivoted_cols: continue
-                    if augmented_matrix[r, c] == 1.0:
-                        pivot_r, pivot_c = r, c
-                        found_one = True
-                        break
-                if found_one: break
-            
-            if not found_one:
-                max_val = ZERO_TOLERANCE
-                for r in range(num_rows):
-                    if r in pivoted_rows: continue
-                    for c in range(num_vars):
-                        if c in pivoted_cols: continue
-                        if abs(augmented_matrix[r, c]) > max_val:
-                            max_val = abs(augmented_matrix[r, c])
-                            pivot_r, pivot_c = r, c
+            ones = np.argwhere(sub_matrix == 1.0)
+            if ones.size:
+                pivot_r, pivot_c = free_rows[ones[0, 0]], free_cols[ones[0, 1]]
+            elif sub_matrix.size:
+                abs_sub = np.abs(sub_matrix)
+                r, c = np.unravel_index(np.argmax(abs_sub), abs_sub.shape)
+                if abs_sub[r, c] > ZERO_TOLERANCE:
+                    pivot_r, pivot_c = free_rows[r], free_cols[c]
+            pivot_r, pivot_c = int(pivot_r), int(pivot_c)
             
             if pivot_r == -1: break
             
@@ -61,26 +59,27 @@ def solve_gauss_jordan(matrix_a, matrix_b):
             pivoted_rows.append(pivot_r)
             pivoted_cols.append(pivot_c)
 
-            intermediate_steps.append({"message": f"Bước {len(intermediate_steps)}: Chọn pivot là {pivot_element:.4f} tại ({pivot_r + 1}, {pivot_c + 1}).", "matrix": augmented_matrix.copy().tolist()})
+            intermediate_steps.record({"message": f"Bước {len(intermediate_steps)}: Chọn pivot là {pivot_element:.4f} tại ({pivot_r + 1}, {pivot_c + 1})."}, matrix=augmented_matrix)
             
             augmented_matrix[pivot_r, :] /= pivot_element
             
-            for i in range(num_rows):
-                if i != pivot_r:
-                    factor = augmented_matrix[i, pivot_c]
-                    if abs(factor) > ZERO_TOLERANCE:
-                         augmented_matrix[i, :] -= factor * augmented_matrix[pivot_r, :]
+            # Khử cột pivot ở mọi hàng khác bằng một phép cập nhật hạng 1
+            factors = augmented_matrix[:, pivot_c].copy()
+            factors[pivot_r] = 0.0
+            factors[np.abs(factors) <= ZERO_TOLERANCE] = 0.0
+            augmented_matrix -= np.outer(factors, augmented_matrix[pivot_r, :])
             
             augmented_matrix[np.abs(augmented_matrix) < ZERO_TOLERANCE] = 0.0
-            intermediate_steps.append({"message": f"Bước {len(intermediate_steps)}: Khử các phần tử trong cột {pivot_c+1}.", "matrix": augmented_matrix.copy().tolist()})
+            intermediate_steps.record({"message": f"Bước {len(intermediate_steps)}: Khử các phần tử trong cột {pivot_c+1}."}, matrix=augmented_matrix)
 
         # --- KẾT LUẬN NGHIỆM ---
         rank = len(pivoted_rows)
+        intermediate_trace = intermediate_steps.to_dict()
         for r in range(num_rows):
             is_row_all_zero_in_A = np.all(np.abs(augmented_matrix[r, :num_vars]) < ZERO_TOLERANCE)
             is_b_part_nonzero = np.any(np.abs(augmented_matrix[r, num_vars:]) >= ZERO_TOLERANCE)
             if is_row_all_zero_in_A and is_b_part_nonzero:
-                return {"success": True, "status": "no_solution", "message": "Hệ phương trình vô nghiệm.", "intermediate_steps": intermediate_steps, "solution_matrix": augmented_matrix.tolist()}
+                return {"success": True, "status": "no_solution", "message": "Hệ phương trình vô nghiệm.", "intermediate_trace": intermediate_trace, "solution_matrix": augmented_matrix.tolist()}
 
         pivots_map = sorted(zip(pivoted_cols, pivoted_rows))
         pivoted_cols = [p[0] for p in pivots_map]
@@ -105,7 +104,7 @@ def solve_gauss_jordan(matrix_a, matrix_b):
             return {
                 "success": True, "status": "infinite_solutions",
                 "message": f"Hệ có vô số nghiệm (Hạng={rank} < Số ẩn={num_vars}).",
-                "intermediate_steps": intermediate_steps,
+                "intermediate_trace": intermediate_trace,
                 "general_solution": {
                     "particular_solution": Xp.tolist(),
                     "null_space_vectors": null_space_vectors.tolist(),
@@ -120,7 +119,7 @@ def solve_gauss_jordan(matrix_a, matrix_b):
 
             return {
                 "success": True, "status": "unique_solution", "message": "Hệ phương trình có nghiệm duy nhất.",
-                "solution": zero_small(solution).tolist(), "intermediate_steps": intermediate_steps
+                "solution": zero_small(solution).tolist(), "intermediate_trace": intermediate_trace
             }
             
     except Exception as e:
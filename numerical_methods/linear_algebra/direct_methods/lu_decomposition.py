@@ -1,39 +1,43 @@
+import warnings
 import numpy as np
 import scipy.linalg
 
+from numerical_methods.linear_algebra.direct_methods.step_trace import StepTrace
+from numerical_methods.linear_algebra.direct_methods.mixed_precision import FLOAT32_MAX, iterative_refinement, scaled_low_precision
+from numerical_methods.linear_algebra.condition import condition_from_lu, lu_factor_with_condition, unpack_lu
+from utils.matrix_parser import SMALL_MATRIX_SIZE
+
 def zero_small(x, tol=1e-15):
     x = np.array(x)
     x[np.abs(x) < tol] = 0.0
     return x
 
-def lu_decomposition(A):
+def lu_decomposition(A, check_rank=True):
     """
     Phân tích LU không pivoting, trả về L, U và các bước trung gian.
+
+    Mỗi bước i tính cả hàng i của U và cột i của L bằng các phép nhân ma trận–vector
+    (Doolittle theo hàng); các bước được ghi vào một `StepTrace` (mỗi bước chỉ lưu
+    hàng i của U và cột i của L). Kiểm tra suy biến dùng ước lượng số điều kiện từ
+    lu_factor (xem `lu_factor_with_condition`); có thể bỏ qua bằng check_rank=False
+    khi nơi gọi đã biết hạng của A.
     """
     A = np.array(A, dtype=float)
     n, m = A.shape
     if n != m:
         raise ValueError("Ma trận A phải là ma trận vuông.")
-    if np.linalg.matrix_rank(A) < n:
+    if check_rank and lu_factor_with_condition(A)[2]["singular"]:
         raise ValueError("Ma trận A suy biến, không thể phân tích LU (det(A) = 0).")
     L = np.zeros((n, n))
     U = np.zeros((n, n))
-    steps = []
+    steps = StepTrace(L=L, U=U)
     for i in range(n):
-        for k in range(i, n):
-            sum_ = sum(L[i][j] * U[j][k] for j in range(i))
-            U[i][k] = A[i][k] - sum_
+        U[i, i:] = A[i, i:] - L[i, :i] @ U[:i, i:]
         if np.isclose(U[i][i], 0):
             raise ValueError(f"Phần tử U[{i},{i}] = 0. Hệ có thể vô nghiệm hoặc vô số nghiệm, không thể phân tích LU.")
         L[i][i] = 1
-        for k in range(i+1, n):
-            sum_ = sum(L[k][j] * U[j][i] for j in range(i))
-            L[k][i] = (A[k][i] - sum_) / U[i][i]
-        steps.append({
-            'step': i+1,
-            'L': L.copy(),
-            'U': U.copy()
-        })
+        L[i+1:, i] = (A[i+1:, i] - L[i+1:, :i] @ U[:i, i]) / U[i][i]
+        steps.record({'step': i+1}, L=L, U=U)
     return L, U, steps
 
 def gauss_jordan(aug):
@@ -50,9 +54,9 @@ def gauss_jordan(aug):
         if max_row != row:
             aug[[row, max_row]] = aug[[max_row, row]]
         aug[row] = aug[row] / aug[row, col]
-        for r in range(n):
-            if r != row:
-                aug[r] -= aug[r, col] * aug[row]
+        factors = aug[:, col].copy()
+        factors[row] = 0.0
+        aug -= np.outer(factors, aug[row])
         pivots.append(col)
         row += 1
     return aug, pivots
@@ -81,13 +85,85 @@ def serialize_matrix(matrix):
         return [[complex_to_dict(cell) for cell in row] for row in matrix]
     return matrix.tolist()
 
-def solve_lu(matrix_a, matrix_b):
+def _rank_analysis(A, B):
+    """
+    Phân tích hạng, tính tương thích, nghiệm riêng và không gian nghiệm của AX = B
+    từ một phân tích SVD duy nhất A = U·diag(s)·Vᵀ.
+
+    - rank(A) = số giá trị kỳ dị lớn hơn ngưỡng (như np.linalg.matrix_rank).
+    - rank([A|B]) = rank(A) + hạng của phần B nằm ngoài không gian cột của A,
+      tức U[:, r:]ᵀ·B.
+    - Nghiệm riêng có chuẩn nhỏ nhất X = V_r·diag(1/s_r)·U_rᵀ·B (như lstsq).
+    - Không gian nghiệm: các cột của V ứng với giá trị kỳ dị bằng 0 (như null_space).
+    """
+    m, n = A.shape
+    eps = np.finfo(float).eps
+    U_s, s, Vt = scipy.linalg.svd(A, full_matrices=True)
+    s_max = s.max() if s.size else 0.0
+    rank_A = int(np.sum(s > s_max * max(m, n) * eps))
+
+    residual = U_s[:, rank_A:].T @ B
+    b_max = np.linalg.norm(B, axis=0).max() if B.size else 0.0
+    tol_AB = max(s_max, b_max) * max(m, n + B.shape[1]) * eps
+    rank_AB = rank_A
+    if residual.size:
+        rank_AB += int(np.sum(scipy.linalg.svdvals(residual) > tol_AB))
+
+    particular = Vt[:rank_A].T @ ((U_s[:, :rank_A].T @ B) / s[:rank_A, None])
+    null_space = Vt[rank_A:].T
+    return rank_A, rank_AB, particular, null_space
+
+def _solve_lu_mixed(A, B):
+    """
+    Phân tích LU (có pivoting) ở float32 rồi tinh chỉnh lặp với phần dư float64.
+
+    Returns:
+        tuple: (kết quả hoặc None nếu cần chuyển sang float64, thông tin tinh chỉnh)
+    """
+    info = {"precision": "mixed", "refinement_iterations": 0, "backward_error": None, "fallback": True}
+    if A.shape[0] != A.shape[1]:
+        info["reason"] = "A không vuông."
+        return None, info
+    if not np.all(np.isfinite(A)) or np.max(np.abs(A), initial=0.0) > FLOAT32_MAX:
+        info["reason"] = "Các phần tử của A vượt quá phạm vi float32."
+        return None, info
+    with warnings.catch_warnings():
+        # Trường hợp suy biến được xử lý ngay bên dưới (chuyển sang float64)
+        warnings.simplefilter('ignore', scipy.linalg.LinAlgWarning)
+        lu32, piv = scipy.linalg.lu_factor(A.astype(np.float32), check_finite=False)
+    if np.any(np.diag(lu32) == 0):
+        info["reason"] = "Phân tích LU float32 suy biến."
+        return None, info
+    solve_low = scaled_low_precision(lambda R: scipy.linalg.lu_solve((lu32, piv), R, check_finite=False))
+    X, iterations, berr, converged = iterative_refinement(A, B, solve_low)
+    info.update(refinement_iterations=iterations, backward_error=berr, fallback=not converged)
+    if not converged:
+        info["reason"] = "Tinh chỉnh lặp chững lại (A có thể suy biến hoặc điều kiện kém)."
+        return None, info
+    return {
+        "success": True,
+        "status": "unique_solution",
+        "message": f"Hệ có nghiệm duy nhất (phân rã LU float32, tinh chỉnh lặp {iterations} bước, sai số ngược {berr:.2e}).",
+        "solution": zero_small(X).tolist(),
+        "intermediate_y": None,
+        "lu_trace": None,
+        "mixed_precision": info,
+        "condition_estimate": condition_from_lu(lu32, np.linalg.norm(A, 1))
+    }, info
+
+def solve_lu(matrix_a, matrix_b, precision='double'):
     """
     Giải hệ phương trình AX=B bằng phân rã LU (có pivoting),
     trả về nghiệm đúng cho cả 3 trường hợp (vô nghiệm, duy nhất, vô số nghiệm),
     hỗ trợ nhiều vế phải.
     Tất cả các số có trị tuyệt đối nhỏ hơn 1e-15 sẽ được làm tròn thành 0 trong kết quả trả về.
-    Ngoài ra, trả về các bước trung gian của LU không pivoting (lu_steps).
+    Ngoài ra, với A vuông cấp không quá SMALL_MATRIX_SIZE, trả về các bước trung
+    gian của LU không pivoting (lu_trace, dạng nén); ma trận lớn hơn chỉ dùng phân
+    tích LAPACK ở trên (lu_trace = None).
+
+    Với precision='mixed', A được phân tích ở float32 và nghiệm được tinh chỉnh
+    lặp về độ chính xác float64 (xem `_solve_lu_mixed`); nếu tinh chỉnh không hội
+    tụ, tự động giải lại bằng phân tích float64 đầy đủ.
     """
     try:
         A = np.asarray(matrix_a, dtype=float)
@@ -97,28 +173,36 @@ def solve_lu(matrix_a, matrix_b):
         m, n = A.shape
         if m != B.shape[0]:
             return {"success": False, "error": "Số hàng của A và B không khớp."}
-        # 1. Phân rã LU có pivoting
+        mixed_info = None
+        if precision == 'mixed':
+            mixed_result, mixed_info = _solve_lu_mixed(A, B)
+            if mixed_result is not None:
+                return mixed_result
+        # 1. Phân rã LU có pivoting (PA = LU theo quy ước A = P·L·U của SciPy) và ước
+        #    lượng số điều kiện; A vuông không suy biến thì có hạng đầy đủ, không cần SVD
+        condition = None
         try:
-            P, L, U = scipy.linalg.lu(A)
+            if m == n and n > 0:
+                lu, piv, condition = lu_factor_with_condition(A)
+                P, L, U = unpack_lu(lu, piv)
+            else:
+                P, L, U = scipy.linalg.lu(A)
         except Exception as e:
             return {"success": False, "error": f"Lỗi khi phân rã LU: {e}"}
-        # 1b. Phân rã LU không pivoting để lấy các bước trung gian
-        try:
-            _, _, lu_steps = lu_decomposition(A)
-            # Chuyển các bước sang dạng list để tương thích JSON
-            lu_steps_serialized = []
-            for step in lu_steps:
-                lu_steps_serialized.append({
-                    'step': step['step'],
-                    'L': zero_small(step['L']).tolist(),
-                    'U': zero_small(step['U']).tolist()
-                })
-        except Exception as e:
-            lu_steps_serialized = []
-        # 2. Phân tích hạng
-        rank_A = np.linalg.matrix_rank(A)
-        AB = np.hstack((A, B))
-        rank_AB = np.linalg.matrix_rank(AB)
+        # 2. Phân tích hạng bằng một phân tích SVD duy nhất (chỉ khi A không vuông hoặc suy biến)
+        if condition is not None and not condition["singular"]:
+            rank_A = rank_AB = n
+        else:
+            rank_A, rank_AB, nghiem_rieng, null_space = _rank_analysis(A, B)
+        # 2b. Phân rã LU không pivoting để lấy các bước trung gian (chỉ khi A vuông, khả nghịch và đủ nhỏ)
+        lu_trace = None
+        if m == n and rank_A == n and n <= SMALL_MATRIX_SIZE:
+            try:
+                _, _, lu_steps = lu_decomposition(A, check_rank=False)
+                # Các bước ở dạng nén (xem StepTrace), làm tròn các số nhỏ hơn 1e-15 thành 0
+                lu_trace = lu_steps.to_dict(tol=1e-15)
+            except Exception as e:
+                lu_trace = None
         # 3. Kết luận và tìm nghiệm
         if rank_A < rank_AB:
             return {
@@ -127,31 +211,39 @@ def solve_lu(matrix_a, matrix_b):
                 "message": f"Hệ vô nghiệm (rank(A)={rank_A} < rank([A|B])={rank_AB})",
                 "decomposition": {"L": zero_small(L).tolist(), "U": zero_small(U).tolist(), "P": zero_small(P).tolist()},
                 "intermediate_y": None,
-                "lu_steps": lu_steps_serialized
+                "lu_trace": lu_trace,
+                "mixed_precision": mixed_info,
+                "condition_estimate": condition
             }
         elif rank_A == n:
             # Nghiệm duy nhất
             ket_luan = f"Hệ có nghiệm duy nhất (rank(A) = rank([A|B]) = {rank_A} = số ẩn)"
-            # Giải Ly = PB
-            Y = scipy.linalg.solve_triangular(L, P @ B, lower=True)
-            # Giải UX = Y
-            X = scipy.linalg.solve_triangular(U, Y)
+            if condition is not None and condition["ill_conditioned"]:
+                ket_luan += f"; cảnh báo: A có điều kiện kém (κ₁(A) ≈ {condition['condition_number_1']:.2e})"
+            if m == n:
+                # Giải Ly = PᵀB
+                Y = scipy.linalg.solve_triangular(L, P.T @ B, lower=True, unit_diagonal=True)
+                # Giải UX = Y
+                X = scipy.linalg.solve_triangular(U, Y)
+                intermediate_y = zero_small(Y).tolist()
+            else:
+                # A không vuông (hệ dư phương trình nhưng tương thích): dùng nghiệm từ SVD
+                X = nghiem_rieng
+                intermediate_y = None
             return {
                 "success": True,
                 "status": "unique_solution",
                 "message": ket_luan,
                 "solution": zero_small(X).tolist(),
                 "decomposition": {"L": zero_small(L).tolist(), "U": zero_small(U).tolist(), "P": zero_small(P).tolist()},
-                "intermediate_y": zero_small(Y).tolist(),
-                "lu_steps": lu_steps_serialized
+                "intermediate_y": intermediate_y,
+                "lu_trace": lu_trace,
+                "mixed_precision": mixed_info,
+                "condition_estimate": condition
             }
         else:
-            # Vô số nghiệm
+            # Vô số nghiệm: nghiệm riêng (chuẩn nhỏ nhất) và không gian nghiệm lấy từ SVD
             ket_luan = f"Hệ có vô số nghiệm (rank(A) = {rank_A} < số ẩn = {n})"
-            # Nghiệm riêng (least squares)
-            nghiem_rieng, _, _, _ = np.linalg.lstsq(A, B, rcond=None)
-            # Null space
-            null_space = scipy.linalg.null_space(A)
             return {
                 "success": True,
                 "status": "infinite_solutions",
@@ -163,7 +255,9 @@ def solve_lu(matrix_a, matrix_b):
                     "null_space_vectors": zero_small(null_space).tolist(),
                     "num_free_vars": null_space.shape[1] if null_space.ndim == 2 else 0
                 },
-                "lu_steps": lu_steps_serialized
+                "lu_trace": lu_trace,
+                "mixed_precision": mixed_info,
+                "condition_estimate": condition
             }
     except Exception as e:
         import traceback
@@ -0,0 +1,57 @@
+import numpy as np
+
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+def backward_error(A, X, B):
+    """
+    Sai số ngược chuẩn hóa (theo chuẩn vô cùng, lấy lớn nhất trên các cột của B):
+        ||B - A·X|| / (||A||·||X|| + ||B||).
+    """
+    R = B - A @ X
+    norm_A = np.max(np.sum(np.abs(A), axis=1)) if A.size else 0.0
+    denom = norm_A * np.max(np.abs(X), axis=0) + np.max(np.abs(B), axis=0)
+    num = np.max(np.abs(R), axis=0)
+    ratios = np.divide(num, denom, out=np.zeros_like(num), where=denom > 0)
+    return float(np.max(ratios)) if ratios.size else 0.0
+
+def iterative_refinement(A, B, solve_low, max_iter=30):
+    """
+    Tinh chỉnh lặp nghiệm của AX = B với phân tích ở độ chính xác đơn (float32).
+
+    X₀ = solve_low(B); ở mỗi bước, phần dư R = B - A·X được tính bằng float64 và
+    hiệu chỉnh X ← X + solve_low(R). Dừng khi sai số ngược ≤ √n·ε (ε của float64),
+    hoặc báo "chững lại" khi sai số ngược không giảm ít nhất một nửa sau một bước.
+
+    Args:
+        solve_low (callable): Giải hệ với phân tích float32, nhận và trả về mảng float64.
+
+    Returns:
+        tuple: (X, số bước tinh chỉnh, sai số ngược cuối cùng, đã hội tụ hay chưa)
+    """
+    n = A.shape[0]
+    tol = np.sqrt(n) * np.finfo(np.float64).eps
+    X = solve_low(B)
+    previous = np.inf
+    for iteration in range(max_iter + 1):
+        berr = backward_error(A, X, B)
+        if not np.isfinite(berr):
+            return X, iteration, berr, False
+        if berr <= tol:
+            return X, iteration, berr, True
+        if berr > 0.5 * previous or iteration == max_iter:
+            return X, iteration, berr, False
+        previous = berr
+        X = X + solve_low(B - A @ X)
+    return X, max_iter, berr, False
+
+def scaled_low_precision(solve32):
+    """
+    Bọc một hàm giải float32 để nhận/trả float64; vế phải được chia tỉ lệ trước khi
+    ép kiểu để phần dư nhỏ không bị làm tròn về 0 (underflow) trong float32.
+    """
+    def solve_low(R):
+        scale = np.max(np.abs(R), axis=0)
+        scale[scale == 0] = 1.0
+        Y = solve32((R / scale).astype(np.float32))
+        return Y.astype(np.float64) * scale
+    return solve_low
@@ -0,0 +1,248 @@
+import os
+import time
+import warnings
+import numpy as np
+import scipy.linalg
+import scipy.sparse.linalg as spla
+
+from numerical_methods.linear_algebra.condition import _condition_report
+
+def tile_size(n, memory_budget):
+    """
+    Độ rộng khối nb sao cho tập làm việc (panel (n×nb) cùng một khối cột (n×nb)
+    của phần còn lại, ở float64) nằm trong giới hạn bộ nhớ memory_budget (byte).
+    """
+    nb = int(memory_budget // (8 * 3 * max(n, 1)))
+    return max(16, min(n, nb))
+
+def _pivots_to_permutation(piv, m):
+    """Chuyển dãy hoán vị hàng kiểu LAPACK (ipiv) thành một hoán vị của m hàng."""
+    perm = np.arange(m)
+    for i, p in enumerate(piv):
+        if p != i:
+            perm[i], perm[p] = perm[p], perm[i]
+    return perm
+
+def lu_factor_out_of_core(path_a, factor_path, memory_budget):
+    """
+    Phân tích PA = LU (chọn trụ từng phần) theo khối, right-looking, trên tệp .npy
+    được ánh xạ bộ nhớ. L (đơn vị, dưới đường chéo) và U được ghi đè vào một bản
+    sao float64 của A tại factor_path; bộ nhớ dùng chỉ phụ thuộc vào memory_budget.
+
+    Với mỗi khối cột k:k+nb:
+      1. Đọc panel A[k:, k:k+nb], phân tích LU có chọn trụ và ghi lại.
+      2. Áp dụng hoán vị hàng của panel lên các cột bên trái (theo từng khối cột).
+      3. Với từng khối cột bên phải: hoán vị hàng, U12 = L11⁻¹·A12 và cập nhật
+         A22 -= L21·U12, rồi ghi lại.
+
+    Trụ |u_jj| ≤ n·ε·max|a_ij| được coi là bằng 0 (A suy biến): với A suy biến, trụ
+    lẽ ra bằng 0 thường chỉ còn là sai số làm tròn.
+
+    Returns:
+        tuple: (hoán vị hàng perm với PA = A[perm], độ rộng khối nb, ||A||₁)
+    Raises:
+        ValueError: Nếu A không vuông hoặc có trụ (gần) bằng 0.
+    """
+    A = np.load(path_a, mmap_mode='r')
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Ma trận A phải là ma trận vuông.")
+    n = A.shape[0]
+    nb = tile_size(n, memory_budget)
+    LU = np.lib.format.open_memmap(factor_path, mode='w+', dtype=np.float64, shape=(n, n))
+    max_abs, column_sums = 0.0, np.zeros(n)
+    for start in range(0, n, nb):
+        rows = np.asarray(A[start:start + nb], dtype=float)
+        LU[start:start + nb] = rows
+        max_abs = max(max_abs, float(np.max(np.abs(rows), initial=0.0)))
+        column_sums += np.sum(np.abs(rows), axis=0)
+    pivot_tol = n * np.finfo(float).eps * max_abs
+
+    perm = np.arange(n)
+    for k in range(0, n, nb):
+        kb = min(k + nb, n)
+        width = kb - k
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', scipy.linalg.LinAlgWarning)
+            panel, piv = scipy.linalg.lu_factor(np.array(LU[k:, k:kb]), check_finite=False)
+        zero_pivots = np.flatnonzero(np.abs(np.diag(panel)) <= pivot_tol)
+        if zero_pivots.size:
+            raise ValueError(f"Ma trận A suy biến (phần tử trụ bằng 0 tại cột {k + zero_pivots[0] + 1}).")
+        LU[k:, k:kb] = panel
+
+        p = _pivots_to_permutation(piv, n - k)
+        swapped = not np.array_equal(p, np.arange(n - k))
+        if swapped:
+            perm[k:] = perm[k:][p]
+            for c in range(0, k, nb):
+                LU[k:, c:min(c + nb, k)] = np.array(LU[k:, c:min(c + nb, k)])[p]
+
+        L11 = np.tril(panel[:width], -1) + np.eye(width)
+        L21 = panel[width:]
+        for c in range(kb, n, nb):
+            cb = min(c + nb, n)
+            block = np.array(LU[k:, c:cb])
+            if swapped:
+                block = block[p]
+            U12 = scipy.linalg.solve_triangular(L11, block[:width], lower=True, unit_diagonal=True, check_finite=False)
+            block[:width] = U12
+            block[width:] -= L21 @ U12
+            LU[k:, c:cb] = block
+    LU.flush()
+    return perm, nb, float(np.max(column_sums, initial=0.0))
+
+def lu_solve_out_of_core(factor_path, perm, B, nb, trans=False):
+    """
+    Giải LUX = PB với L, U đọc theo từng khối cột từ tệp đã phân tích: thế tiến
+    rồi thế ngược theo khối, B (n×k) được giữ trong bộ nhớ.
+
+    Với trans=True giải AᵀX = B, tức Uᵀ·Lᵀ·(PX) = B: thế tiến với Uᵀ rồi thế ngược
+    với Lᵀ, đọc L, U theo từng khối hàng.
+    """
+    LU = np.load(factor_path, mmap_mode='r')
+    n = LU.shape[0]
+    if trans:
+        Z = np.array(B, dtype=float)
+        for k in range(0, n, nb):
+            kb = min(k + nb, n)
+            Z[k:kb] = scipy.linalg.solve_triangular(LU[k:kb, k:kb], Z[k:kb], trans='T', lower=False, check_finite=False)
+            if kb < n:
+                Z[kb:] -= np.asarray(LU[k:kb, kb:]).T @ Z[k:kb]
+        for k in reversed(range(0, n, nb)):
+            kb = min(k + nb, n)
+            Z[k:kb] = scipy.linalg.solve_triangular(LU[k:kb, k:kb], Z[k:kb], trans='T', lower=True, unit_diagonal=True,
+                                                    check_finite=False)
+            if k > 0:
+                Z[:k] -= np.asarray(LU[k:kb, :k]).T @ Z[k:kb]
+        X = np.empty_like(Z)
+        X[perm] = Z
+        return X
+    Y = np.array(B[perm], dtype=float)
+    for k in range(0, n, nb):
+        kb = min(k + nb, n)
+        Y[k:kb] = scipy.linalg.solve_triangular(LU[k:kb, k:kb], Y[k:kb], lower=True, unit_diagonal=True, check_finite=False)
+        if kb < n:
+            Y[kb:] -= np.asarray(LU[kb:, k:kb]) @ Y[k:kb]
+    for k in reversed(range(0, n, nb)):
+        kb = min(k + nb, n)
+        Y[k:kb] = scipy.linalg.solve_triangular(LU[k:kb, k:kb], Y[k:kb], lower=False, check_finite=False)
+        if k > 0:
+            Y[:k] -= np.asarray(LU[:k, k:kb]) @ Y[k:kb]
+    return Y
+
+def condition_out_of_core(factor_path, perm, nb, anorm):
+    """
+    Ước lượng số điều kiện theo chuẩn 1 khi không thể nạp LU vào bộ nhớ để gọi
+    ?gecon: ||A⁻¹||₁ được ước lượng bằng thuật toán Hager–Higham (onenormest), mỗi
+    lần nhân A⁻¹·v hoặc A⁻ᵀ·v là một lần giải ngoài bộ nhớ.
+
+    Returns:
+        dict: Báo cáo như `condition.condition_from_lu`.
+    """
+    n = len(perm)
+
+    def solve(v, trans=False):
+        V = np.asarray(v, dtype=float)
+        return lu_solve_out_of_core(factor_path, perm, V.reshape(n, -1), nb, trans=trans).reshape(V.shape)
+    inverse = spla.LinearOperator((n, n), matvec=solve, rmatvec=lambda v: solve(v, trans=True),
+                                  matmat=solve, rmatmat=lambda V: solve(V, trans=True), dtype=float)
+    inverse_norm = spla.onenormest(inverse) if n > 0 else 0.0
+    rcond = 1.0 / (anorm * inverse_norm) if anorm > 0 and inverse_norm > 0 and np.isfinite(inverse_norm) else 0.0
+    return _condition_report("Hager–Higham (onenormest, ngoài bộ nhớ)", rcond, n)
+
+def _backward_error_out_of_core(path_a, X, B, nb):
+    """Sai số ngược chuẩn hóa ||B - AX||∞ / (||A||∞·||X||∞ + ||B||∞), đọc A theo khối hàng."""
+    A = np.load(path_a, mmap_mode='r')
+    residual_max = np.zeros(B.shape[1])
+    norm_A = 0.0
+    for start in range(0, A.shape[0], nb):
+        rows = np.asarray(A[start:start + nb], dtype=float)
+        residual_max = np.maximum(residual_max, np.max(np.abs(B[start:start + nb] - rows @ X), axis=0))
+        norm_A = max(norm_A, float(np.max(np.sum(np.abs(rows), axis=1))))
+    denom = norm_A * np.max(np.abs(X), axis=0) + np.max(np.abs(B), axis=0)
+    ratios = np.divide(residual_max, denom, out=np.zeros_like(residual_max), where=denom > 0)
+    return float(np.max(ratios))
+
+def solve_lu_out_of_core(path_a, matrix_b, memory_budget_mb=256, reuse_factorization=True):
+    """
+    Giải AX = B với A lưu trong tệp .npy lớn hơn bộ nhớ (phân tích LU ngoài bộ nhớ).
+
+    Kết quả phân tích được lưu cạnh A (<tên>.lu.npy và <tên>.perm.npy, kèm ||A||₁
+    ở phần tử cuối của tệp perm) và được dùng lại cho các vế phải B khác nếu còn
+    mới hơn tệp A. Kết quả theo cùng định dạng với `solve_lu` (không kèm L, U đầy
+    đủ), kèm ước lượng số điều kiện (`condition_out_of_core`): A suy biến bị từ chối,
+    A có điều kiện kém được cảnh báo.
+    """
+    try:
+        B = np.asarray(matrix_b, dtype=float)
+        if B.ndim == 1:
+            B = B.reshape(-1, 1)
+        A = np.load(path_a, mmap_mode='r')
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            return {"success": False, "error": "Ma trận A phải là ma trận vuông."}
+        n = A.shape[0]
+        if B.shape[0] != n:
+            return {"success": False, "error": "Số hàng của A và B không khớp."}
+        memory_budget = float(memory_budget_mb) * 2**20
+
+        stem = os.path.splitext(path_a)[0]
+        factor_path, perm_path = stem + '.lu.npy', stem + '.perm.npy'
+        reused = (reuse_factorization and os.path.exists(factor_path) and os.path.exists(perm_path)
+                  and os.path.getmtime(factor_path) >= os.path.getmtime(path_a))
+        start = time.perf_counter()
+        if reused:
+            stored = np.load(perm_path)
+            # Tệp perm cũ (không kèm ||A||₁) thì phân tích lại
+            reused = stored.shape == (n + 1,)
+        if reused:
+            perm, anorm = stored[:-1].astype(np.int64), float(stored[-1])
+            nb = tile_size(n, memory_budget)
+        else:
+            try:
+                perm, nb, anorm = lu_factor_out_of_core(path_a, factor_path, memory_budget)
+            except ValueError as e:
+                for path in (factor_path, perm_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                return {"success": False, "error": str(e) + " Hệ vô nghiệm hoặc vô số nghiệm.",
+                        "condition_estimate": _condition_report("trụ bằng 0", 0.0, n)}
+            np.save(perm_path, np.append(perm.astype(float), anorm))
+        factor_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        condition = condition_out_of_core(factor_path, perm, nb, anorm)
+        condition_time = time.perf_counter() - start
+        if condition["singular"]:
+            return {"success": False, "error": f"Ma trận A suy biến (rcond ≈ {condition['rcond']:.1e}). Hệ vô nghiệm hoặc vô số nghiệm.",
+                    "condition_estimate": condition}
+
+        start = time.perf_counter()
+        X = lu_solve_out_of_core(factor_path, perm, B, nb)
+        solve_time = time.perf_counter() - start
+        berr = _backward_error_out_of_core(path_a, X, B, nb)
+        message = f"Hệ có nghiệm duy nhất (phân rã LU ngoài bộ nhớ theo khối {nb} cột, sai số ngược {berr:.2e})"
+        if condition["ill_conditioned"]:
+            message += f"; cảnh báo: A có điều kiện kém (κ₁(A) ≈ {condition['condition_number_1']:.2e})"
+        return {
+            "success": True,
+            "status": "unique_solution",
+            "message": message,
+            "solution": X.tolist(),
+            "decomposition": None,
+            "intermediate_y": None,
+            "lu_trace": None,
+            "condition_estimate": condition,
+            "out_of_core": {
+                "n": n,
+                "tile_size": nb,
+                "memory_budget_mb": float(memory_budget_mb),
+                "matrix_size_mb": n * n * 8 / 2**20,
+                "reused_factorization": bool(reused),
+                "factor_time": factor_time,
+                "solve_time": solve_time,
+                "condition_time": condition_time,
+                "backward_error": berr
+            }
+        }
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi nghiêm trọng: {traceback.format_exc()}"}
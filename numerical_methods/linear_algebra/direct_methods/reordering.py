@@ -0,0 +1,93 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+def bandwidths(A):
+    """Độ rộng dải dưới l và trên u: a_ij = 0 khi i - j > l hoặc j - i > u."""
+    if sp.issparse(A):
+        coo = A.tocoo()
+        rows, cols = coo.row[coo.data != 0], coo.col[coo.data != 0]
+    else:
+        rows, cols = np.nonzero(A)
+    if rows.size == 0:
+        return 0, 0
+    offsets = cols.astype(np.int64) - rows.astype(np.int64)
+    return int(max(0, -offsets.min())), int(max(0, offsets.max()))
+
+def _symmetric_pattern(A):
+    """Cấu trúc thưa đối xứng của A + Aᵀ (dạng CSR, giá trị bool)."""
+    pattern = sp.csr_matrix(A != 0) if not sp.issparse(A) else sp.csr_matrix(A, dtype=bool)
+    return (pattern + pattern.T).tocsr()
+
+def profile(A):
+    """
+    Profile (kích thước bao) của A: Σ_i (i - f_i), với f_i là cột khác 0 đầu tiên
+    của hàng i trong cấu trúc đối xứng A + Aᵀ (tính cả đường chéo).
+    """
+    pattern = _symmetric_pattern(A).tocoo()
+    n = A.shape[0]
+    first = np.arange(n)
+    np.minimum.at(first, pattern.row, pattern.col)
+    return int(np.sum(np.arange(n) - first))
+
+def rcm_permutation(A):
+    """Hoán vị Reverse Cuthill–McKee trên đồ thị của A + Aᵀ."""
+    return reverse_cuthill_mckee(_symmetric_pattern(A), symmetric_mode=True).astype(int)
+
+def permute_symmetric(A, perm):
+    """Ma trận P·A·Pᵀ với (P·A·Pᵀ)[i, j] = A[perm[i], perm[j]]."""
+    if sp.issparse(A):
+        return A.tocsr()[perm][:, perm]
+    return A[np.ix_(perm, perm)]
+
+def reordering_report(A, A_perm):
+    """Độ rộng dải và profile trước / sau khi sắp xếp lại."""
+    lower_before, upper_before = bandwidths(A)
+    lower_after, upper_after = bandwidths(A_perm)
+    return {
+        "method": "rcm",
+        "bandwidth_before": max(lower_before, upper_before),
+        "bandwidth_after": max(lower_after, upper_after),
+        "profile_before": profile(A),
+        "profile_after": profile(A_perm)
+    }
+
+def _unpermute_rows(matrix, perm):
+    M = np.asarray(matrix, dtype=float)
+    out = np.empty_like(M)
+    out[perm] = M
+    return out.tolist()
+
+def solve_with_rcm(solver_function, matrix_a, matrix_b):
+    """
+    Sắp xếp lại hệ bằng Reverse Cuthill–McKee rồi giải bằng solver_function.
+
+    Với hoán vị p: giải (P·A·Pᵀ)·Y = P·B, sau đó X[p] = Y. Phép hoán vị đối xứng
+    giữ nguyên tính đối xứng và xác định dương, nên dùng được trước LU, Cholesky
+    và đường nhanh cho ma trận dải. Các thành phần nghiệm trong kết quả được hoán
+    vị ngược lại; các ma trận phân tích (nếu có) ứng với hệ đã sắp xếp lại.
+
+    Returns:
+        dict | None: Kết quả của solver_function (kèm "reordering"), hoặc None
+        nếu solver_function trả về None.
+    """
+    A = matrix_a
+    B = np.asarray(matrix_b, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        return solver_function(matrix_a, matrix_b)
+    perm = rcm_permutation(A)
+    A_perm = permute_symmetric(A, perm)
+    result = solver_function(A_perm, B[perm])
+    if result is None:
+        return None
+    if result.get('solution') is not None:
+        result['solution'] = _unpermute_rows(result['solution'], perm)
+    general = result.get('general_solution')
+    if general:
+        general['particular_solution'] = _unpermute_rows(general['particular_solution'], perm)
+        if general.get('num_free_vars'):
+            general['null_space_vectors'] = _unpermute_rows(general['null_space_vectors'], perm)
+    report = reordering_report(A, A_perm)
+    report["permutation"] = perm.tolist()
+    result['reordering'] = report
+    return result
@@ -0,0 +1,111 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+def _sparse_info(A, factor, permc_spec):
+    n = A.shape[0]
+    return {
+        "shape": list(A.shape),
+        "nnz": int(A.nnz),
+        "density": A.nnz / max(n * n, 1),
+        "factor_nnz": int(factor.L.nnz + factor.U.nnz),
+        "permc_spec": permc_spec
+    }
+
+def solve_sparse_lu(matrix_a, matrix_b):
+    """
+    Giải hệ AX = B với A thưa bằng phân tích LU thưa (SuperLU, pivoting từng phần).
+
+    Các cột được sắp xếp lại theo COLAMD để giảm số phần tử lấp đầy (fill-in).
+    Nếu A suy biến, trả về lỗi với khóa "singular" để nơi gọi có thể chuyển
+    sang thuật toán đầy đủ (phân loại vô nghiệm / vô số nghiệm).
+    """
+    try:
+        A = sp.csc_matrix(matrix_a, dtype=float)
+        B = np.asarray(matrix_b, dtype=float)
+        if B.ndim == 1:
+            B = B.reshape(-1, 1)
+        if A.shape[0] != A.shape[1]:
+            return {"success": False, "error": "Ma trận A phải là ma trận vuông để phân tích LU thưa."}
+        if A.shape[0] != B.shape[0]:
+            return {"success": False, "error": "Số hàng của A và B không khớp."}
+        permc_spec = 'COLAMD'
+        try:
+            factor = splu(A, permc_spec=permc_spec)
+        except RuntimeError:
+            return {"success": False, "singular": True, "error": "Ma trận A suy biến (phân tích LU thưa thất bại)."}
+        X = factor.solve(B)
+        return {
+            "success": True,
+            "status": "unique_solution",
+            "message": "Hệ có nghiệm duy nhất tìm bằng phân tích LU thưa (SuperLU).",
+            "solution": X.tolist(),
+            "sparse_info": _sparse_info(A, factor, permc_spec)
+        }
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi nghiêm trọng: {traceback.format_exc()}"}
+
+def solve_sparse_cholesky(matrix_a, matrix_b, mode='cholesky'):
+    """
+    Giải hệ AX = B với A thưa bằng phân tích kiểu Cholesky M = L·D·Lᵀ.
+
+    SuperLU được chạy ở chế độ đối xứng: sắp xếp lại đối xứng (minimum degree
+    trên M + Mᵀ) và không pivoting ngoài đường chéo, nên U = D·Lᵀ. Khi mode là
+    'cholesky', M xác định dương khi và chỉ khi mọi phần tử chéo của D dương.
+    Nếu A không đối xứng, giải hệ chuẩn AᵀAx = Aᵀb như phương pháp Cholesky đầy đủ.
+    """
+    try:
+        A = sp.csr_matrix(matrix_a, dtype=float)
+        B = np.asarray(matrix_b, dtype=float)
+        if B.ndim == 1:
+            B = B.reshape(-1, 1)
+        if A.shape[0] != A.shape[1]:
+            return {"success": False, "error": "Ma trận A phải là ma trận vuông."}
+        if A.shape[0] != B.shape[0]:
+            return {"success": False, "error": "Số hàng của A và B không khớp."}
+
+        asymmetry = abs(A - A.T).max() if A.nnz else 0.0
+        scale = abs(A).max() if A.nnz else 0.0
+        is_symmetric = asymmetry <= 1e-8 * (1 + scale)
+        if is_symmetric:
+            M, d = A, B
+            transformation_message = "Ma trận A đối xứng, tiến hành phân tách trực tiếp."
+        else:
+            transformation_message = "Ma trận A không đối xứng. Chuyển hệ về dạng AᵀAx = Aᵀb."
+            M = (A.T @ A).tocsr()
+            d = A.T @ B
+
+        diag = M.diagonal()
+        if mode == 'cholesky' and np.any(diag <= 0):
+            return {"success": False, "error": "Ma trận có phần tử chéo không dương, không xác định dương."}
+
+        permc_spec = 'MMD_AT_PLUS_A'
+        try:
+            factor = splu(M.tocsc(), permc_spec=permc_spec, diag_pivot_thresh=0.0,
+                          options={'SymmetricMode': True})
+        except RuntimeError:
+            return {"success": False, "singular": True, "error": "Ma trận suy biến, không thể phân tích."}
+
+        D = factor.U.diagonal()
+        symmetric_pivoting = np.array_equal(factor.perm_r, factor.perm_c)
+        if mode == 'cholesky' and (not symmetric_pivoting or np.any(D <= 0)):
+            if not is_symmetric:
+                return {"success": False, "error": "Ma trận A không đối xứng và ma trận AᵀA tạo ra không xác định dương. Không thể giải bằng Cholesky."}
+            return {"success": False, "error": "Ma trận không xác định dương, không thể phân tích Cholesky."}
+
+        X = factor.solve(d)
+        name = "Cholesky" if mode == 'cholesky' else "LDLᵀ"
+        info = _sparse_info(M, factor, permc_spec)
+        info["symmetric_pivoting"] = bool(symmetric_pivoting)
+        return {
+            "success": True,
+            "status": "unique_solution",
+            "message": f"Hệ có nghiệm duy nhất tìm bằng phân tách {name} thưa (M = L·D·Lᵀ, SuperLU chế độ đối xứng).",
+            "transformation_message": transformation_message,
+            "solution": X.tolist(),
+            "sparse_info": info
+        }
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi nghiêm trọng: {traceback.format_exc()}"}
@@ -0,0 +1,61 @@
+import numpy as np
+
+class StepTrace:
+    """
+    Ghi lại các bước biến đổi ma trận dưới dạng nén (chỉ lưu phần thay đổi).
+
+    Thay vì lưu một bản sao đầy đủ của ma trận ở mỗi bước (O(n³) bộ nhớ cho cả
+    quá trình), mỗi bước chỉ lưu khối con [hàng thay đổi] × [cột thay đổi].
+    Mọi phần tử khác với bước trước đều nằm trong khối này, nên từ ma trận ban
+    đầu có thể dựng lại chính xác ma trận ở bất kỳ bước nào.
+
+    Có thể theo dõi đồng thời nhiều ma trận có tên (ví dụ L và U của phân tích LU).
+    """
+
+    def __init__(self, **matrices):
+        self.initial = {name: np.array(M, dtype=float) for name, M in matrices.items()}
+        self._current = {name: M.copy() for name, M in self.initial.items()}
+        self.steps = []
+
+    def __len__(self):
+        return len(self.steps)
+
+    def record(self, meta=None, **matrices):
+        """
+        Ghi một bước: `meta` là các thông tin đi kèm (message, step, ...),
+        các ma trận truyền vào là trạng thái sau bước đó.
+        """
+        changes = {}
+        for name, M in matrices.items():
+            current = self._current[name]
+            diff = M != current
+            rows = np.flatnonzero(diff.any(axis=1))
+            if rows.size == 0:
+                continue
+            cols = np.flatnonzero(diff.any(axis=0))
+            block = M[np.ix_(rows, cols)]
+            current[np.ix_(rows, cols)] = block
+            changes[name] = (rows, cols, block.copy())
+        self.steps.append((dict(meta or {}), changes))
+
+    def to_dict(self, tol=None):
+        """
+        Chuyển sang dạng JSON:
+            {"initial": {tên: ma trận}, "steps": [{...meta, "changes": {tên: {"rows", "cols", "values"}}}]}
+        Nếu có tol, các giá trị có trị tuyệt đối nhỏ hơn tol được làm tròn thành 0.
+        """
+        def clean(M):
+            if tol is not None:
+                M = np.where(np.abs(M) < tol, 0.0, M)
+            return M.tolist()
+
+        return {
+            "initial": {name: clean(M) for name, M in self.initial.items()},
+            "steps": [
+                {**meta, "changes": {
+                    name: {"rows": rows.tolist(), "cols": cols.tolist(), "values": clean(block)}
+                    for name, (rows, cols, block) in changes.items()
+                }}
+                for meta, changes in self.steps
+            ]
+        }
@@ -0,0 +1,152 @@
+import os
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+from concurrent.futures import ThreadPoolExecutor
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+
+from numerical_methods.linear_algebra.direct_methods.reordering import bandwidths
+
+def _is_toeplitz(A):
+    """Ma trận Toeplitz: các phần tử trên mỗi đường chéo bằng nhau."""
+    return np.allclose(A[1:, 1:], A[:-1, :-1], rtol=1e-12, atol=0.0)
+
+def _diagonal_blocks(A):
+    """
+    Các khối độc lập của A: thành phần liên thông của đồ thị có cạnh (i, j) khi
+    a_ij ≠ 0 hoặc a_ji ≠ 0. Với ma trận khối chéo (kể cả sau một hoán vị đối xứng),
+    mỗi khối là một thành phần.
+    """
+    graph = sp.csr_matrix(A) if sp.issparse(A) else sp.csr_matrix(A != 0)
+    num_blocks, labels = connected_components(graph, directed=False)
+    return num_blocks, labels
+
+def analyze_structure(A):
+    """
+    Nhận diện cấu trúc đặc biệt của ma trận vuông A (đầy đủ hoặc thưa).
+
+    Thứ tự ưu tiên: dải hẹp (gồm ba đường chéo) -> Toeplitz -> khối chéo -> tổng quát.
+
+    Returns:
+        dict: {"kind": 'banded' | 'toeplitz' | 'block_diagonal' | 'general', ...}
+    """
+    n = A.shape[0]
+    lower, upper = bandwidths(A)
+    if lower + upper + 1 <= max(3, n // 4):
+        kind = 'tridiagonal' if max(lower, upper) <= 1 else 'banded'
+        return {"kind": 'banded', "band": kind, "lower": lower, "upper": upper}
+    if not sp.issparse(A) and n > 1 and _is_toeplitz(A):
+        return {"kind": 'toeplitz'}
+    num_blocks, labels = _diagonal_blocks(A)
+    if num_blocks > 1:
+        return {"kind": 'block_diagonal', "num_blocks": int(num_blocks), "labels": labels,
+                "block_sizes": np.bincount(labels).tolist()}
+    return {"kind": 'general'}
+
+def _band_storage(A, lower, upper):
+    """Lưu A theo dạng dải của LAPACK: ab[u + i - j, j] = a_ij."""
+    n = A.shape[0]
+    ab = np.zeros((lower + upper + 1, n))
+    for k in range(-lower, upper + 1):
+        diag = np.asarray(A.diagonal(k)).ravel()
+        start = max(k, 0)
+        ab[upper - k, start:start + diag.size] = diag
+    return ab
+
+def _is_symmetric(A):
+    if sp.issparse(A):
+        return A.nnz == 0 or abs(A - A.T).max() <= 1e-8 * (1 + abs(A).max())
+    return np.allclose(A, A.T)
+
+def _solve_block(block, rhs, spd):
+    if not sp.issparse(block):
+        return scipy.linalg.solve(block, rhs, assume_a='pos' if spd else 'gen')
+    if not spd:
+        return splu(block.tocsc()).solve(rhs)
+    # Phân tích đối xứng L·D·Lᵀ (như solve_sparse_cholesky), xác định dương khi D > 0
+    factor = splu(block.tocsc(), permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0, options={'SymmetricMode': True})
+    if not np.array_equal(factor.perm_r, factor.perm_c) or np.any(factor.U.diagonal() <= 0):
+        raise np.linalg.LinAlgError("Khối không xác định dương.")
+    return factor.solve(rhs)
+
+def solve_structured(matrix_a, matrix_b, spd=False, max_workers=None):
+    """
+    Giải AX = B theo đường nhanh dựa trên cấu trúc của A.
+
+      - Dải hẹp (l, u): scipy.linalg.solve_banded, O(n·l·(l+u)); với ma trận ba đường
+        chéo, SciPy dùng LAPACK ?gtsv (thuật toán Thomas có chọn trụ). Khi spd=True
+        và A đối xứng, dùng solveh_banded (Cholesky dạng dải).
+      - Toeplitz: thuật toán Levinson (solve_toeplitz), O(n²).
+      - Khối chéo: giải độc lập từng khối, song song bằng một nhóm luồng.
+
+    Returns:
+        dict | None: Kết quả (kèm "structure" và "fast_path"), hoặc None nếu không
+        có đường nhanh phù hợp hay A suy biến (nơi gọi dùng thuật toán tổng quát).
+        Khi spd=True (dùng cho Cholesky), chỉ nhận A đối xứng và mọi đường nhanh đều
+        kiểm tra tính xác định dương; A không đối xứng được để lại cho thuật toán
+        tổng quát (giải hệ chuẩn AᵀAx = Aᵀb).
+    """
+    A = matrix_a
+    B = np.asarray(matrix_b, dtype=float)
+    if B.ndim == 1:
+        B = B.reshape(-1, 1)
+    n = A.shape[0]
+    if A.ndim != 2 or n != A.shape[1] or B.shape[0] != n or n < 2:
+        return None
+    if spd and not _is_symmetric(A):
+        return None
+
+    structure = analyze_structure(A)
+    kind = structure['kind']
+    try:
+        if kind == 'banded':
+            lower, upper = structure['lower'], structure['upper']
+            if spd:
+                ab = _band_storage(A, 0, upper)
+                X = scipy.linalg.solveh_banded(ab, B)
+                fast_path = f"solveh_banded (Cholesky dạng dải, độ rộng dải {upper})"
+            else:
+                ab = _band_storage(A, lower, upper)
+                X = scipy.linalg.solve_banded((lower, upper), ab, B)
+                fast_path = ("solve_banded (thuật toán Thomas, LAPACK ?gtsv)" if structure['band'] == 'tridiagonal'
+                             else f"solve_banded (l={lower}, u={upper})")
+        elif kind == 'toeplitz':
+            if spd:
+                return None
+            X = scipy.linalg.solve_toeplitz((A[:, 0], A[0, :]), B)
+            # Levinson không phát hiện tốt ma trận (gần) suy biến: kiểm tra phần dư
+            residual = np.linalg.norm(A @ X - B)
+            if not np.all(np.isfinite(X)) or residual > 1e-8 * (np.linalg.norm(A) * np.linalg.norm(X) + np.linalg.norm(B)):
+                return None
+            fast_path = "solve_toeplitz (thuật toán Levinson)"
+        elif kind == 'block_diagonal':
+            labels = structure.pop('labels')
+            A_rows = A.tocsr() if sp.issparse(A) else A
+            index_sets = [np.flatnonzero(labels == b) for b in range(structure['num_blocks'])]
+
+            def solve_one(idx):
+                block = A_rows[idx][:, idx]
+                return idx, _solve_block(block, B[idx], spd)
+
+            X = np.zeros_like(B)
+            workers = max_workers or min(len(index_sets), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for idx, X_block in executor.map(solve_one, index_sets):
+                    X[idx] = X_block
+            fast_path = f"Giải độc lập {structure['num_blocks']} khối chéo (song song {workers} luồng)"
+        else:
+            return None
+    except (np.linalg.LinAlgError, RuntimeError, ValueError):
+        return None
+
+    if not np.all(np.isfinite(X)):
+        return None
+    return {
+        "success": True,
+        "status": "unique_solution",
+        "message": f"Hệ có nghiệm duy nhất tìm theo đường nhanh: {fast_path}.",
+        "solution": X.tolist(),
+        "structure": structure,
+        "fast_path": fast_path
+    }
@@ -1,4 +1,7 @@
 import numpy as np
+import scipy.linalg
+
+from numerical_methods.linear_algebra.condition import lu_factor_with_condition
 
 def getCharPolynomial(A):
     """
@@ -35,6 +38,7 @@ def danilevsky_algorithm(A):
     similar = A.copy().astype(complex)
     back = np.eye(n, dtype=complex)
     steps_log = [{'desc': 'Ma trận ban đầu', 'matrix': format_matrix_for_json(A.copy())}]
+    worst_condition = None
 
     # --- Giai đoạn 1: Biến đổi ma trận về dạng tam giác trên theo khối Frobenius ---
     for k in range(n - 1, 0, -1):
@@ -65,11 +69,16 @@ def danilevsky_algorithm(A):
         M = np.eye(n, dtype=complex)
         M[k - 1, :] = similar[k, :]
         
-        # Kiểm tra nếu M suy biến trước khi tính nghịch đảo
-        if np.linalg.cond(M) > 1/np.finfo(M.dtype).eps:
-             return {'success': False, 'error': f'Ma trận biến đổi M ở bước k={k} bị suy biến, không thể tiếp tục.'}
+        # Kiểm tra M suy biến bằng ước lượng số điều kiện từ phân tích LU của M,
+        # rồi dùng lại chính phân tích này để tính M⁻¹
+        lu, piv, condition = lu_factor_with_condition(M)
+        if condition['singular']:
+             return {'success': False, 'error': f'Ma trận biến đổi M ở bước k={k} bị suy biến, không thể tiếp tục.',
+                     'condition_estimate': condition}
+        if worst_condition is None or condition['rcond'] < worst_condition['rcond']:
+            worst_condition = condition
 
-        M_inv = np.linalg.inv(M)
+        M_inv = scipy.linalg.lu_solve((lu, piv), np.eye(n, dtype=complex))
 
         similar = M @ similar @ M_inv
         back = back @ M_inv
@@ -77,7 +86,8 @@ def danilevsky_algorithm(A):
             'desc': f'Sau khi biến đổi hàng {k+1}.',
             'matrix': format_matrix_for_json(similar.copy()),
             'M': format_matrix_for_json(M),
-            'M_inv': format_matrix_for_json(M_inv)
+            'M_inv': format_matrix_for_json(M_inv),
+            'condition_number_1': condition['condition_number_1']
         })
         
     steps_log.append({'desc': 'Ma trận cuối (dạng tam giác trên theo khối Frobenius)', 'matrix': format_matrix_for_json(similar.copy())})
@@ -125,6 +135,7 @@ def danilevsky_algorithm(A):
         'eigenvectors': [format_eigenvector(vec) for vec in final_eigenvectors],
         'frobenius_matrix': "Ma trận cuối cùng là dạng tam giác trên theo khối Frobenius",
         'char_poly': [format_complex_number(c) for c in total_char_poly_coeffs],
-        'steps': steps_log
+        'steps': steps_log,
+        'condition_estimate': worst_condition
     }
     return results
\ No newline at end of file
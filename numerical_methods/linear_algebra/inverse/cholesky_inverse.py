@@ -1,4 +1,7 @@
 import numpy as np
+import scipy.linalg
+
+from numerical_methods.linear_algebra.direct_methods.cholesky import spd_precheck
 
 def solve_inverse_cholesky(A, **kwargs):
     """
@@ -24,6 +27,10 @@ def solve_inverse_cholesky(A, **kwargs):
                 "matrix": M.tolist()
             })
 
+        # Loại sớm các ma trận chắc chắn không xác định dương (O(n²))
+        if spd_precheck(M):
+            return {"success": False, "error": "Ma trận không xác định dương, không thể phân rã Cholesky."}
+
         # Phân rã Cholesky: M = UᵀU
         try:
             U = np.linalg.cholesky(M).T # numpy.linalg.cholesky trả về L, ta cần U=L.T
@@ -36,8 +43,8 @@ def solve_inverse_cholesky(A, **kwargs):
             "L": U.T.tolist() # U.T chính là L trong M = LU
         })
 
-        # Tìm nghịch đảo của U (ma trận tam giác trên)
-        inv_U = np.linalg.inv(U)
+        # Tìm nghịch đảo của U (ma trận tam giác trên) bằng thế ngược
+        inv_U = scipy.linalg.solve_triangular(U, np.eye(n), lower=False)
         steps.append({
             "message": "Tính U⁻¹.",
             "matrix": inv_U.tolist()
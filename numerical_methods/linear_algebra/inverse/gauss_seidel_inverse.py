@@ -1,6 +1,8 @@
 import numpy as np
 import traceback
 
+from numerical_methods.linear_algebra.iterative_methods.gauss_seidel import gauss_seidel_sweep
+
 def _gauss_seidel_solver(A, b, eps, max_iter):
     """
     Hàm trợ giúp: Giải một hệ phương trình Ax = b bằng phương pháp Gauss-Seidel.
@@ -8,18 +10,17 @@ def _gauss_seidel_solver(A, b, eps, max_iter):
     n = len(b)
     x = np.zeros(n)
     iteration_details = []
+    zero_diag = np.flatnonzero(np.diag(A) == 0)
+    if zero_diag.size:
+        # Tránh lỗi chia cho 0 nếu phần tử đường chéo bằng 0
+        i = zero_diag[0]
+        raise ValueError(f"Phần tử đường chéo a[{i},{i}] bằng 0, không thể tiếp tục.")
+    lower, upper = np.tril(A), np.triu(A, 1)
+    b = np.asarray(b, dtype=float)
 
     for k in range(max_iter):
-        x_old = x.copy()
-        for i in range(n):
-            if A[i, i] == 0:
-                # Tránh lỗi chia cho 0 nếu phần tử đường chéo bằng 0
-                raise ValueError(f"Phần tử đường chéo a[{i},{i}] bằng 0, không thể tiếp tục.")
-            
-            sum1 = np.dot(A[i, :i], x[:i])
-            sum2 = np.dot(A[i, i + 1:], x_old[i + 1:])
-            x[i] = (b[i] - sum1 - sum2) / A[i, i]
-        
+        x_old = x
+        x = gauss_seidel_sweep(lower, upper, b, x_old)
         error = np.linalg.norm(x - x_old, np.inf)
         iteration_details.append({
             'k': k + 1,
@@ -109,20 +110,13 @@ def solve_inverse_gauss_seidel(A, x0_method='method1', eps=1e-5, max_iter=100):
         })
         table_rows = []
         final_error = float('inf')
+        lower, upper = np.tril(A), np.triu(A, 1)
+        E = np.identity(n)
 
         for i in range(max_iter):
-            X_prev = X_k.copy()
-            # Lặp Gauss-Seidel cho từng cột
-            for j in range(n):
-                e_j = np.zeros((n, 1))
-                e_j[j, 0] = 1
-                x_col = X_k[:, j].reshape(-1, 1)
-                for it in range(1):  # chỉ 1 lần cho mỗi bước lặp ngoài
-                    for row in range(n):
-                        sum1 = np.dot(A[row, :row], x_col[:row, 0])
-                        sum2 = np.dot(A[row, row+1:], x_col[row+1:, 0])
-                        x_col[row, 0] = (e_j[row, 0] - sum1 - sum2) / A[row, row]
-                X_k[:, j] = x_col[:, 0]
+            X_prev = X_k
+            # Lặp Gauss-Seidel cho mọi cột của E cùng lúc (một phép thế tiến)
+            X_k = gauss_seidel_sweep(lower, upper, E, X_prev)
             diff_norm = np.linalg.norm(X_k - X_prev, norm)
             estimated_error = stopping_factor * diff_norm
             table_rows.append({
@@ -1,6 +1,8 @@
 import numpy as np
 import scipy.linalg
 
+from numerical_methods.linear_algebra.condition import lu_factor_with_condition, unpack_lu
+
 def solve_inverse_lu(A, **kwargs):
     """
     Tính ma trận nghịch đảo A⁻¹ bằng phân rã LU.
@@ -9,14 +11,15 @@ def solve_inverse_lu(A, **kwargs):
     try:
         if A.shape[0] != A.shape[1]:
             return {"success": False, "error": "Ma trận phải là ma trận vuông."}
-        if np.linalg.det(A) == 0:
-             return {"success": False, "error": "Ma trận suy biến (det(A)=0), không có nghịch đảo."}
 
         n = A.shape[0]
         steps = []
 
-        # Bước 1: Phân rã PA = LU
-        P, L, U = scipy.linalg.lu(A)
+        # Bước 1: Phân rã PA = LU, kèm ước lượng số điều kiện để phát hiện ma trận suy biến
+        lu, piv, condition = lu_factor_with_condition(A)
+        if condition["singular"]:
+             return {"success": False, "error": "Ma trận suy biến (det(A)=0), không có nghịch đảo.", "condition_estimate": condition}
+        P, L, U = unpack_lu(lu, piv)
         steps.append({
             "message": "Bước 1: Phân rã PA = LU",
             "P": P.tolist(),
@@ -47,7 +50,8 @@ def solve_inverse_lu(A, **kwargs):
             "message": "Tính ma trận nghịch đảo bằng phân rã LU thành công.",
             "inverse": inv_A.tolist(),
             "check": check_matrix.tolist(),
-            "steps": steps
+            "steps": steps,
+            "condition_estimate": condition
         }
         
     except np.linalg.LinAlgError as e:
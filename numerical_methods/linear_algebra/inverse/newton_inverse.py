@@ -1,6 +1,8 @@
 # doanvinhnhan/may-tinh-giai-tich-so/May-tinh-Giai-Tich-So-main/numerical_methods/linear_algebra/inverse/newton_inverse.py
 import numpy as np
 
+from numerical_methods.linear_algebra.condition import lu_factor_with_condition
+
 def solve_inverse_newton(A, eps=1e-5, max_iter=100, x0_method='auto', **kwargs):
     """
     Tìm ma trận nghịch đảo gần đúng bằng phương pháp lặp Newton.
@@ -10,8 +12,10 @@ def solve_inverse_newton(A, eps=1e-5, max_iter=100, x0_method='auto', **kwargs):
         n = A.shape[0]
         if n != A.shape[1]:
             return {"success": False, "error": "Ma trận phải là ma trận vuông."}
-        if np.linalg.det(A) == 0:
-            return {"success": False, "error": "Ma trận suy biến, không có nghịch đảo."}
+        # Ước lượng số điều kiện từ phân tích LU (det(A) dễ tràn số trên/dưới khi n lớn)
+        condition = lu_factor_with_condition(A)[2]
+        if condition["singular"]:
+            return {"success": False, "error": "Ma trận suy biến, không có nghịch đảo.", "condition_estimate": condition}
 
         E = np.identity(n)
         steps = []
@@ -81,7 +85,8 @@ def solve_inverse_newton(A, eps=1e-5, max_iter=100, x0_method='auto', **kwargs):
             "message": f"Hội tụ sau {i+1} lần lặp.",
             "inverse": inv_A.tolist(),
             "check": check_matrix.tolist(),
-            "steps": steps
+            "steps": steps,
+            "condition_estimate": condition
         }
 
     except Exception as e:
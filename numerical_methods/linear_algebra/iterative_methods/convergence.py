@@ -0,0 +1,204 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+EXACT_SPECTRUM_SIZE = 100
+
+def power_spectral_radius(apply_b, n, num_iter=100, tol=1e-5):
+    """
+    Ước lượng bán kính phổ ρ(B) bằng phương pháp lũy thừa, chỉ cần phép nhân B·v.
+
+    Dùng tỉ số hai bước ρ² ≈ ||B²·v|| / ||v|| để không bị dao động khi phổ đối xứng
+    (±μ, thường gặp với ma trận lặp Jacobi). Nếu ước lượng không ổn định (ví dụ
+    cặp trị riêng phức trội), lấy trung bình nhân của tỉ số chuẩn trên nửa sau.
+
+    Returns:
+        tuple: (ρ ước lượng, số lần nhân B·v)
+    """
+    v = np.random.default_rng(0).uniform(0.5, 1.5, n)
+    v /= np.linalg.norm(v)
+    log_norms = []
+    estimates = []
+    for k in range(num_iter):
+        w = apply_b(v)
+        norm = np.linalg.norm(w)
+        if not norm > 0:
+            return 0.0, k + 1
+        log_norms.append(np.log(norm))
+        v = w / norm
+        if k >= 1:
+            estimates.append(np.exp((log_norms[-1] + log_norms[-2]) / 2))
+            recent = estimates[-3:]
+            if len(recent) == 3 and max(recent) - min(recent) <= tol * recent[-1]:
+                return float(recent[-1]), k + 1
+    if num_iter < 2:
+        return float(np.exp(log_norms[-1])), num_iter
+    return float(np.exp(np.mean(log_norms[len(log_norms) // 2:]))), num_iter
+
+def estimate_spectral_radius(apply_b, n, dense_b=None, tol=1e-4, max_restarts=50):
+    """
+    ρ(B): tính đúng bằng np.linalg.eigvals khi B nhỏ (n ≤ EXACT_SPECTRUM_SIZE) và có
+    sẵn dạng đầy đủ (dense_b có thể là một hàm trả về B, chỉ được gọi khi n nhỏ).
+
+    Với n lớn, dùng phương pháp Arnoldi (ARPACK, chỉ cần phép nhân B·v). Khi ρ ≈ 1,
+    phương pháp lũy thừa hội tụ rất chậm và đánh giá thấp ρ, làm số bước lặp dự
+    đoán sai đáng kể; Arnoldi đạt sai số tương đối ~tol sau vài chục phép nhân.
+    Nếu ARPACK không hội tụ, quay về `power_spectral_radius`.
+
+    Returns:
+        tuple: (ρ, thông tin về cách tính)
+    """
+    if dense_b is not None and n <= EXACT_SPECTRUM_SIZE:
+        B = dense_b() if callable(dense_b) else dense_b
+        B = B.toarray() if sp.issparse(B) else np.asarray(B, dtype=float)
+        rho = float(np.max(np.abs(np.linalg.eigvals(B)))) if n else 0.0
+        return rho, {"method": "eigvals", "matvecs": 0}
+    matvecs = [0]
+
+    def counted(v):
+        matvecs[0] += 1
+        return apply_b(np.asarray(v).reshape(n))
+    if n >= 3:
+        operator = spla.LinearOperator((n, n), matvec=counted, dtype=float)
+        v0 = np.random.default_rng(0).uniform(0.5, 1.5, n)
+        try:
+            values = spla.eigs(operator, k=1, which='LM', tol=tol, maxiter=max_restarts, v0=v0,
+                               return_eigenvectors=False)
+            return float(np.abs(values[0])), {"method": "arnoldi", "matvecs": matvecs[0]}
+        except spla.ArpackNoConvergence:
+            pass
+    rho, power_matvecs = power_spectral_radius(apply_b, n)
+    return rho, {"method": "power", "matvecs": matvecs[0] + power_matvecs}
+
+def estimate_real_spectrum_bounds(B, tol=1e-8):
+    """
+    Khoảng [a, b] chứa phổ (thực) của B, dùng cho tăng tốc Chebyshev.
+
+      - B đối xứng: trị riêng nhỏ nhất/lớn nhất (eigvalsh khi n nhỏ, ARPACK eigsh
+        khi n lớn).
+      - B không đối xứng, n nhỏ: tính toàn bộ trị riêng; nếu có trị riêng phức
+        đáng kể thì báo lỗi (khoảng thực không bao được phổ).
+      - B không đối xứng, n lớn: giả thiết phổ thực, dùng [-ρ(B), ρ(B)].
+
+    Returns:
+        tuple: (a, b, cách ước lượng)
+    Raises:
+        ValueError: Nếu phổ của B có phần ảo đáng kể.
+    """
+    n = B.shape[0]
+    symmetric = np.allclose(B, B.T, rtol=1e-12, atol=1e-14)
+    if symmetric:
+        if n <= EXACT_SPECTRUM_SIZE or n < 3:
+            values = np.linalg.eigvalsh(B)
+            return float(values[0]), float(values[-1]), "eigvalsh"
+        low = spla.eigsh(B, k=1, which='SA', tol=tol, return_eigenvectors=False)[0]
+        high = spla.eigsh(B, k=1, which='LA', tol=tol, return_eigenvectors=False)[0]
+        return float(low), float(high), "eigsh (ARPACK)"
+    if n <= EXACT_SPECTRUM_SIZE:
+        values = np.linalg.eigvals(B)
+        radius = np.max(np.abs(values)) if n else 0.0
+        if np.max(np.abs(values.imag), initial=0.0) > 1e-8 * max(radius, 1.0):
+            raise ValueError("Ma trận B có trị riêng phức nên không có khoảng thực chứa phổ; "
+                             "hãy cung cấp spectral_bounds hoặc dùng phép lặp đơn thông thường.")
+        return float(values.real.min()), float(values.real.max()), "eigvals"
+    rho, info = estimate_spectral_radius(lambda v: B @ v, n)
+    return -rho, rho, f"[-ρ(B), ρ(B)] với ρ(B) ước lượng bằng {info['method']} (giả thiết phổ thực)"
+
+def predict_iterations(rho, initial_diff, threshold):
+    """
+    Số bước lặp dự đoán để điều kiện dừng ||x⁽ᵏ⁾ - x⁽ᵏ⁻¹⁾|| < threshold được thỏa, với
+    giả thiết ||x⁽ᵏ⁾ - x⁽ᵏ⁻¹⁾|| ≈ ρᵏ⁻¹·||x⁽¹⁾ - x⁽⁰⁾||. Trả về None nếu ρ ≥ 1.
+    """
+    if initial_diff < threshold:
+        return 1
+    if rho >= 1:
+        return None
+    if rho == 0:
+        return 2
+    return 1 + int(np.ceil(np.log(threshold / initial_diff) / np.log(rho)))
+
+def spectral_precheck(apply_b, n, initial_diff, eps, max_iter, stopping_factor=None, dense_b=None, rho_bound=None):
+    """
+    Phân tích trước khi lặp x⁽ᵏ⁺¹⁾ = B·x⁽ᵏ⁾ + d: ước lượng ρ(B), dự đoán số bước lặp
+    cần cho sai số yêu cầu và kết luận:
+      - 'ok': dự đoán hội tụ trong max_iter bước;
+      - 'too_slow': hội tụ nhưng cần nhiều hơn max_iter bước;
+      - 'diverges': ρ(B) ≥ 1, phương pháp không hội tụ (với x⁽⁰⁾ tổng quát).
+    Chỉ 'diverges' là lý do để từ chối (xem `precheck_rejects`).
+
+    Args:
+        initial_diff (float): ||x⁽¹⁾ - x⁽⁰⁾|| theo chuẩn dùng trong điều kiện dừng.
+        stopping_factor (float): Hệ số c của điều kiện dừng c·||x⁽ᵏ⁾ - x⁽ᵏ⁻¹⁾|| < eps.
+            Nếu None (không có đánh giá theo chuẩn), dùng c = ρ/(1 - ρ).
+        rho_bound (float): Chặn trên đã biết của ρ(B) (ví dụ một chuẩn của B),
+            dùng để hiệu chỉnh sai số của phương pháp lũy thừa.
+    """
+    rho, info = estimate_spectral_radius(apply_b, n, dense_b)
+    if rho_bound is not None:
+        rho = min(rho, float(rho_bound))
+    if stopping_factor is None and rho < 1:
+        stopping_factor = rho / (1.0 - rho)
+    if stopping_factor is None:
+        predicted = None
+    else:
+        threshold = eps / stopping_factor if stopping_factor > 0 else np.inf
+        predicted = predict_iterations(rho, initial_diff, threshold)
+    if predicted is None:
+        verdict = "diverges"
+        recommendation = (f"ρ(B) ≈ {rho:.4f} ≥ 1 nên phương pháp không hội tụ. Nên dùng phương pháp Krylov "
+                          "(GMRES/BiCGSTAB, hoặc PCG nếu A đối xứng xác định dương).")
+    elif predicted > max_iter:
+        verdict = "too_slow"
+        recommendation = (f"Dự đoán cần khoảng {predicted} bước lặp (max_iter = {max_iter}), có thể không hội tụ "
+                          "trong max_iter bước. Hãy tăng max_iter, hoặc dùng SOR/phương pháp Krylov để hội tụ nhanh hơn.")
+    else:
+        verdict = "ok"
+        recommendation = f"Dự đoán hội tụ sau khoảng {predicted} bước lặp."
+    return {
+        "spectral_radius": rho,
+        "spectral_radius_method": info["method"],
+        "matvecs": info["matvecs"],
+        "stopping_factor": stopping_factor,
+        "predicted_iterations": predicted,
+        "max_iter": max_iter,
+        "verdict": verdict,
+        "recommendation": recommendation
+    }
+
+def precheck_rejects(precheck, fallback='reject'):
+    """
+    Có dừng trước khi lặp hay không. Số bước dự đoán chỉ là gần đúng, nên 'too_slow'
+    không phải lý do từ chối: phương pháp vẫn lặp và kết quả kèm cảnh báo (xem
+    `precheck_warning`). Chỉ từ chối khi ρ(B) ≥ 1, hoặc chuyển sang GMRES khi
+    'too_slow' nếu người dùng chọn fallback='krylov'.
+    """
+    return precheck["verdict"] == "diverges" or (precheck["verdict"] == "too_slow" and fallback == 'krylov')
+
+def precheck_warning(precheck):
+    """Cảnh báo kèm kết quả khi phân tích trước dự đoán cần nhiều hơn max_iter bước."""
+    if precheck is not None and precheck["verdict"] == "too_slow":
+        return precheck["recommendation"]
+    return None
+
+def precheck_failure(precheck, method_name, matrix_a=None, matrix_b=None, x0=None, eps=None, fallback='reject'):
+    """
+    Kết quả khi phân tích trước cho thấy phương pháp không hội tụ (hoặc quá chậm,
+    với fallback='krylov').
+
+    Với fallback='krylov' và có hệ Ax = B, giải bằng GMRES với tiền điều kiện ILU(0)
+    thay vì từ chối; kết quả kèm "redirected_from" và "precheck".
+    """
+    if fallback == 'krylov' and matrix_a is not None:
+        from numerical_methods.linear_algebra.iterative_methods.krylov import solve_gmres
+        budget = max(precheck["max_iter"], 1000)
+        result = solve_gmres(matrix_a, matrix_b, x0, eps=eps, max_iter=budget)
+        result["redirected_from"] = method_name
+        result["precheck"] = precheck
+        if result.get("success"):
+            result["message"] = f"{method_name}: {precheck['recommendation']} Đã chuyển sang GMRES. " + result["message"]
+        return result
+    return {
+        "success": False,
+        "error": f"{method_name}: {precheck['recommendation']}",
+        "precheck": precheck
+    }
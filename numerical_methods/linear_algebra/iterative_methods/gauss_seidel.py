@@ -1,12 +1,172 @@
 import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
 import traceback
+from functools import partial
 
-def solve_gauss_seidel(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100):
+from numerical_methods.linear_algebra.iterative_methods.convergence import (
+    spectral_precheck, precheck_failure, precheck_rejects, precheck_warning)
+
+def gauss_seidel_sweep(lower, upper, B, X):
+    """
+    Một bước lặp Gauss-Seidel cho mọi cột của B cùng lúc.
+
+    Bước lặp x_i ← (b_i - Σ_{j<i} a_ij·x_j(mới) - Σ_{j>i} a_ij·x_j(cũ)) / a_ii chính là
+    phép thế tiến (D + L)·X_mới = B - U·X_cũ, nên được thực hiện bằng một lần
+    solve_triangular trên tất cả vế phải.
+
+    Args:
+        lower (np.ndarray): D + L = np.tril(A).
+        upper (np.ndarray): U = np.triu(A, 1).
+    """
+    return scipy.linalg.solve_triangular(lower, B - upper @ X, lower=True, check_finite=False)
+
+def gauss_seidel_error_estimate(matrix_a):
+    """
+    Hệ số co và hệ số của điều kiện dừng Gauss-Seidel theo thứ tự ẩn của A
+    (A đầy đủ hoặc thưa SciPy).
+
+      - Chéo trội hàng (1.51): chuẩn vô cùng, s = 0,
+        q = max_i Σ_{j<i}|a_ij| / (|a_ii| - Σ_{j>i}|a_ij|).
+      - Chéo trội cột (1.52): chuẩn 1, s = max_j Σ_{i>j}|a_ij| / |a_jj|,
+        q = max_j Σ_{i<j}|a_ij| / (|a_jj| - Σ_{i>j}|a_ij|).
+      - Không chéo trội: stopping_factor = None (được xác định từ ρ(B_GS)).
+
+    Returns:
+        tuple: (dominance_type, norm, q, s, stopping_factor)
+    Raises:
+        ValueError: Nếu (1 - s)(1 - q) ≈ 0.
+    """
+    sparse = sp.issparse(matrix_a)
+    tril, triu = (sp.tril, sp.triu) if sparse else (np.tril, np.triu)
+    diag_abs = np.abs(matrix_a.diagonal())
+    abs_a = abs(matrix_a)
+    strict_lower, strict_upper = tril(abs_a, -1), triu(abs_a, 1)
+
+    def sums(M, axis):
+        return np.asarray(M.sum(axis=axis)).ravel()
+    lower_rows, upper_rows = sums(strict_lower, 1), sums(strict_upper, 1)
+    lower_cols, upper_cols = sums(strict_lower, 0), sums(strict_upper, 0)
+
+    s, q = 0, 0
+    if np.all(diag_abs > lower_rows + upper_rows):
+        dominance_type = "chéo trội hàng"
+        norm = np.inf
+        q_den = diag_abs - upper_rows
+        q_den[np.isclose(q_den, 0)] = 1e-15
+        q = np.max(lower_rows / q_den)
+    elif np.all(diag_abs > lower_cols + upper_cols):
+        dominance_type = "chéo trội cột"
+        norm = 1
+        s = np.max(lower_cols / diag_abs)
+        q_den = diag_abs - lower_cols
+        q_den[np.isclose(q_den, 0)] = 1e-15
+        q = np.max(upper_cols / q_den)
+    else:
+        return "không chéo trội", np.inf, q, s, None
+
+    denominator = (1 - s) * (1 - q)
+    if np.isclose(denominator, 0):
+        raise ValueError(f"Hệ số q={q:.4f} hoặc s={s:.4f} không hợp lệ, gây lỗi chia cho 0 trong công thức sai số.")
+    return dominance_type, norm, q, s, q / denominator
+
+def run_gauss_seidel(ordered_a, matrix_b, x0, sweep, eps, max_iter, precheck, fallback,
+                     method_name="Gauss-Seidel", matrix_a=None):
+    """
+    Vòng lặp Gauss-Seidel dùng chung: sai số hậu nghiệm, phân tích trước và bảng lặp.
+
+    Args:
+        ordered_a: A theo đúng thứ tự cập nhật các ẩn của sweep (hệ số q, s và
+            ma trận lặp B_GS = -(D + L)⁻¹·U phụ thuộc vào thứ tự này).
+        sweep (callable): sweep(B, X) trả về X sau một bước lặp.
+        matrix_a: A của hệ gốc (dùng cho fallback='krylov'); mặc định là ordered_a.
+    """
+    matrix_a = ordered_a if matrix_a is None else matrix_a
+    n = ordered_a.shape[0]
+    try:
+        dominance_type, norm, q, s, stopping_factor = gauss_seidel_error_estimate(ordered_a)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    x_k = x0.copy().astype(float)
+    matrix_b = matrix_b.astype(float)
+
+    # --- Phân tích trước: ρ(B_GS), với B_GS·v = sweep(0, v) ---
+    precheck_report = None
+    if precheck or stopping_factor is None:
+        def dense_b():
+            A = ordered_a.toarray() if sp.issparse(ordered_a) else ordered_a
+            return -scipy.linalg.solve_triangular(np.tril(A), np.triu(A, 1), lower=True, check_finite=False)
+        initial_diff = np.linalg.norm(sweep(matrix_b, x_k) - x_k, norm)
+        zero_rhs = np.zeros(n)
+        precheck_report = spectral_precheck(
+            lambda v: sweep(zero_rhs, v), n, initial_diff, eps, max_iter, stopping_factor=stopping_factor,
+            dense_b=dense_b, rho_bound=q if dominance_type == "chéo trội hàng" else None)
+        if precheck_rejects(precheck_report, fallback):
+            return precheck_failure(precheck_report, method_name, matrix_a, matrix_b, x0, eps, fallback)
+        if stopping_factor is None:
+            q = precheck_report["spectral_radius"]
+            stopping_factor = precheck_report["stopping_factor"]
+
+    # --- Quá trình lặp ---
+    table_rows = []
+    final_error = float('inf')
+
+    for i in range(max_iter):
+        x_prev = x_k
+        x_k = sweep(matrix_b, x_prev)
+
+        # Sử dụng chuẩn phù hợp dựa trên loại chéo trội
+        diff_norm = np.linalg.norm(x_k - x_prev, norm)
+
+        # Sai số hậu nghiệm theo công thức (1.50)
+        estimated_error = stopping_factor * diff_norm
+        final_error = estimated_error
+
+        table_rows.append({
+            "k": i + 1,
+            "x_k": x_k.tolist(),
+            "error": estimated_error,
+            "error_norm": diff_norm
+        })
+
+        # Kiểm tra điều kiện dừng
+        if estimated_error < eps:
+            break
+
+    if i == max_iter - 1 and final_error >= eps:
+        return {
+            "success": False,
+            "error": f"Phương pháp không hội tụ sau {max_iter} lần lặp.",
+            "steps": [{"table": table_rows}],
+            "precheck": precheck_report,
+            "precheck_warning": precheck_warning(precheck_report)
+        }
+
+    return {
+        "success": True,
+        "message": f"Hội tụ sau {i + 1} lần lặp.",
+        "solution": x_k.tolist(),
+        "iterations": i + 1,
+        "steps": [{"message": "Bảng quá trình lặp", "table": table_rows}],
+        "contraction_coefficient_q": q,
+        "contraction_coefficient_s": s,
+        "norm_used": "vô cùng" if norm == np.inf else "1",
+        "dominance_type": dominance_type,
+        "precheck": precheck_report,
+        "precheck_warning": precheck_warning(precheck_report)
+    }
+
+def solve_gauss_seidel(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, precheck=True, fallback='reject'):
     """
     Giải hệ phương trình Ax=B bằng phương pháp lặp Gauss-Seidel.
-    - Yêu cầu ma trận A phải chéo trội hàng hoặc cột.
-    - Tự động chọn chuẩn (1 hoặc vô cùng) và tính hệ số co (q, s) tương ứng.
-    - Điều kiện dừng dựa trên công thức sai số hậu nghiệm.
+    - A chéo trội hàng hoặc cột: tự động chọn chuẩn (1 hoặc vô cùng) và tính hệ số
+      co (q, s) tương ứng; điều kiện dừng dựa trên công thức sai số hậu nghiệm
+      (xem `gauss_seidel_error_estimate`).
+    - A không chéo trội: vẫn chạy nếu ρ(B_GS) < 1, với sai số ước lượng
+      ρ/(1 - ρ)·||Δₖ||∞.
+    - Phân tích trước khi lặp (ρ(B_GS), số bước lặp dự đoán, từ chối hoặc chuyển
+      sang GMRES với fallback='krylov'): xem `solve_jacobi`.
     """
     try:
         # --- Khởi tạo và kiểm tra đầu vào ---
@@ -22,108 +182,8 @@ def solve_gauss_seidel(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100):
         if np.any(np.isclose(diag_elements, 0)):
             return {"success": False, "error": "Ma trận có phần tử trên đường chéo chính bằng 0, không thể thực hiện phép chia."}
 
-        # --- Kiểm tra chéo trội hàng và cột nghiêm ngặt ---
-        diag_abs = np.abs(diag_elements)
-        row_sum_off_diag = np.sum(np.abs(matrix_a), axis=1) - diag_abs
-        col_sum_off_diag = np.sum(np.abs(matrix_a), axis=0) - diag_abs
-
-        is_row_dominant = np.all(diag_abs > row_sum_off_diag)
-        is_col_dominant = np.all(diag_abs > col_sum_off_diag)
-
-        s, q, norm, dominance_type = 0, 0, 0, ""
-
-        if is_row_dominant:
-            dominance_type = "chéo trội hàng"
-            norm = np.inf
-            s = 0  # Theo công thức (1.51) 
-            
-            # Tính q cho trường hợp chéo trội hàng theo (1.51) 
-            q_num = np.zeros(n)
-            q_den = np.zeros(n)
-            for i in range(n):
-                q_num[i] = np.sum(np.abs(matrix_a[i, :i]))
-                q_den[i] = np.abs(matrix_a[i, i]) - np.sum(np.abs(matrix_a[i, i+1:]))
-            q_den[np.isclose(q_den, 0)] = 1e-15 
-            q = np.max(q_num / q_den)
-
-        elif is_col_dominant:
-            dominance_type = "chéo trội cột"
-            norm = 1
-            
-            # Tính s cho trường hợp chéo trội cột theo (1.52) 
-            s_num = np.zeros(n)
-            for j in range(n):
-                s_num[j] = np.sum(np.abs(matrix_a[j+1:, j]))
-            s = np.max(s_num / diag_abs)
-            
-            # Tính q cho trường hợp chéo trội cột theo (1.52) 
-            q_num = np.zeros(n)
-            q_den = np.zeros(n)
-            for j in range(n):
-                q_num[j] = np.sum(np.abs(matrix_a[:j, j]))
-                q_den[j] = np.abs(matrix_a[j, j]) - np.sum(np.abs(matrix_a[j+1:, j]))
-            q_den[np.isclose(q_den, 0)] = 1e-15
-            q = np.max(q_num / q_den)
-        
-        else:
-            return {
-                "success": False,
-                "error": "Ma trận không chéo trội hàng hoặc cột. Không thể đảm bảo hội tụ cho phương pháp Gauss-Seidel."
-            }
-
-        # --- Tính toán hệ số cho điều kiện dừng ---
-        denominator = (1 - s) * (1 - q)
-        if np.isclose(denominator, 0):
-             return {"success": False, "error": f"Hệ số q={q:.4f} hoặc s={s:.4f} không hợp lệ, gây lỗi chia cho 0 trong công thức sai số."}
-        stopping_factor = q / denominator
-
-        # --- Quá trình lặp ---
-        x_k = x0.copy().astype(float)
-        table_rows = []
-        final_error = float('inf')
-
-        for i in range(max_iter):
-            x_prev = x_k.copy()
-            for j in range(n):
-                sum1 = np.dot(matrix_a[j, :j], x_k[:j, :])
-                sum2 = np.dot(matrix_a[j, j+1:], x_prev[j+1:, :])
-                x_k[j, :] = (matrix_b[j, :] - sum1 - sum2) / matrix_a[j, j]
-            
-            # Sử dụng chuẩn phù hợp dựa trên loại chéo trội
-            diff_norm = np.linalg.norm(x_k - x_prev, norm)
-            
-            # Sai số hậu nghiệm theo công thức (1.50) 
-            estimated_error = stopping_factor * diff_norm
-            final_error = estimated_error
-            
-            table_rows.append({
-                "k": i + 1,
-                "x_k": x_k.tolist(),
-                "error": estimated_error,
-                "error_norm": diff_norm  # Thêm dòng này
-            })
-
-            # Kiểm tra điều kiện dừng
-            if estimated_error < eps:
-                break
-        
-        if i == max_iter - 1 and final_error >= eps:
-            return {
-                "success": False, 
-                "error": f"Phương pháp không hội tụ sau {max_iter} lần lặp.",
-                "steps": [{"table": table_rows}]
-            }
-
-        return {
-            "success": True,
-            "message": f"Hội tụ sau {i + 1} lần lặp.",
-            "solution": x_k.tolist(),
-            "iterations": i + 1,
-            "steps": [{"message": "Bảng quá trình lặp", "table": table_rows}],
-            "contraction_coefficient_q": q,
-            "contraction_coefficient_s": s,
-            "norm_used": "vô cùng" if norm == np.inf else "1",
-            "dominance_type": dominance_type
-        }
+        lower, upper = np.tril(matrix_a), np.triu(matrix_a, 1)
+        return run_gauss_seidel(matrix_a, matrix_b, x0, partial(gauss_seidel_sweep, lower, upper),
+                                eps, max_iter, precheck, fallback)
     except Exception as e:
         return {"success": False, "error": f"Lỗi không xác định: {traceback.format_exc()}"}
\ No newline at end of file
@@ -1,10 +1,23 @@
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 import traceback
 
-def solve_jacobi(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100):
+from numerical_methods.linear_algebra.iterative_methods.convergence import (
+    spectral_precheck, precheck_failure, precheck_rejects, precheck_warning)
+
+def solve_jacobi(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, precheck=True, fallback='reject'):
     """
     Giải hệ phương trình Ax=b bằng phương pháp lặp Jacobi.
-    Yêu cầu ma trận A phải chéo trội hàng hoặc cột để chạy.
+    A có thể là ma trận thưa SciPy; khi đó mọi phép tính giữ nguyên dạng thưa.
+
+    - A chéo trội hàng/cột: sai số hậu nghiệm theo hệ số co (chuẩn vô cùng/chuẩn 1).
+    - A không chéo trội: vẫn chạy nếu ρ(B) < 1, với sai số ước lượng ρ/(1 - ρ)·||Δₖ||∞.
+    - Trước khi lặp (precheck=True, luôn thực hiện khi A không chéo trội), ước lượng
+      ρ(B) và dự đoán số bước lặp (xem `convergence.spectral_precheck`); nếu phương
+      pháp phân kỳ thì từ chối ngay, hoặc giải bằng GMRES khi fallback='krylov'. Nếu
+      dự đoán cần nhiều hơn max_iter bước, vẫn lặp và kèm cảnh báo "precheck_warning"
+      (fallback='krylov' thì chuyển sang GMRES).
     """
     try:
         # --- Khởi tạo và kiểm tra đầu vào ---
@@ -16,46 +29,68 @@ def solve_jacobi(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100):
         if x0.ndim == 1:
             x0 = x0.reshape(-1, 1)
 
-        diag_elements = np.diag(matrix_a)
+        diag_elements = matrix_a.diagonal()
         if np.any(np.isclose(diag_elements, 0)):
             return {"success": False, "error": "Ma trận có phần tử trên đường chéo chính bằng 0."}
         
         # --- Kiểm tra điều kiện chéo trội ---
         diag_abs = np.abs(diag_elements)
-        row_sum = np.sum(np.abs(matrix_a), axis=1) - diag_abs
-        col_sum = np.sum(np.abs(matrix_a), axis=0) - diag_abs
+        abs_a = abs(matrix_a)
+        row_sum = np.asarray(abs_a.sum(axis=1)).ravel() - diag_abs
+        col_sum = np.asarray(abs_a.sum(axis=0)).ravel() - diag_abs
 
         is_row_dominant = np.all(diag_abs > row_sum)
         is_col_dominant = np.all(diag_abs > col_sum)
 
-        T = np.diag(1.0 / diag_elements)
+        if sp.issparse(matrix_a):
+            T = sp.diags(1.0 / diag_elements, format='csr')
+            I = sp.identity(n, format='csr')
+            matrix_norm = spla.norm
+        else:
+            T = np.diag(1.0 / diag_elements)
+            I = np.identity(n)
+            matrix_norm = np.linalg.norm
         
         # --- Thiết lập tham số dựa trên loại chéo trội ---
         if is_row_dominant:
             dominance_type = "row"
             norm_used = "infinity"
             norm = np.inf
-            B_iter = np.identity(n) - T @ matrix_a
-            contraction_coefficient = np.linalg.norm(B_iter, norm)
+            B_iter = I - T @ matrix_a
+            contraction_coefficient = matrix_norm(B_iter, norm)
             stopping_factor = contraction_coefficient / (1 - contraction_coefficient)
         elif is_col_dominant:
             dominance_type = "column"
             norm_used = "1"
             norm = 1
-            B1_conv = np.identity(n) - matrix_a @ T
-            contraction_coefficient = np.linalg.norm(B1_conv, norm)
+            B1_conv = I - matrix_a @ T
+            contraction_coefficient = matrix_norm(B1_conv, norm)
             lambda_factor = np.max(diag_abs) / np.min(diag_abs)
             stopping_factor = lambda_factor * contraction_coefficient / (1 - contraction_coefficient)
         else:
-            # THAY ĐỔI: Dừng lại và báo lỗi nếu không chéo trội
-            return {
-                "success": False,
-                "error": "Ma trận không chéo trội hàng hoặc cột. Không thể đảm bảo hội tụ cho phương pháp Jacobi."
-            }
+            # Không chéo trội: sự hội tụ được quyết định bởi ρ(B) ở bước phân tích trước
+            dominance_type = "none"
+            norm_used = "infinity"
+            norm = np.inf
+            contraction_coefficient = None
+            stopping_factor = None
         
-        B_iter = np.identity(n) - T @ matrix_a
+        B_iter = I - T @ matrix_a
         d_iter = T @ matrix_b
 
+        # --- Phân tích trước: ρ(B) và số bước lặp dự đoán ---
+        precheck_report = None
+        if precheck or dominance_type == "none":
+            initial_diff = np.linalg.norm(B_iter @ x0 + d_iter - x0, norm)
+            precheck_report = spectral_precheck(
+                lambda v: B_iter @ v, n, initial_diff, eps, max_iter,
+                stopping_factor=stopping_factor, dense_b=B_iter, rho_bound=contraction_coefficient)
+            if precheck_rejects(precheck_report, fallback):
+                return precheck_failure(precheck_report, "Jacobi", matrix_a, matrix_b, x0, eps, fallback)
+            if dominance_type == "none":
+                contraction_coefficient = precheck_report["spectral_radius"]
+                stopping_factor = precheck_report["stopping_factor"]
+
         # --- Quá trình lặp ---
         x_k = x0.copy()
         table_rows = []
@@ -83,7 +118,9 @@ def solve_jacobi(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100):
              return {
                  "success": False, 
                  "error": f"Phương pháp không hội tụ sau {max_iter} lần lặp.",
-                 "steps": [{"table": table_rows}]
+                 "steps": [{"table": table_rows}],
+                 "precheck": precheck_report,
+                 "precheck_warning": precheck_warning(precheck_report)
             }
 
         return {
@@ -94,7 +131,9 @@ def solve_jacobi(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100):
             "steps": [{"message": "Bảng quá trình lặp", "table": table_rows}],
             "contraction_coefficient": contraction_coefficient,
             "norm_used": norm_used,
-            "dominance_type": dominance_type
+            "dominance_type": dominance_type,
+            "precheck": precheck_report,
+            "precheck_warning": precheck_warning(precheck_report)
         }
 
     except Exception as e:
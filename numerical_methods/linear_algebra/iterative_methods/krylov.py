@@ -0,0 +1,292 @@
+import time
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+import traceback
+
+def ilu0(matrix_a):
+    """
+    Phân tích LU không đầy đủ ILU(0) của A thưa: L (đường chéo đơn vị) và U có cùng
+    cấu trúc thưa với A, A ≈ L·U (thuật toán IKJ, không chọn trụ). Phần tử trụ quá
+    nhỏ được thay bằng ε·max|a_ij| để phân tích luôn tồn tại.
+
+    Returns:
+        tuple: (L, U dạng CSR, số phần tử trụ đã thay)
+    """
+    A = sp.csr_matrix(matrix_a, dtype=float)
+    A.sum_duplicates()
+    A.sort_indices()
+    n = A.shape[0]
+    tiny = np.finfo(float).eps * (abs(A).max() if A.nnz else 1.0)
+    rows = []
+    perturbed = 0
+    for i in range(n):
+        start, end = A.indptr[i], A.indptr[i + 1]
+        row = dict(zip(A.indices[start:end].tolist(), A.data[start:end].tolist()))
+        row.setdefault(i, 0.0)
+        for k in sorted(j for j in row if j < i):
+            # l_ik = a_ik / u_kk, rồi a_ij -= l_ik·u_kj trên cấu trúc của A
+            row[k] /= rows[k][k]
+            l_ik = row[k]
+            for j, u_kj in rows[k].items():
+                if j > k and j in row:
+                    row[j] -= l_ik * u_kj
+        if abs(row[i]) < tiny:
+            row[i] = tiny if row[i] >= 0 else -tiny
+            perturbed += 1
+        rows.append(row)
+
+    def assemble(select, unit_diagonal):
+        indptr, indices, data = [0], [], []
+        for i, row in enumerate(rows):
+            entries = sorted((j, v) for j, v in row.items() if select(i, j))
+            if unit_diagonal:
+                entries.append((i, 1.0))
+            indices.extend(j for j, _ in entries)
+            data.extend(v for _, v in entries)
+            indptr.append(len(indices))
+        return sp.csr_matrix((data, indices, indptr), shape=(n, n))
+
+    L = assemble(lambda i, j: j < i, unit_diagonal=True)
+    U = assemble(lambda i, j: j >= i, unit_diagonal=False)
+    return L, U, perturbed
+
+class KrylovOperator:
+    """
+    Phép nhân A·v và tiền điều kiện M⁻¹·v, kèm bộ đếm số lần gọi và thời gian của
+    từng phần để so sánh chi phí với phương pháp trực tiếp.
+    """
+
+    def __init__(self, matrix_a, preconditioner='ilu0'):
+        start = time.perf_counter()
+        self.A = matrix_a.tocsr() if sp.issparse(matrix_a) else np.asarray(matrix_a, dtype=float)
+        self.matvec_count = 0
+        self.preconditioner_count = 0
+        self.matvec_time = 0.0
+        self.preconditioner_time = 0.0
+        self.info = {"type": preconditioner or 'none'}
+        if preconditioner in (None, 'none'):
+            self._solve = None
+        elif preconditioner == 'ilu0':
+            # ILU(0) luôn dựa trên cấu trúc thưa của A, dù A được lưu dạng đầy đủ hay thưa
+            pattern = sp.csr_matrix(self.A, dtype=float)
+            pattern.eliminate_zeros()
+            n = pattern.shape[0]
+            if pattern.nnz == n * n:
+                # Cấu trúc thưa đầy đủ: ILU(0) trùng với phân tích LU; dùng LU có chọn trụ cho ổn định
+                lu_piv = scipy.linalg.lu_factor(pattern.toarray())
+                self.info.update(nnz=n * n, perturbed_pivots=0,
+                                 note="Cấu trúc thưa của A đầy đủ: ILU(0) trùng với phân tích LU (LAPACK getrf)")
+                self._solve = lambda r: scipy.linalg.lu_solve(lu_piv, r, check_finite=False)
+            else:
+                L, U, perturbed = ilu0(pattern)
+                self.info.update(nnz=int(L.nnz + U.nnz - n), perturbed_pivots=perturbed)
+                self._solve = lambda r: spla.spsolve_triangular(U, spla.spsolve_triangular(L, r, lower=True, unit_diagonal=True), lower=False)
+        else:
+            raise ValueError(f"Tiền điều kiện '{preconditioner}' không được hỗ trợ (none, ilu0).")
+        self.setup_time = time.perf_counter() - start
+
+    def matvec(self, v):
+        start = time.perf_counter()
+        result = self.A @ v
+        self.matvec_time += time.perf_counter() - start
+        self.matvec_count += 1
+        return result
+
+    def precondition(self, v):
+        if self._solve is None:
+            return v
+        start = time.perf_counter()
+        result = self._solve(v)
+        self.preconditioner_time += time.perf_counter() - start
+        self.preconditioner_count += 1
+        return result
+
+    def report(self, total_time):
+        return {
+            "matvec_count": self.matvec_count,
+            "preconditioner_applications": self.preconditioner_count,
+            "timing": {
+                "preconditioner_setup": self.setup_time,
+                "matvec": self.matvec_time,
+                "preconditioner_apply": self.preconditioner_time,
+                "other": max(total_time - self.setup_time - self.matvec_time - self.preconditioner_time, 0.0),
+                "total": total_time
+            }
+        }
+
+def _gmres_column(op, b, x, eps, max_iter, restart):
+    """
+    GMRES(m) với tiền điều kiện phải (A·M⁻¹·y = b, x = M⁻¹·y), trực giao hóa Gram–Schmidt
+    cổ điển lặp hai lần (CGS2) và phép quay Givens. Mỗi dòng bảng ứng với một chu kỳ
+    khởi động lại; chuẩn dư của từng bước lặp trong được lưu riêng.
+    """
+    n = b.shape[0]
+    b_norm = np.linalg.norm(b) or 1.0
+    r = b - op.matvec(x)
+    beta = np.linalg.norm(r)
+    table_rows, residual_history = [], [beta / b_norm]
+    inner_total = 0
+    cycle = 0
+    while beta / b_norm >= eps and inner_total < max_iter:
+        cycle += 1
+        m = min(restart, max_iter - inner_total)
+        V = np.zeros((n, m + 1))
+        H = np.zeros((m + 1, m))
+        cs, sn = np.zeros(m), np.zeros(m)
+        g = np.zeros(m + 1)
+        V[:, 0] = r / beta
+        g[0] = beta
+        j = -1
+        for j in range(m):
+            w = op.matvec(op.precondition(V[:, j]))
+            for _ in range(2):
+                h = V[:, :j + 1].T @ w
+                w -= V[:, :j + 1] @ h
+                H[:j + 1, j] += h
+            h_next = np.linalg.norm(w)
+            H[j + 1, j] = h_next
+            for i in range(j):
+                H[i, j], H[i + 1, j] = cs[i] * H[i, j] + sn[i] * H[i + 1, j], -sn[i] * H[i, j] + cs[i] * H[i + 1, j]
+            denom = np.hypot(H[j, j], h_next)
+            cs[j], sn[j] = (1.0, 0.0) if denom == 0 else (H[j, j] / denom, h_next / denom)
+            H[j, j] = denom
+            g[j + 1] = -sn[j] * g[j]
+            g[j] = cs[j] * g[j]
+            inner_total += 1
+            residual_history.append(abs(g[j + 1]) / b_norm)
+            # Dừng sớm khi đạt eps hoặc không gian Krylov không mở rộng được nữa (nghiệm đúng)
+            if abs(g[j + 1]) / b_norm < eps or h_next <= 1e-14 * denom:
+                break
+            V[:, j + 1] = w / h_next
+        k = j + 1
+        y = scipy.linalg.solve_triangular(H[:k, :k], g[:k], check_finite=False)
+        x = x + op.precondition(V[:, :k] @ y)
+        r = b - op.matvec(x)
+        beta = np.linalg.norm(r)
+        table_rows.append({
+            "k": cycle,
+            "x_k": x.reshape(-1, 1).tolist(),
+            "error": beta / b_norm,
+            "error_norm": beta,
+            "inner_iterations": k
+        })
+    return x, beta / b_norm, inner_total, table_rows, residual_history
+
+def _bicgstab_column(op, b, x, eps, max_iter):
+    """BiCGSTAB với tiền điều kiện phải (van der Vorst), mỗi bước 2 phép nhân A·v."""
+    b_norm = np.linalg.norm(b) or 1.0
+    r = b - op.matvec(x)
+    r_hat = r.copy()
+    rho = alpha = omega = 1.0
+    v = np.zeros_like(b)
+    p = np.zeros_like(b)
+    table_rows, residual_history = [], [np.linalg.norm(r) / b_norm]
+    relative = residual_history[0]
+    iterations = 0
+    while relative >= eps and iterations < max_iter:
+        rho_new = r_hat @ r
+        if rho_new == 0 or omega == 0:
+            raise np.linalg.LinAlgError(f"BiCGSTAB bị gián đoạn ở bước {iterations + 1} (ρ = 0 hoặc ω = 0).")
+        beta = (rho_new / rho) * (alpha / omega)
+        p = r + beta * (p - omega * v)
+        p_hat = op.precondition(p)
+        v = op.matvec(p_hat)
+        alpha = rho_new / (r_hat @ v)
+        s = r - alpha * v
+        iterations += 1
+        if np.linalg.norm(s) / b_norm < eps:
+            x = x + alpha * p_hat
+            r = s
+        else:
+            s_hat = op.precondition(s)
+            t = op.matvec(s_hat)
+            omega = (t @ s) / (t @ t)
+            x = x + alpha * p_hat + omega * s_hat
+            r = s - omega * t
+        rho = rho_new
+        relative = np.linalg.norm(r) / b_norm
+        residual_history.append(relative)
+        table_rows.append({
+            "k": iterations,
+            "x_k": x.reshape(-1, 1).tolist(),
+            "error": relative,
+            "error_norm": relative * b_norm
+        })
+    return x, relative, iterations, table_rows, residual_history
+
+def _solve_krylov(method, matrix_a, matrix_b, x0, eps, max_iter, preconditioner, restart=30):
+    try:
+        n = matrix_a.shape[0]
+        if n != matrix_a.shape[1]:
+            return {"success": False, "error": "Ma trận A phải là ma trận vuông."}
+        if matrix_b.ndim == 1:
+            matrix_b = matrix_b.reshape(-1, 1)
+        if x0.ndim == 1:
+            x0 = x0.reshape(-1, 1)
+        start = time.perf_counter()
+        try:
+            op = KrylovOperator(matrix_a, preconditioner)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            return {"success": False, "error": str(e)}
+        B = np.asarray(matrix_b, dtype=float)
+        X0 = np.array(np.broadcast_to(x0, B.shape), dtype=float)
+        name = f"GMRES({int(restart)})" if method == 'gmres' else "BiCGSTAB"
+
+        X = np.zeros_like(B)
+        steps, histories, iterations = [], [], []
+        worst = 0.0
+        for col in range(B.shape[1]):
+            try:
+                if method == 'gmres':
+                    x, relative, its, rows, history = _gmres_column(op, B[:, col], X0[:, col], eps, max_iter, max(1, int(restart)))
+                else:
+                    x, relative, its, rows, history = _bicgstab_column(op, B[:, col], X0[:, col], eps, max_iter)
+            except np.linalg.LinAlgError as e:
+                return {"success": False, "error": str(e), "steps": steps}
+            X[:, col] = x
+            label = f" (cột {col + 1} của B)" if B.shape[1] > 1 else ""
+            steps.append({"message": f"Bảng quá trình lặp{label}, sai số = chuẩn dư tương đối", "table": rows})
+            histories.append(history)
+            iterations.append(its)
+            worst = max(worst, relative)
+        total_time = time.perf_counter() - start
+
+        report = op.report(total_time)
+        if worst >= eps:
+            return {
+                "success": False,
+                "error": f"Phương pháp {name} không hội tụ sau {max_iter} lần lặp (chuẩn dư tương đối {worst:.2e}).",
+                "steps": steps,
+                **report
+            }
+        return {
+            "success": True,
+            "message": f"{name} (tiền điều kiện {op.info['type']}) hội tụ sau {max(iterations)} lần lặp, {op.matvec_count} phép nhân A·v.",
+            "solution": X.tolist(),
+            "iterations": max(iterations),
+            "steps": steps,
+            "residual_norms": histories,
+            "preconditioner": op.info,
+            "method": name,
+            "norm_used": "2",
+            **report
+        }
+    except Exception as e:
+        return {"success": False, "error": f"Lỗi không xác định: {traceback.format_exc()}"}
+
+def solve_gmres(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, restart=30, preconditioner='ilu0'):
+    """
+    Giải hệ Ax = B (A bất kỳ, không cần đối xứng hay chéo trội) bằng GMRES khởi động
+    lại sau mỗi `restart` bước, với tiền điều kiện ILU(0). A đầy đủ hoặc thưa (CSR).
+    max_iter là tổng số bước lặp trong; dừng khi ||b - A·x||₂ / ||b||₂ < eps.
+    """
+    return _solve_krylov('gmres', matrix_a, matrix_b, x0, eps, max_iter, preconditioner, restart=restart)
+
+def solve_bicgstab(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, preconditioner='ilu0'):
+    """
+    Giải hệ Ax = B (A không đối xứng) bằng BiCGSTAB với tiền điều kiện ILU(0).
+    A đầy đủ hoặc thưa (CSR); dừng khi ||b - A·x||₂ / ||b||₂ < eps.
+    """
+    return _solve_krylov('bicgstab', matrix_a, matrix_b, x0, eps, max_iter, preconditioner)
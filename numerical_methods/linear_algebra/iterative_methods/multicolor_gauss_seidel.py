@@ -0,0 +1,124 @@
+import numpy as np
+import scipy.sparse as sp
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from numerical_methods.linear_algebra.iterative_methods.gauss_seidel import run_gauss_seidel
+
+def color_unknowns(matrix_a):
+    """
+    Tô màu tham lam đồ thị của A (đỉnh i, j kề nhau khi a_ij ≠ 0 hoặc a_ji ≠ 0).
+
+    Hai ẩn cùng màu không phụ thuộc nhau trong bước Gauss-Seidel, nên có thể cập
+    nhật đồng thời. Các đỉnh được duyệt theo thứ tự tự nhiên; với lưới sai phân 5
+    điểm (và ma trận ba đường chéo) cách này cho đúng hai màu đỏ–đen.
+
+    Returns:
+        np.ndarray: Màu (0, 1, 2, ...) của từng ẩn.
+    """
+    pattern = sp.csr_matrix(matrix_a, dtype=bool)
+    graph = (pattern + pattern.T).tocsr()
+    n = graph.shape[0]
+    colors = np.full(n, -1, dtype=int)
+    for i in range(n):
+        neighbor_colors = colors[graph.indices[graph.indptr[i]:graph.indptr[i + 1]]]
+        neighbor_colors = neighbor_colors[neighbor_colors >= 0]
+        if neighbor_colors.size == 0:
+            colors[i] = 0
+            continue
+        taken = np.zeros(neighbor_colors.max() + 2, dtype=bool)
+        taken[neighbor_colors] = True
+        colors[i] = np.argmin(taken)
+    return colors
+
+def multicolor_sweep(matrix_a, colors, num_partitions=1):
+    """
+    Bước lặp Gauss-Seidel đa màu: lần lượt theo từng màu c, mọi ẩn i có màu c được
+    cập nhật đồng thời
+        x_I ← (b_I - A_I,* ·x + D_I·x_I) / D_I,   I = {i : màu i = c},
+    bằng một phép nhân ma trận thưa (phần ngoài đường chéo của các hàng I). Đây chính
+    là Gauss-Seidel với các ẩn được sắp lại theo màu.
+
+    Mỗi màu được chia thành num_partitions khối hàng. Các khối chỉ ghi vào các ẩn
+    của mình và chỉ đọc các ẩn màu khác, nên có thể chạy song song.
+
+    Returns:
+        tuple: (hàm tạo bước lặp make_sweep(executor), các khối theo từng màu)
+    """
+    A = sp.csr_matrix(matrix_a, dtype=float)
+    diag = A.diagonal()
+    off_diag = (A - sp.diags(diag, format='csr')).tocsr()
+    off_diag.eliminate_zeros()
+    partitions = []
+    for c in range(colors.max() + 1):
+        idx = np.flatnonzero(colors == c)
+        chunks = np.array_split(idx, min(num_partitions, idx.size))
+        partitions.append([(chunk, off_diag[chunk], diag[chunk]) for chunk in chunks])
+
+    def make_sweep(executor=None):
+        def sweep(B, X):
+            X = np.array(X, dtype=float)
+            scale = (lambda d: d) if X.ndim == 1 else (lambda d: d[:, None])
+
+            def update(block):
+                idx, rows, d = block
+                X[idx] = (B[idx] - rows @ X) / scale(d)
+            for blocks in partitions:
+                if executor is None or len(blocks) == 1:
+                    for block in blocks:
+                        update(block)
+                else:
+                    list(executor.map(update, blocks))
+            return X
+        return sweep
+    return make_sweep, partitions
+
+def solve_multicolor_gauss_seidel(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, precheck=True, fallback='reject',
+                                  max_workers=None):
+    """
+    Giải hệ Ax = B bằng Gauss-Seidel đa màu (đỏ–đen với lưới 5 điểm), dành cho A thưa.
+
+    - Tô màu đồ thị của A (`color_unknowns`), rồi mỗi bước lặp cập nhật đồng thời
+      toàn bộ ẩn cùng màu bằng phép toán thưa vector hóa (`multicolor_sweep`).
+    - max_workers > 1: chia mỗi màu thành max_workers khối hàng và cập nhật song
+      song bằng một nhóm luồng (phép nhân thưa của SciPy không giữ GIL).
+    - Sai số hậu nghiệm, phân tích trước và bảng lặp như `solve_gauss_seidel`, với
+      hệ số co tính trên A đã sắp lại theo màu (đúng thứ tự cập nhật).
+    """
+    try:
+        n = matrix_a.shape[0]
+        if n != matrix_a.shape[1]:
+            return {"success": False, "error": "Ma trận A phải là ma trận vuông."}
+        if matrix_b.ndim == 1:
+            matrix_b = matrix_b.reshape(-1, 1)
+        if x0.ndim == 1:
+            x0 = x0.reshape(-1, 1)
+        x0 = np.array(np.broadcast_to(x0, matrix_b.shape), dtype=float)
+        if np.any(np.isclose(matrix_a.diagonal(), 0)):
+            return {"success": False, "error": "Ma trận có phần tử trên đường chéo chính bằng 0, không thể thực hiện phép chia."}
+
+        colors = color_unknowns(matrix_a)
+        order = np.argsort(colors, kind='stable')
+        A_csr = sp.csr_matrix(matrix_a, dtype=float)
+        ordered_a = A_csr[order][:, order]
+        workers = max(1, int(max_workers or 1))
+        make_sweep, partitions = multicolor_sweep(A_csr, colors, num_partitions=workers)
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                result = run_gauss_seidel(ordered_a, matrix_b, x0, make_sweep(executor), eps, max_iter,
+                                          precheck, fallback, method_name="Gauss-Seidel đa màu", matrix_a=matrix_a)
+        else:
+            result = run_gauss_seidel(ordered_a, matrix_b, x0, make_sweep(), eps, max_iter,
+                                      precheck, fallback, method_name="Gauss-Seidel đa màu", matrix_a=matrix_a)
+
+        color_sizes = np.bincount(colors).tolist()
+        result["coloring"] = {
+            "num_colors": len(color_sizes),
+            "color_sizes": color_sizes,
+            "partitions_per_color": [len(blocks) for blocks in partitions],
+            "workers": workers
+        }
+        return result
+    except Exception as e:
+        return {"success": False, "error": f"Lỗi không xác định: {traceback.format_exc()}"}
@@ -0,0 +1,221 @@
+import time
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import traceback
+
+from numerical_methods.linear_algebra.iterative_methods.sor import (
+    estimate_jacobi_spectral_radius, optimal_omega, triangular_solver)
+
+def _is_symmetric(A):
+    if sp.issparse(A):
+        return A.nnz == 0 or abs(A - A.T).max() <= 1e-10 * (1 + abs(A).max())
+    return np.allclose(A, A.T, rtol=1e-10, atol=1e-12)
+
+def incomplete_cholesky(matrix_a, max_tries=12):
+    """
+    Phân tích Cholesky không đầy đủ IC(0): L có cùng cấu trúc thưa với phần tam giác
+    dưới của A và A ≈ L·Lᵀ. Nếu gặp phần tử trụ không dương, phân tích lại với
+    A + α·diag(A) (α = 10⁻³, 2·10⁻³, ...) để bảo đảm tồn tại (dịch chuyển Manteuffel).
+
+    L luôn dựa trên cấu trúc thưa của A, dù A được lưu dạng đầy đủ hay thưa. Chỉ khi
+    cấu trúc thưa đầy đủ, IC(0) mới trùng với phân tích Cholesky và được tính bằng
+    scipy.linalg.cholesky.
+
+    Returns:
+        tuple: (L dạng CSR hoặc đầy đủ, hệ số dịch chuyển α đã dùng)
+    """
+    pattern = sp.csr_matrix(matrix_a, dtype=float)
+    pattern.eliminate_zeros()
+    if pattern.nnz == pattern.shape[0] * pattern.shape[1]:
+        A = pattern.toarray()
+        shift = 0.0
+        for attempt in range(max_tries):
+            try:
+                return scipy.linalg.cholesky(A + shift * np.diag(np.diag(A)), lower=True), shift
+            except np.linalg.LinAlgError:
+                shift = 1e-3 * 2 ** attempt
+        raise np.linalg.LinAlgError("Không phân tích được Cholesky không đầy đủ (A có thể không xác định dương).")
+    lower = sp.tril(pattern, format='csr')
+    lower.sum_duplicates()
+    lower.sort_indices()
+    n = lower.shape[0]
+    diag = lower.diagonal()
+    shift = 0.0
+    for attempt in range(max_tries):
+        rows = []
+        breakdown = False
+        for i in range(n):
+            start, end = lower.indptr[i], lower.indptr[i + 1]
+            row = dict(zip(lower.indices[start:end].tolist(), lower.data[start:end].tolist()))
+            row[i] = diag[i] * (1.0 + shift)
+            for k in sorted(row):
+                if k == i:
+                    break
+                # l_ik = (a_ik - Σ_{j<k} l_ij·l_kj) / l_kk, chỉ trên cấu trúc của A
+                total = sum(value * row[j] for j, value in rows[k].items() if j < k and j in row)
+                row[k] = (row[k] - total) / rows[k][k]
+            pivot = row[i] - sum(value * value for j, value in row.items() if j < i)
+            if not pivot > 0:
+                breakdown = True
+                break
+            row[i] = np.sqrt(pivot)
+            rows.append(row)
+        if not breakdown:
+            indptr = np.cumsum([0] + [len(row) for row in rows])
+            indices = np.fromiter((j for row in rows for j in sorted(row)), dtype=np.int64, count=indptr[-1])
+            data = np.fromiter((row[j] for row in rows for j in sorted(row)), dtype=float, count=indptr[-1])
+            return sp.csr_matrix((data, indices, indptr), shape=(n, n)), shift
+        shift = 1e-3 * 2 ** attempt
+    raise np.linalg.LinAlgError("Không phân tích được Cholesky không đầy đủ (A có thể không xác định dương).")
+
+def build_preconditioner(matrix_a, kind='jacobi', omega=1.0):
+    """
+    Tạo hàm áp dụng tiền điều kiện z = M⁻¹·r cho A đối xứng xác định dương.
+
+      - 'none': M = I.
+      - 'jacobi': M = D.
+      - 'ssor': M = (D + ωL)·D⁻¹·(D + ωU) / (ω(2 - ω)), áp dụng bằng hai lần giải
+        hệ tam giác; ω = "auto" chọn theo ρ(B_J) như SSOR (xem sor.optimal_omega).
+      - 'ic': M = L·Lᵀ với L là phân tích Cholesky không đầy đủ IC(0).
+
+    Returns:
+        tuple: (hàm áp dụng, thông tin về tiền điều kiện)
+    """
+    info = {"type": kind}
+    if kind in (None, 'none'):
+        info["type"] = 'none'
+        return (lambda r: r), info
+    if kind == 'jacobi':
+        inv_diag = 1.0 / np.asarray(matrix_a.diagonal(), dtype=float)
+        return (lambda r: inv_diag[:, None] * r), info
+    if kind == 'ssor':
+        if omega is None or omega == 'auto':
+            rho, _ = estimate_jacobi_spectral_radius(matrix_a)
+            omega = optimal_omega(rho, symmetric=True) or 1.0
+        omega = float(omega)
+        if not 0 < omega < 2:
+            raise ValueError(f"Tham số ω = {omega} của tiền điều kiện SSOR phải thỏa 0 < ω < 2.")
+        info["omega"] = omega
+        if sp.issparse(matrix_a):
+            A = matrix_a.tocsr()
+            D = sp.diags(A.diagonal(), format='csr')
+            lower = (D + omega * sp.tril(A, -1)).tocsr()
+            upper = (D + omega * sp.triu(A, 1)).tocsr()
+        else:
+            A = np.asarray(matrix_a, dtype=float)
+            D = np.diag(np.diag(A))
+            lower, upper = D + omega * np.tril(A, -1), D + omega * np.triu(A, 1)
+        diag = np.asarray(A.diagonal(), dtype=float)[:, None]
+        solve_lower = triangular_solver(lower, lower=True)
+        solve_upper = triangular_solver(upper, lower=False)
+        scale = omega * (2.0 - omega)
+        return (lambda r: solve_upper(scale * diag * solve_lower(r))), info
+    if kind == 'ic':
+        L, shift = incomplete_cholesky(matrix_a)
+        info["shift"] = shift
+        info["fill_nnz"] = int(L.nnz) if sp.issparse(L) else int(np.count_nonzero(L))
+        solve_lower = triangular_solver(L, lower=True)
+        solve_upper = triangular_solver(L.T.tocsr() if sp.issparse(L) else L.T, lower=False)
+        return (lambda r: solve_upper(solve_lower(r))), info
+    raise ValueError(f"Tiền điều kiện '{kind}' không được hỗ trợ (none, jacobi, ssor, ic).")
+
+def solve_pcg(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, preconditioner='jacobi', omega=1.0):
+    """
+    Giải hệ Ax = B với A đối xứng xác định dương bằng phương pháp gradient liên hợp
+    có tiền điều kiện (PCG). A có thể là ma trận thưa SciPy; B có thể có nhiều cột
+    (mỗi cột là một dãy lặp CG độc lập, được tính đồng thời).
+
+    Không yêu cầu A chéo trội. Điều kiện dừng: chuẩn dư tương đối
+    ||b - A·x⁽ᵏ⁾||₂ / ||b||₂ < eps cho mọi cột. Nếu gặp pᵀ·A·p ≤ 0 thì A không
+    xác định dương và phương pháp dừng với thông báo lỗi.
+    """
+    try:
+        n = matrix_a.shape[0]
+        if n != matrix_a.shape[1]:
+            return {"success": False, "error": "Ma trận A phải là ma trận vuông."}
+        if matrix_b.ndim == 1:
+            matrix_b = matrix_b.reshape(-1, 1)
+        if x0.ndim == 1:
+            x0 = x0.reshape(-1, 1)
+        if not _is_symmetric(matrix_a):
+            return {"success": False, "error": "Ma trận A không đối xứng, không dùng được phương pháp gradient liên hợp."}
+        if np.any(np.asarray(matrix_a.diagonal()) <= 0):
+            return {"success": False, "error": "Ma trận A có phần tử đường chéo không dương nên không xác định dương."}
+
+        start = time.perf_counter()
+        try:
+            apply_preconditioner, precond_info = build_preconditioner(matrix_a, preconditioner, omega)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            return {"success": False, "error": str(e)}
+        precond_info["setup_time"] = time.perf_counter() - start
+
+        B = np.asarray(matrix_b, dtype=float)
+        x_k = np.array(np.broadcast_to(x0, B.shape), dtype=float)
+        b_norms = np.linalg.norm(B, axis=0)
+        b_norms[b_norms == 0] = 1.0
+        r = B - matrix_a @ x_k
+        z = apply_preconditioner(r)
+        p = z.copy()
+        rz = np.sum(r * z, axis=0)
+        residual_norms = np.linalg.norm(r, axis=0)
+        residual_history = [(residual_norms / b_norms).tolist()]
+        table_rows = []
+        relative = np.max(residual_norms / b_norms)
+        iterations = 0
+
+        start = time.perf_counter()
+        while relative >= eps and iterations < max_iter:
+            active = residual_norms / b_norms >= eps
+            Ap = matrix_a @ p
+            pAp = np.sum(p * Ap, axis=0)
+            if np.any(pAp[active] <= 0):
+                return {
+                    "success": False,
+                    "error": f"pᵀ·A·p ≤ 0 ở bước {iterations + 1}: ma trận A không xác định dương.",
+                    "steps": [{"table": table_rows}]
+                }
+            # Cột đã hội tụ được giữ nguyên (α = 0)
+            alpha = np.where(active, rz / np.where(active, pAp, 1.0), 0.0)
+            x_k = x_k + alpha * p
+            r = r - alpha * Ap
+            z = apply_preconditioner(r)
+            rz_new = np.sum(r * z, axis=0)
+            beta = np.where(active, rz_new / np.where(rz == 0, 1.0, rz), 0.0)
+            p = np.where(active, z + beta * p, p)
+            rz = np.where(active, rz_new, rz)
+            iterations += 1
+
+            residual_norms = np.linalg.norm(r, axis=0)
+            relative = np.max(residual_norms / b_norms)
+            residual_history.append((residual_norms / b_norms).tolist())
+            table_rows.append({
+                "k": iterations,
+                "x_k": x_k.tolist(),
+                "error": float(relative),
+                "error_norm": float(np.max(residual_norms)),
+                "residual_norms": residual_norms.tolist()
+            })
+        solve_time = time.perf_counter() - start
+
+        if relative >= eps:
+            return {
+                "success": False,
+                "error": f"Phương pháp PCG không hội tụ sau {max_iter} lần lặp (chuẩn dư tương đối {relative:.2e}).",
+                "steps": [{"table": table_rows}]
+            }
+        true_residual = np.max(np.linalg.norm(B - matrix_a @ x_k, axis=0) / b_norms)
+        return {
+            "success": True,
+            "message": f"PCG (tiền điều kiện {precond_info['type']}) hội tụ sau {iterations} lần lặp.",
+            "solution": x_k.tolist(),
+            "iterations": iterations,
+            "steps": [{"message": "Bảng quá trình lặp (sai số = chuẩn dư tương đối)", "table": table_rows}],
+            "residual_norms": residual_history,
+            "true_relative_residual": float(true_residual),
+            "preconditioner": precond_info,
+            "solve_time": solve_time,
+            "norm_used": "2"
+        }
+    except Exception as e:
+        return {"success": False, "error": f"Lỗi không xác định: {traceback.format_exc()}"}
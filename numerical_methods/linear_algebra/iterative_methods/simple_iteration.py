@@ -1,12 +1,21 @@
 import numpy as np
 
-def solve_simple_iteration(B, d, x0, eps=1e-5, max_iter=100, norm_choice='inf'):
+from numerical_methods.linear_algebra.iterative_methods.convergence import (
+    spectral_precheck, precheck_failure, precheck_rejects, precheck_warning, estimate_real_spectrum_bounds)
+
+def solve_simple_iteration(B, d, x0, eps=1e-5, max_iter=100, norm_choice='inf', precheck=True, fallback='reject',
+                           acceleration=None, spectral_bounds=None):
     """
     Giải hệ phương trình tuyến tính bằng phương pháp lặp đơn x = Bx + d.
     Hàm này hỗ trợ:
     - Giải đồng thời nhiều hệ phương trình (khi d và x0 có nhiều cột).
     - Lựa chọn chuẩn tính toán (1 hoặc vô cùng) cho tất cả các bước.
     - Sử dụng điều kiện dừng nâng cao: error < abs((1-q) / q) * tol.
+    - Phân tích trước khi lặp (precheck): ước lượng ρ(B), dự đoán số bước lặp và từ
+      chối ngay nếu ρ(B) ≥ 1 (fallback='krylov': giải (I - B)x = d bằng GMRES); nếu
+      dự đoán cần nhiều hơn max_iter bước thì vẫn lặp, kèm cảnh báo. Khi ||B|| ≥ 1
+      nhưng ρ(B) < 1, điều kiện dừng dùng ρ thay cho ||B||.
+    - acceleration='chebyshev': tăng tốc Chebyshev (xem `_chebyshev_iteration`).
 
     Args:
         B (np.ndarray): Ma trận lặp B, kích thước (n, n).
@@ -15,6 +24,11 @@ def solve_simple_iteration(B, d, x0, eps=1e-5, max_iter=100, norm_choice='inf'):
         eps (float): Sai số do người dùng nhập.
         max_iter (int): Số lần lặp tối đa.
         norm_choice (str): Lựa chọn chuẩn ('1' hoặc 'inf').
+        precheck (bool): Có phân tích ρ(B) trước khi lặp hay không.
+        fallback (str): 'reject' hoặc 'krylov' khi phân tích trước không đạt.
+        acceleration (str): None (lặp đơn) hoặc 'chebyshev'.
+        spectral_bounds (list): [a, b] chứa phổ thực của B cho tăng tốc Chebyshev;
+            nếu không cho thì được ước lượng.
 
     Returns:
         dict: Một dictionary chứa kết quả chi tiết của quá trình lặp.
@@ -64,6 +78,32 @@ def solve_simple_iteration(B, d, x0, eps=1e-5, max_iter=100, norm_choice='inf'):
                 "Quá trình lặp có thể không hội tụ."
             )
 
+        if acceleration == 'chebyshev':
+            return _chebyshev_iteration(B, d, x0, eps, max_iter, norm, norm_choice, norm_B, warning_message,
+                                        spectral_bounds, precheck, fallback)
+        if acceleration not in (None, 'none'):
+            return {"success": False, "error": f"Kiểu tăng tốc '{acceleration}' không được hỗ trợ (chebyshev)."}
+
+        # --- PHÂN TÍCH TRƯỚC: ρ(B) VÀ SỐ BƯỚC LẶP DỰ ĐOÁN ---
+        precheck_report = None
+        if precheck:
+            stopping_factor = None
+            if norm_B < 1:
+                stopping_factor = eps / stopping_threshold if norm_B > 0 else 1.0
+            initial_diff = np.linalg.norm(B @ x0 + d - x0, norm)
+            precheck_report = spectral_precheck(
+                lambda v: B @ v, n, initial_diff, eps, max_iter,
+                stopping_factor=stopping_factor, dense_b=B, rho_bound=norm_B)
+            if precheck_rejects(precheck_report, fallback):
+                return precheck_failure(precheck_report, "Lặp đơn", np.identity(n) - B, d, x0, eps, fallback)
+            slow_warning = precheck_warning(precheck_report)
+            if slow_warning:
+                warning_message = f"{warning_message} {slow_warning}" if warning_message else slow_warning
+            if stopping_factor is None:
+                stopping_threshold = eps / precheck_report["stopping_factor"] if precheck_report["stopping_factor"] > 0 else eps
+                warning_message += (f" Tuy nhiên ρ(B) ≈ {precheck_report['spectral_radius']:.4f} < 1 nên phương pháp vẫn hội tụ; "
+                                    "điều kiện dừng dùng ρ(B) thay cho chuẩn.")
+
         # --- QUÁ TRÌNH LẶP ---
         x_k = x0.copy()
         steps = [{'k': 0, 'x_k': x_k.tolist(), 'error': 'N/A'}]
@@ -87,7 +127,8 @@ def solve_simple_iteration(B, d, x0, eps=1e-5, max_iter=100, norm_choice='inf'):
                     "stopping_threshold": stopping_threshold,
                     "norm_B": norm_B,
                     "warning_message": warning_message,
-                    "norm_used": norm_choice
+                    "norm_used": norm_choice,
+                    "precheck": precheck_report
                 }
 
         return {
@@ -101,9 +142,136 @@ def solve_simple_iteration(B, d, x0, eps=1e-5, max_iter=100, norm_choice='inf'):
             "stopping_threshold": stopping_threshold,
             "norm_B": norm_B,
             "warning_message": warning_message,
-            "norm_used": norm_choice
+            "norm_used": norm_choice,
+            "precheck": precheck_report
         }
 
     except Exception as e:
         import traceback
-        return {"success": False, "error": f"Lỗi không xác định trong quá trình tính toán: {e}\n{traceback.format_exc()}"}
\ No newline at end of file
+        return {"success": False, "error": f"Lỗi không xác định trong quá trình tính toán: {e}\n{traceback.format_exc()}"}
+
+def _chebyshev_iteration(B, d, x0, eps, max_iter, norm, norm_choice, norm_B, warning_message,
+                         spectral_bounds, precheck, fallback):
+    """
+    Phép lặp x = Bx + d tăng tốc Chebyshev (bán lặp Chebyshev).
+
+    Với phổ của B nằm trong [a, b], b < 1, đặt γ = 2/(2 - a - b) và
+    σ = (b - a)/(2 - a - b) (phổ của γB + (1 - γ)I nằm trong [-σ, σ]). Với
+    rₖ = B·x⁽ᵏ⁾ + d - x⁽ᵏ⁾:
+        x⁽¹⁾ = x⁽⁰⁾ + γ·r₀,
+        x⁽ᵏ⁺¹⁾ = ωₖ₊₁·(x⁽ᵏ⁾ + γ·rₖ - x⁽ᵏ⁻¹⁾) + x⁽ᵏ⁻¹⁾,
+        ω₂ = 1/(1 - σ²/2),  ωₖ₊₁ = 1/(1 - σ²·ωₖ/4).
+    Mỗi bước vẫn chỉ một phép nhân B·x, nhưng sai số giảm với tốc độ tiệm cận
+    σ/(1 + √(1 - σ²)) thay vì ρ(B) (khi a = -b: khoảng căn bậc hai của tốc độ cũ
+    theo số bước cần thiết).
+
+    Cột "error" giống phép lặp đơn: ||rₖ|| (chính là ||x⁽ᵏ⁺¹⁾ - x⁽ᵏ⁾|| của lặp đơn).
+    Vì x* - x⁽ᵏ⁾ = (I - B)⁻¹·rₖ, dừng khi ||rₖ|| < (1 - q)·eps với q = ||B|| nếu
+    ||B|| < 1, ngược lại q = b (đúng với B đối xứng theo chuẩn 2). Số bước dự đoán
+    vượt max_iter chỉ là cảnh báo, như phép lặp đơn (xem `convergence.precheck_rejects`).
+    """
+    n = B.shape[0]
+    if spectral_bounds is not None:
+        low, high = (float(value) for value in spectral_bounds)
+        bounds_source = "do người dùng cung cấp"
+    else:
+        try:
+            low, high, bounds_source = estimate_real_spectrum_bounds(B)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+    if low > high or high >= 1:
+        return {"success": False, "error": f"Khoảng phổ [{low:.4f}, {high:.4f}] không hợp lệ cho tăng tốc Chebyshev (cần a ≤ b < 1)."}
+
+    gamma = 2.0 / (2.0 - low - high)
+    sigma = (high - low) / (2.0 - low - high)
+    rate = float(sigma / (1.0 + np.sqrt(1.0 - sigma ** 2)))
+    plain_rate = max(abs(low), abs(high))
+    q = norm_B if norm_B < 1 else high
+    stopping_threshold = (1.0 - q) * eps if q > 0 else eps
+
+    x_prev = None
+    x_k = x0.copy()
+    r_k = B @ x_k + d - x_k
+    initial_residual = np.linalg.norm(r_k, norm)
+
+    # Số bước dự đoán: ||rₖ|| ≈ 2·rateᵏ·||r₀|| (Chebyshev) và plain_rateᵏ·||r₀|| (lặp đơn)
+    def predicted(factor, r):
+        if initial_residual < stopping_threshold:
+            return 0
+        if r >= 1:
+            return None
+        if r == 0:
+            return 1
+        return int(np.ceil(np.log(stopping_threshold / (factor * initial_residual)) / np.log(r)))
+    acceleration_info = {
+        "type": "chebyshev",
+        "spectral_bounds": [low, high],
+        "spectral_bounds_source": bounds_source,
+        "gamma": gamma,
+        "sigma": sigma,
+        "convergence_rate": rate,
+        "plain_convergence_rate": plain_rate,
+        "predicted_iterations": predicted(2.0, rate),
+        "plain_iterations_estimate": predicted(1.0, plain_rate)
+    }
+    if precheck and acceleration_info["predicted_iterations"] > max_iter:
+        report = {
+            "spectral_radius": plain_rate,
+            "spectral_radius_method": bounds_source,
+            "matvecs": 0,
+            "stopping_factor": 1.0 / (1.0 - q),
+            "predicted_iterations": acceleration_info["predicted_iterations"],
+            "max_iter": max_iter,
+            "verdict": "too_slow",
+            "recommendation": (f"Dự đoán cần khoảng {acceleration_info['predicted_iterations']} bước lặp Chebyshev "
+                               f"(max_iter = {max_iter}), có thể không hội tụ trong max_iter bước. Hãy tăng max_iter.")
+        }
+        if precheck_rejects(report, fallback):
+            failure = precheck_failure(report, "Lặp đơn (Chebyshev)", np.identity(n) - B, d, x0, eps, fallback)
+            failure["acceleration"] = acceleration_info
+            return failure
+        slow_warning = precheck_warning(report)
+        warning_message = f"{warning_message} {slow_warning}" if warning_message else slow_warning
+
+    steps = [{'k': 0, 'x_k': x_k.tolist(), 'error': 'N/A'}]
+    omega = 1.0
+    for k in range(1, max_iter + 1):
+        if x_prev is None:
+            x_next = x_k + gamma * r_k
+        else:
+            omega = 1.0 / (1.0 - sigma ** 2 / 2.0) if k == 2 else 1.0 / (1.0 - sigma ** 2 * omega / 4.0)
+            x_next = omega * (x_k + gamma * r_k - x_prev) + x_prev
+        x_prev, x_k = x_k, x_next
+        r_k = B @ x_k + d - x_k
+        error = np.linalg.norm(r_k, norm)
+        steps.append({'k': k, 'x_k': x_k.tolist(), 'error': error})
+        if error < stopping_threshold:
+            return {
+                "success": True,
+                "solution": x_k.tolist(),
+                "message": f"Hội tụ sau {k} lần lặp (tăng tốc Chebyshev).",
+                "iterations": k,
+                "steps": steps,
+                "B": B.tolist(),
+                "d": d.tolist(),
+                "stopping_threshold": stopping_threshold,
+                "norm_B": norm_B,
+                "warning_message": warning_message,
+                "norm_used": norm_choice,
+                "acceleration": acceleration_info
+            }
+
+    return {
+        "success": False,
+        "solution": x_k.tolist(),
+        "error": f"Không hội tụ sau {max_iter} lần lặp (tăng tốc Chebyshev). Sai số cuối cùng là {error:.2e}.",
+        "iterations": max_iter,
+        "steps": steps,
+        "B": B.tolist(),
+        "d": d.tolist(),
+        "stopping_threshold": stopping_threshold,
+        "norm_B": norm_B,
+        "warning_message": warning_message,
+        "norm_used": norm_choice,
+        "acceleration": acceleration_info
+    }
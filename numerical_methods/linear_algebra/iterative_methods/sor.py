@@ -0,0 +1,193 @@
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+import traceback
+
+from numerical_methods.linear_algebra.iterative_methods.convergence import power_spectral_radius
+
+def estimate_jacobi_spectral_radius(matrix_a, num_iter=100, tol=1e-5):
+    """
+    Ước lượng bán kính phổ ρ(B_J) của ma trận lặp Jacobi B_J = I - D⁻¹A bằng
+    phương pháp lũy thừa (A đầy đủ hoặc thưa, chỉ cần phép nhân A·v; xem
+    `convergence.power_spectral_radius`).
+
+    Returns:
+        tuple: (ρ ước lượng, số lần nhân ma trận–vector)
+    """
+    inv_diag = 1.0 / matrix_a.diagonal()
+    return power_spectral_radius(lambda v: v - inv_diag * (matrix_a @ v), matrix_a.shape[0], num_iter, tol)
+
+def optimal_omega(rho_jacobi, symmetric=False):
+    """
+    ω tối ưu theo công thức Young (cho ma trận sắp thứ tự nhất quán, ρ(B_J) < 1):
+        SOR:  ω = 2 / (1 + √(1 - ρ²))
+        SSOR: ω = 2 / (1 + √(2(1 - ρ)))   (xấp xỉ thường dùng)
+    Trả về None nếu ρ(B_J) ≥ 1.
+    """
+    if rho_jacobi >= 1:
+        return None
+    if symmetric:
+        return 2.0 / (1.0 + np.sqrt(2.0 * (1.0 - rho_jacobi)))
+    return 2.0 / (1.0 + np.sqrt(1.0 - rho_jacobi ** 2))
+
+def predicted_spectral_radius(rho_jacobi, omega, symmetric=False):
+    """
+    Bán kính phổ dự đoán của ma trận lặp (lý thuyết Young, ρ = ρ(B_J) < 1):
+      - SOR: ω - 1 nếu ω ≥ ω_opt, ngược lại ((ωρ + √(ω²ρ² - 4(ω - 1))) / 2)².
+      - SSOR (với ω tự động): (1 - √((1-ρ)/2)) / (1 + √((1-ρ)/2)).
+    Trả về None khi không có công thức phù hợp.
+    """
+    if rho_jacobi is None or rho_jacobi >= 1:
+        return None
+    if symmetric:
+        if not np.isclose(omega, optimal_omega(rho_jacobi, symmetric=True)):
+            return None
+        t = np.sqrt((1.0 - rho_jacobi) / 2.0)
+        return (1.0 - t) / (1.0 + t)
+    if omega >= optimal_omega(rho_jacobi):
+        return omega - 1.0
+    return ((omega * rho_jacobi + np.sqrt(omega ** 2 * rho_jacobi ** 2 - 4.0 * (omega - 1.0))) / 2.0) ** 2
+
+def triangular_solver(T, lower):
+    """Hàm giải hệ tam giác T·x = rhs (T đầy đủ hoặc thưa) cho một hoặc nhiều vế phải."""
+    if sp.issparse(T):
+        return lambda rhs: spla.spsolve_triangular(T, rhs, lower=lower).reshape(rhs.shape)
+    return lambda rhs: scipy.linalg.solve_triangular(T, rhs, lower=lower, check_finite=False)
+
+def _sor_sweeps(matrix_a, omega):
+    """
+    Các bước quét SOR tiến và lùi, với A = D + L + U:
+        tiến: (D + ωL)·x_mới = ω·b - (ωU + (ω - 1)D)·x_cũ
+        lùi:  (D + ωU)·x_mới = ω·b - (ωL + (ω - 1)D)·x_cũ
+    Với ω = 1, bước quét tiến chính là một bước Gauss-Seidel.
+    """
+    if sp.issparse(matrix_a):
+        A = matrix_a.tocsr()
+        D = sp.diags(A.diagonal(), format='csr')
+        L, U = sp.tril(A, -1, format='csr'), sp.triu(A, 1, format='csr')
+    else:
+        A = np.asarray(matrix_a, dtype=float)
+        D = np.diag(np.diag(A))
+        L, U = np.tril(A, -1), np.triu(A, 1)
+    solve_forward = triangular_solver((D + omega * L).tocsr() if sp.issparse(A) else D + omega * L, lower=True)
+    solve_backward = triangular_solver((D + omega * U).tocsr() if sp.issparse(A) else D + omega * U, lower=False)
+    forward_rest = omega * U + (omega - 1.0) * D
+    backward_rest = omega * L + (omega - 1.0) * D
+
+    def forward(b, x):
+        return solve_forward(omega * b - forward_rest @ x)
+
+    def backward(b, x):
+        return solve_backward(omega * b - backward_rest @ x)
+    return forward, backward
+
+def solve_sor(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, omega=None, symmetric=False):
+    """
+    Giải hệ Ax = B bằng phương pháp giảm dư trên (SOR), hoặc SOR đối xứng (SSOR:
+    mỗi bước gồm một lần quét tiến và một lần quét lùi) khi symmetric=True.
+    A có thể là ma trận thưa SciPy.
+
+    - ω: nếu không cho (None hoặc "auto"), ước lượng ρ(B_J) bằng vài bước lặp lũy
+      thừa rồi chọn ω theo công thức Young (xem `optimal_omega`). Cần 0 < ω < 2.
+    - Sai số hậu nghiệm: ρ/(1 - ρ)·||x⁽ᵏ⁾ - x⁽ᵏ⁻¹⁾||∞, với ρ là bán kính phổ dự đoán
+      của ma trận lặp; nếu không có dự đoán, dùng tỉ số ||Δₖ|| / ||Δₖ₋₁|| quan sát được.
+    - So sánh với Gauss-Seidel: ρ(B_GS) = ρ(B_J)², nên để đạt cùng độ giảm sai số
+      Gauss-Seidel cần khoảng k·ln q / ln ρ_GS bước lặp, với q là tốc độ co trung
+      bình quan sát được của SOR/SSOR (mỗi bước SSOR tính là hai lần quét).
+    """
+    try:
+        method = "SSOR" if symmetric else "SOR"
+        n = matrix_a.shape[0]
+        if n != matrix_a.shape[1]:
+            return {"success": False, "error": "Ma trận A phải là ma trận vuông."}
+        if matrix_b.ndim == 1:
+            matrix_b = matrix_b.reshape(-1, 1)
+        if x0.ndim == 1:
+            x0 = x0.reshape(-1, 1)
+        if np.any(np.isclose(matrix_a.diagonal(), 0)):
+            return {"success": False, "error": "Ma trận có phần tử trên đường chéo chính bằng 0, không thể thực hiện phép chia."}
+
+        rho_jacobi, power_iterations = estimate_jacobi_spectral_radius(matrix_a)
+        if omega is None or omega == 'auto':
+            omega = optimal_omega(rho_jacobi, symmetric)
+            omega_source = f"ước lượng từ ρ(B_J) ≈ {rho_jacobi:.6f} ({power_iterations} bước lặp lũy thừa)"
+            if omega is None:
+                omega = 1.0
+                omega_source = f"ρ(B_J) ≈ {rho_jacobi:.4f} ≥ 1, không áp dụng được công thức Young; dùng ω = 1"
+        else:
+            omega = float(omega)
+            omega_source = "do người dùng chọn"
+        if not 0 < omega < 2:
+            return {"success": False, "error": f"Tham số giảm dư ω = {omega} phải thỏa 0 < ω < 2."}
+
+        rho_method = predicted_spectral_radius(rho_jacobi, omega, symmetric)
+        rho_gauss_seidel = rho_jacobi ** 2
+        forward, backward = _sor_sweeps(matrix_a, omega)
+        matrix_b = np.asarray(matrix_b, dtype=float)
+
+        x_k = np.array(x0, dtype=float)
+        table_rows = []
+        final_error = float('inf')
+        previous_diff = first_diff = None
+        for i in range(max_iter):
+            x_prev = x_k
+            x_k = forward(matrix_b, x_prev)
+            if symmetric:
+                x_k = backward(matrix_b, x_k)
+            diff_norm = np.linalg.norm(x_k - x_prev, np.inf)
+            q = rho_method
+            if q is None and previous_diff:
+                q = diff_norm / previous_diff
+            estimated_error = q / (1 - q) * diff_norm if q is not None and q < 1 else diff_norm
+            previous_diff = diff_norm
+            first_diff = first_diff or diff_norm
+            final_error = estimated_error
+            table_rows.append({
+                "k": i + 1,
+                "x_k": x_k.tolist(),
+                "error": estimated_error,
+                "error_norm": diff_norm
+            })
+            if estimated_error < eps:
+                break
+
+        if i == max_iter - 1 and final_error >= eps:
+            return {
+                "success": False,
+                "error": f"Phương pháp {method} không hội tụ sau {max_iter} lần lặp (ω = {omega:.4f}).",
+                "steps": [{"table": table_rows}]
+            }
+
+        iterations = i + 1
+        # Tốc độ co trung bình quan sát được (với ω gần tối ưu, tốc độ thực tế chậm hơn
+        # dự đoán ω - 1 do ma trận lặp không chéo hóa được)
+        observed_rate = (diff_norm / first_diff) ** (1.0 / (iterations - 1)) if iterations > 1 and first_diff and diff_norm > 0 else None
+        gauss_seidel_estimate = None
+        if observed_rate is not None and 0 < observed_rate < 1 and 0 < rho_gauss_seidel < 1:
+            gauss_seidel_estimate = int(np.ceil(iterations * np.log(observed_rate) / np.log(rho_gauss_seidel)))
+        sweeps = 2 * iterations if symmetric else iterations
+        return {
+            "success": True,
+            "message": f"{method} hội tụ sau {iterations} lần lặp với ω = {omega:.4f}.",
+            "solution": x_k.tolist(),
+            "iterations": iterations,
+            "steps": [{"message": "Bảng quá trình lặp", "table": table_rows}],
+            "method": method,
+            "omega": omega,
+            "omega_source": omega_source,
+            "spectral_radius_jacobi": rho_jacobi,
+            "spectral_radius_gauss_seidel": rho_gauss_seidel,
+            "spectral_radius_estimate": rho_method,
+            "observed_convergence_rate": observed_rate,
+            "sweeps": sweeps,
+            "gauss_seidel_iterations_estimate": gauss_seidel_estimate,
+            "iterations_saved_vs_gauss_seidel": gauss_seidel_estimate - sweeps if gauss_seidel_estimate is not None else None,
+            "norm_used": "vô cùng"
+        }
+    except Exception as e:
+        return {"success": False, "error": f"Lỗi không xác định: {traceback.format_exc()}"}
+
+def solve_ssor(matrix_a, matrix_b, x0, eps=1e-5, max_iter=100, omega=None):
+    """Giải hệ Ax = B bằng SOR đối xứng (xem `solve_sor`)."""
+    return solve_sor(matrix_a, matrix_b, x0, eps=eps, max_iter=max_iter, omega=omega, symmetric=True)
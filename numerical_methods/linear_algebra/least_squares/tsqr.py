@@ -0,0 +1,156 @@
+import os
+import numpy as np
+import scipy.linalg
+from concurrent.futures import ThreadPoolExecutor
+
+def _qr_r(M):
+    """Nhân tử R của phân tích QR (không cần Q)."""
+    return np.linalg.qr(M, mode='r')
+
+class TSQRAccumulator:
+    """
+    Phân tích QR cho ma trận cao-hẹp (TSQR) theo từng khối hàng.
+
+    Mỗi khối hàng [A_i | B_i] được phân tích QR độc lập (song song bằng một nhóm
+    luồng) để lấy nhân tử R_i; các R_i được xếp chồng và phân tích QR lần nữa.
+    Chỉ giữ lại nhân tử R của [A | B], kích thước (n+k)×(n+k), nên bộ nhớ
+    không phụ thuộc vào số hàng m.
+
+    Với R của [A | B] = [[R, C], [0, D]]: nghiệm bình phương tối thiểu là
+    X = R⁻¹·C, và chuẩn phần dư của cột j của B bằng chuẩn cột j của D.
+
+    Khi tiếp tục từ nhân tử R của lần giải trước (initial_r), initial_rows là số
+    hàng đã được gộp vào R đó (trường "rows" của kết quả trước); nếu không cho,
+    lấy số hàng của R (một chặn dưới).
+    """
+
+    def __init__(self, num_cols, num_rhs, initial_r=None, max_workers=None, initial_rows=None):
+        self.num_cols = int(num_cols)
+        self.num_rhs = int(num_rhs)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.num_blocks = 0
+        width = self.num_cols + self.num_rhs
+        self.R = np.zeros((0, width)) if initial_r is None else np.asarray(initial_r, dtype=float)
+        if self.R.ndim != 2 or self.R.shape[1] != width:
+            raise ValueError(f"Nhân tử R ban đầu phải có {width} cột.")
+        self.initial_rows = self.R.shape[0] if initial_rows is None else int(initial_rows)
+        self.num_rows = self.initial_rows
+
+    def _augment(self, A_block, B_block):
+        A_block = np.atleast_2d(np.asarray(A_block, dtype=float))
+        B_block = np.asarray(B_block, dtype=float).reshape(A_block.shape[0], -1)
+        if A_block.shape[1] != self.num_cols or B_block.shape[1] != self.num_rhs:
+            raise ValueError(f"Khối hàng phải có {self.num_cols} cột của A và {self.num_rhs} cột của B.")
+        return np.hstack((A_block, B_block))
+
+    def _merge(self, factors):
+        self.R = _qr_r(np.vstack([self.R] + factors))
+
+    def add_block(self, A_block, B_block):
+        """Thêm một khối hàng (A_i, B_i)."""
+        self.add_blocks([(A_block, B_block)])
+
+    def add_blocks(self, blocks):
+        """
+        Thêm nhiều khối hàng (có thể là một generator). Các khối được phân tích song
+        song theo từng đợt 2·max_workers khối, rồi gộp ngay vào R để giới hạn bộ nhớ.
+        """
+        batch_size = 2 * self.max_workers
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = []
+            for A_block, B_block in blocks:
+                block = self._augment(A_block, B_block)
+                self.num_rows += block.shape[0]
+                self.num_blocks += 1
+                pending.append(executor.submit(_qr_r, block))
+                if len(pending) >= batch_size:
+                    self._merge([f.result() for f in pending])
+                    pending = []
+            if pending:
+                self._merge([f.result() for f in pending])
+
+    def solve(self):
+        """
+        Giải bài toán bình phương tối thiểu min ||A·X - B|| từ nhân tử R hiện có.
+
+        Returns:
+            dict: Nghiệm, chuẩn phần dư của từng cột B, nhân tử R (để dùng lại).
+        """
+        n, k = self.num_cols, self.num_rhs
+        if self.R.shape[0] < n:
+            return {"success": False, "error": f"Cần ít nhất {n} hàng (hiện có {self.R.shape[0]})."}
+        R_aug = np.zeros((n + k, n + k))
+        R_aug[:min(self.R.shape[0], n + k)] = self.R[:n + k]
+        R, C, D = R_aug[:n, :n], R_aug[:n, n:], R_aug[n:, n:]
+        diag = np.abs(np.diag(R))
+        # Ngưỡng hạng như np.linalg.matrix_rank: max(m, n)·ε·max|r_ii|
+        if diag.size == 0 or diag.min() <= diag.max() * max(self.num_rows, n) * np.finfo(float).eps:
+            return {"success": False, "error": "Ma trận A không có hạng đầy đủ theo cột (R suy biến), nghiệm bình phương tối thiểu không duy nhất."}
+        X = scipy.linalg.solve_triangular(R, C)
+        residual_norms = np.linalg.norm(D, axis=0)
+        return {
+            "success": True,
+            "solution": X.tolist(),
+            "residual_norms": residual_norms.tolist(),
+            "R": R.tolist(),
+            "R_augmented": R_aug.tolist(),
+            "rows": self.num_rows,
+            "new_rows": self.num_rows - self.initial_rows,
+            "num_blocks": self.num_blocks,
+            "condition_estimate": float(diag.max() / diag.min()),
+            "message": f"Giải bình phương tối thiểu bằng TSQR trên {self.num_rows} hàng ({self.num_blocks} khối)."
+        }
+
+def _row_blocks(A, B, block_rows):
+    for start in range(0, A.shape[0], block_rows):
+        stop = min(start + block_rows, A.shape[0])
+        yield A[start:stop], B[start:stop]
+
+def solve_tsqr(matrix_a, matrix_b, block_rows=10000, initial_r=None, max_workers=None, initial_rows=None):
+    """
+    Giải bài toán bình phương tối thiểu min ||A·X - B|| (A cao-hẹp) bằng TSQR.
+
+    Args:
+        block_rows (int): Số hàng mỗi khối.
+        initial_r (list, optional): Nhân tử R_augmented từ lần giải trước, để
+            cập nhật nghiệm khi có thêm hàng mới mà không cần các hàng cũ.
+        initial_rows (int, optional): Số hàng đã gộp vào initial_r (trường "rows"
+            của lần giải trước), để số hàng báo cáo tính cả các hàng cũ.
+    """
+    try:
+        A = np.asarray(matrix_a, dtype=float)
+        B = np.asarray(matrix_b, dtype=float)
+        if A.ndim != 2:
+            return {"success": False, "error": "Ma trận A phải là ma trận 2 chiều."}
+        if B.ndim == 1:
+            B = B.reshape(-1, 1)
+        if A.shape[0] != B.shape[0]:
+            return {"success": False, "error": "Số hàng của A và B không khớp."}
+        accumulator = TSQRAccumulator(A.shape[1], B.shape[1], initial_r=initial_r, max_workers=max_workers,
+                                      initial_rows=initial_rows)
+        accumulator.add_blocks(_row_blocks(A, B, max(1, int(block_rows))))
+        return accumulator.solve()
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi nghiêm trọng: {traceback.format_exc()}"}
+
+def solve_tsqr_npy(path_a, path_b, block_rows=100000, max_workers=None):
+    """
+    TSQR trên các tệp .npy được ánh xạ bộ nhớ (np.load(..., mmap_mode='r')): mỗi
+    khối hàng chỉ được đọc từ đĩa khi cần, nên bộ nhớ chỉ phụ thuộc vào block_rows.
+    """
+    try:
+        A = np.load(path_a, mmap_mode='r')
+        B = np.load(path_b, mmap_mode='r')
+        if A.ndim != 2:
+            return {"success": False, "error": "Ma trận A phải là ma trận 2 chiều."}
+        if B.ndim == 1:
+            B = B.reshape(-1, 1)
+        if A.shape[0] != B.shape[0]:
+            return {"success": False, "error": "Số hàng của A và B không khớp."}
+        accumulator = TSQRAccumulator(A.shape[1], B.shape[1], max_workers=max_workers)
+        accumulator.add_blocks(_row_blocks(A, B, max(1, int(block_rows))))
+        return accumulator.solve()
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi nghiêm trọng: {traceback.format_exc()}"}
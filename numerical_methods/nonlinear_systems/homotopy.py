@@ -0,0 +1,196 @@
+import itertools
+import multiprocessing
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sympy import Poly
+
+from numerical_methods.nonlinear_systems.system_cache import get_system_artifacts
+
+# Dưới ngưỡng này, chi phí khởi động nhóm tiến trình lớn hơn thời gian dò các đường đi (~10 ms/đường)
+PARALLEL_MIN_PATHS = 64
+
+# Trạng thái của mỗi tiến trình con: các hàm F, J đã biên dịch (không pickle được nên biên dịch tại chỗ)
+_WORKER_STATE = {}
+
+def _compile_system(n, expr_list):
+    """Lấy F và J của hệ đa thức (từ bộ nhớ đệm) dưới dạng các hàm NumPy nhận đối số phức."""
+    F_func, J_func = get_system_artifacts(n, expr_list).raw_funcs
+    return (
+        lambda x: np.array(F_func(*x), dtype=complex),
+        lambda x: np.array(J_func(*x), dtype=complex),
+    )
+
+def _init_worker(n, expr_list, degrees, gamma):
+    F, J = _compile_system(n, expr_list)
+    _WORKER_STATE.update(F=F, J=J, degrees=degrees, gamma=gamma)
+
+def _track_worker(start):
+    s = _WORKER_STATE
+    return _track_path(start, s['F'], s['J'], s['degrees'], s['gamma'])
+
+def _track_path(start, F, J, degrees, gamma, max_steps=5000, diverge_norm=1e8):
+    """
+    Dò theo một đường đi của phép đồng luân
+        H(x, t) = (1 - t)·γ·G(x) + t·F(x),   G_i(x) = x_i^{d_i} - 1,
+    từ nghiệm x(0) = start của hệ khởi đầu đến t = 1 bằng dự báo Euler
+    (theo tiếp tuyến) và hiệu chỉnh Newton, với bước t thích nghi.
+
+    Returns:
+        dict: {'status', 'x', 'predictor_steps'} với status là 'finite',
+        'diverged' (đường đi ra vô cùng) hoặc 'failed'.
+    """
+    d = np.asarray(degrees)
+    G = lambda x: x ** d - 1
+    dG = lambda x: np.diag(d * x ** (d - 1))
+    H = lambda x, t: (1 - t) * gamma * G(x) + t * F(x)
+    Hx = lambda x, t: (1 - t) * gamma * dG(x) + t * J(x)
+    Ht = lambda x: F(x) - gamma * G(x)
+
+    x = np.array(start, dtype=complex)
+    t, dt = 0.0, 0.02
+    consecutive_ok = 0
+    steps = 0
+    try:
+        while t < 1.0 and steps < max_steps:
+            steps += 1
+            dt = min(dt, 1.0 - t)
+            # Dự báo: H_x·dx/dt = -H_t
+            x_pred = x + dt * np.linalg.solve(Hx(x, t), -Ht(x))
+            t_new = t + dt
+
+            # Hiệu chỉnh Newton tại t_new
+            converged = False
+            x_corr = x_pred
+            for _ in range(3):
+                dx = np.linalg.solve(Hx(x_corr, t_new), H(x_corr, t_new))
+                x_corr = x_corr - dx
+                if np.linalg.norm(dx) < 1e-9 * (1 + np.linalg.norm(x_corr)):
+                    converged = True
+                    break
+
+            if converged:
+                x, t = x_corr, t_new
+                consecutive_ok += 1
+                if consecutive_ok >= 3:
+                    dt = min(2 * dt, 0.1)
+                    consecutive_ok = 0
+            else:
+                dt /= 2
+                consecutive_ok = 0
+                if dt < 1e-13:
+                    break
+
+            if np.linalg.norm(x) > diverge_norm:
+                return {"status": "diverged", "x": x, "predictor_steps": steps}
+    except np.linalg.LinAlgError:
+        pass
+
+    if t < 1.0:
+        status = "diverged" if np.linalg.norm(x) > np.sqrt(diverge_norm) else "failed"
+        return {"status": status, "x": x, "predictor_steps": steps}
+
+    # Kết thúc: làm mịn nghiệm bằng Newton trên F
+    for _ in range(10):
+        try:
+            dx = np.linalg.solve(J(x), F(x))
+        except np.linalg.LinAlgError:
+            break
+        x = x - dx
+        if np.linalg.norm(dx) < 1e-14 * (1 + np.linalg.norm(x)):
+            break
+    ok = np.all(np.isfinite(x)) and np.linalg.norm(F(x)) < 1e-8 * (1 + np.linalg.norm(x))
+    return {"status": "finite" if ok else "failed", "x": x, "predictor_steps": steps}
+
+def _format_value(c):
+    """Chuyển số phức thành số thực (nếu phần ảo không đáng kể) hoặc chuỗi 'a+bj'."""
+    if abs(c.imag) < 1e-9:
+        return float(f"{c.real:.10g}")
+    return f"{c.real:.10g}{c.imag:+.10g}j"
+
+def solve_homotopy_system(n, expr_list, parallel=True, max_workers=None, max_paths=10000, seed=0):
+    """
+    Tìm tất cả các nghiệm cô lập hữu hạn của hệ đa thức F(X) = 0 bằng phương pháp
+    đồng luân bậc toàn phần (total-degree homotopy continuation).
+
+    Hệ khởi đầu G_i(x) = x_i^{d_i} - 1 (d_i là bậc của f_i) có d_1·d_2·…·d_n nghiệm
+    (số Bézout) là tổ hợp các căn bậc d_i của đơn vị. Mỗi đường đi được dò độc lập,
+    nên được phân phối cho một nhóm tiến trình khi có ít nhất PARALLEL_MIN_PATHS
+    đường đi. Các tiến trình con được tạo từ forkserver (nếu nền tảng hỗ trợ) thay
+    vì fork trực tiếp tiến trình gọi, vốn có thể đang chạy nhiều luồng (máy chủ Flask).
+
+    Args:
+        n (int): Số lượng phương trình (và số ẩn).
+        expr_list (list): Danh sách các chuỗi biểu thức đa thức f1, ..., fn.
+        parallel (bool): Dò các đường đi song song bằng ProcessPoolExecutor (chỉ khi
+            số đường đi ≥ PARALLEL_MIN_PATHS).
+        max_workers (int, optional): Số tiến trình tối đa.
+        max_paths (int): Giới hạn số đường đi (số Bézout).
+        seed (int): Hạt giống cho hằng số γ ngẫu nhiên ("gamma trick").
+
+    Returns:
+        dict: Các nghiệm phân biệt (phức và thực) và trạng thái của từng đường đi.
+    """
+    try:
+        system = get_system_artifacts(n, expr_list)
+        variables, F = system.variables, system.F
+        degrees = []
+        for i, expr in enumerate(F):
+            if not expr.is_polynomial(*variables):
+                return {"success": False, "error": f"Phương trình f{i+1} không phải là đa thức theo x1..x{n}."}
+            deg = Poly(expr, *variables).total_degree()
+            if deg < 1:
+                return {"success": False, "error": f"Phương trình f{i+1} có bậc 0."}
+            degrees.append(deg)
+
+        num_paths = int(np.prod(degrees))
+        if num_paths > max_paths:
+            return {"success": False, "error": f"Số đường đi (số Bézout) {num_paths} vượt quá giới hạn {max_paths}."}
+
+        rng = np.random.default_rng(seed)
+        angle = rng.uniform(0, 2 * np.pi)
+        gamma = complex(np.cos(angle), np.sin(angle))
+
+        roots_of_unity = [np.exp(2j * np.pi * np.arange(d) / d) for d in degrees]
+        starts = [np.array(p) for p in itertools.product(*roots_of_unity)]
+
+        if parallel and num_paths >= PARALLEL_MIN_PATHS:
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, num_paths // (4 * workers))
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method),
+                                     initializer=_init_worker, initargs=(n, expr_list, degrees, gamma)) as executor:
+                path_results = list(executor.map(_track_worker, starts, chunksize=chunksize))
+        else:
+            F_num, J_num = _compile_system(n, expr_list)
+            path_results = [_track_path(s, F_num, J_num, degrees, gamma) for s in starts]
+
+        # Gộp các nghiệm trùng nhau (nghiệm bội được nhiều đường đi hội tụ tới)
+        solutions = []
+        steps = []
+        for p, res in enumerate(path_results):
+            x = res['x']
+            step_info = {'path': p + 1, 'status': res['status'], 'predictor_steps': res['predictor_steps']}
+            step_info.update({f"x{i+1}": _format_value(x[i]) if res['status'] == 'finite' else None for i in range(n)})
+            steps.append(step_info)
+            if res['status'] != 'finite':
+                continue
+            if not any(np.linalg.norm(x - s) < 1e-6 * (1 + np.linalg.norm(s)) for s in solutions):
+                solutions.append(x)
+
+        real_solutions = [s.real for s in solutions if np.max(np.abs(s.imag)) < 1e-8 * (1 + np.linalg.norm(s))]
+
+        return {
+            "success": True,
+            "bezout_number": num_paths,
+            "degrees": degrees,
+            "solutions": [[_format_value(v) for v in s] for s in solutions],
+            "real_solutions": [[float(v) for v in s] for s in real_solutions],
+            "num_diverged": sum(1 for r in path_results if r['status'] == 'diverged'),
+            "num_failed": sum(1 for r in path_results if r['status'] == 'failed'),
+            "steps": steps,
+            "message": f"Tìm được {len(solutions)} nghiệm phân biệt ({len(real_solutions)} nghiệm thực) từ {num_paths} đường đi."
+        }
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi: {str(e)}\n{traceback.format_exc()}"}
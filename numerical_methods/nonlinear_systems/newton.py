@@ -1,10 +1,35 @@
 import numpy as np
-from sympy import symbols, sympify, Matrix, latex
+from scipy.sparse.linalg import splu
 
-def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_choice):
+from numerical_methods.nonlinear_systems.sparse_jacobian import sparse_fd_jacobian
+from numerical_methods.nonlinear_systems.system_cache import get_system_artifacts
+
+def _armijo_step(residual, X, delta, F_norm_sq, c=1e-4, t_min=1e-10):
+    """
+    Tìm độ dài bước t theo quy tắc Armijo (quay lui) cho hàm φ(X) = ||F(X)||².
+
+    Với hướng Newton -ΔX, đạo hàm theo hướng của φ là -2||F||², nên điều kiện
+    Armijo là ||F(X - tΔX)||² <= (1 - 2ct)·||F(X)||².
+
+    Returns:
+        tuple: (t, X mới, F(X mới)) hoặc (None, None, None) nếu t < t_min.
+    """
+    t = 1.0
+    while t >= t_min:
+        X_new = X - t * delta
+        F_new = residual(X_new)
+        if np.all(np.isfinite(F_new)) and F_new @ F_new <= (1 - 2 * c * t) * F_norm_sq:
+            return t, X_new, F_new
+        t *= 0.5
+    return None, None, None
+
+def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_choice, jacobian_mode='symbolic', line_search=False):
     """
     Giải hệ phương trình phi tuyến F(X) = 0 bằng phương pháp Newton.
-    
+
+    F, J(X) và LaTeX của J được lấy từ bộ nhớ đệm của hệ (xem `system_cache`),
+    mỗi bước lặp chỉ tính giá trị các hàm đã biên dịch.
+
     Args:
         n (int): Số lượng phương trình (và số ẩn).
         expr_list (list): Danh sách các chuỗi biểu thức cho f1, f2, ..., fn.
@@ -12,76 +37,88 @@ def solve_newton_system(n, expr_list, x0_list, stop_option, stop_value, norm_cho
         stop_option (str): Điều kiện dừng ('absolute_error', 'relative_error', 'iterations').
         stop_value (float): Giá trị cho điều kiện dừng (epsilon, delta, hoặc số lần lặp N).
         norm_choice (str): Lựa chọn chuẩn tính sai số ('1' hoặc 'infinity').
+        jacobian_mode (str): 'symbolic' (Jacobi ký hiệu) hoặc 'sparse' (Jacobi thưa
+            tính bằng sai phân với tô màu cột, dành cho hệ lớn; giải bằng LU thưa).
+        line_search (bool): Newton giảm chấn với tìm kiếm theo tia Armijo trên ||F||²,
+            giúp hội tụ từ X₀ ở xa nghiệm. Độ dài bước được ghi trong từng bước lặp.
 
     Returns:
         dict: Chứa kết quả, các bước lặp và thông tin chẩn đoán.
     """
     try:
-        variables = symbols(f'x1:{n+1}')
-        F = Matrix([sympify(expr) for expr in expr_list])
-        X = Matrix(x0_list)
-        J = F.jacobian(variables)
-        iterations_data = []
+        system = get_system_artifacts(n, expr_list)
+        residual = system.residual
+        result_extra = {}
+        if jacobian_mode == 'sparse':
+            pattern, colors = system.sparsity
+            num_colors = int(colors.max()) + 1 if n > 0 else 0
+            result_extra["jacobian_sparsity"] = {
+                "nnz": int(pattern.nnz),
+                "density": float(pattern.nnz / max(1, n * n)),
+                "num_colors": num_colors,
+                "residual_evaluations_per_jacobian": num_colors,
+            }
 
-        # Vòng lặp chính
-        if stop_option == 'iterations':
-            max_iter = int(stop_value)
-            for k in range(max_iter):
-                F_val = F.subs({variables[i]: X[i] for i in range(n)}).evalf()
-                J_val = J.subs({variables[i]: X[i] for i in range(n)}).evalf()
-                if J_val.det() == 0:
-                    return {"success": False, "error": f"Ma trận Jacobi suy biến tại bước lặp {k+1}."}
-                
-                X = X - J_val.inv() * F_val
-                step_info = {f"x{i+1}": float(X[i]) for i in range(n)}
-                step_info['k'] = k + 1
-                iterations_data.append(step_info)
+            def newton_direction(X, F_val):
+                J_val = sparse_fd_jacobian(residual, X, F_val, pattern, colors)
+                return splu(J_val.tocsc()).solve(F_val)
         else:
-            tol = float(stop_value)
-            for k in range(200): # Giới hạn tối đa 200 lần lặp
-                X_prev = X.copy()
-                F_val = F.subs({variables[i]: X[i] for i in range(n)}).evalf()
-                J_val = J.subs({variables[i]: X[i] for i in range(n)}).evalf()
+            J_func = system.jacobian_func
 
-                if J_val.det() == 0:
-                    return {"success": False, "error": f"Ma trận Jacobi suy biến tại bước lặp {k+1}."}
+            def newton_direction(X, F_val):
+                return np.linalg.solve(J_func(X), F_val)
 
-                X = X - J_val.inv() * F_val
+        X = np.array(x0_list, dtype=float)
+        F_val = residual(X)
+        iterations_data = []
+        max_iter = int(stop_value) if stop_option == 'iterations' else 200
+        tol = float(stop_value)
 
-                # Tính sai số dựa trên chuẩn được chọn
-                diff_vec_abs = np.abs(np.array(X.tolist(), dtype=float) - np.array(X_prev.tolist(), dtype=float)).flatten()
-                current_vec_abs = np.abs(np.array(X.tolist(), dtype=float)).flatten()
+        for k in range(max_iter):
+            try:
+                delta = newton_direction(X, F_val)
+            except (RuntimeError, np.linalg.LinAlgError):
+                return {"success": False, "error": f"Ma trận Jacobi suy biến tại bước lặp {k+1}."}
 
+            X_prev = X
+            if line_search:
+                t, X, F_val = _armijo_step(residual, X_prev, delta, float(F_val @ F_val))
+                if t is None:
+                    return {"success": False, "error": f"Tìm kiếm theo tia không tìm được bước giảm ||F|| tại bước lặp {k+1}."}
+            else:
+                X = X - delta
+                F_val = residual(X)
+
+            step_info = {f"x{i+1}": float(X[i]) for i in range(n)}
+            step_info['k'] = k + 1
+            if stop_option != 'iterations':
                 if norm_choice == '1':
-                    abs_err = float(np.sum(diff_vec_abs))
-                    norm_X = float(np.sum(current_vec_abs))
+                    abs_err = float(np.sum(np.abs(X - X_prev)))
+                    norm_X = float(np.sum(np.abs(X)))
                 else: # Mặc định là chuẩn vô cùng
-                    abs_err = float(np.max(diff_vec_abs))
-                    norm_X = float(np.max(current_vec_abs))
-                
+                    abs_err = float(np.max(np.abs(X - X_prev)))
+                    norm_X = float(np.max(np.abs(X)))
                 rel_err = abs_err / norm_X if norm_X > 1e-12 else float('inf')
-
-                step_info = {f"x{i+1}": float(X[i]) for i in range(n)}
-                step_info['k'] = k + 1
                 step_info['error'] = abs_err if stop_option == 'absolute_error' else rel_err
-                iterations_data.append(step_info)
+            if line_search:
+                step_info['step_length'] = t
+            iterations_data.append(step_info)
+
+            if (stop_option == 'absolute_error' and abs_err < tol) or \
+               (stop_option == 'relative_error' and rel_err < tol):
+                break
+        else:
+            if stop_option != 'iterations':
+                return {"success": False, "error": "Phương pháp không hội tụ sau 200 lần lặp."}
+
+        if jacobian_mode != 'sparse':
+            result_extra["jacobian_matrix_latex"] = system.jacobian_latex
 
-                if (stop_option == 'absolute_error' and abs_err < tol) or \
-                   (stop_option == 'relative_error' and rel_err < tol):
-                    break
-            else:
-                 return {"success": False, "error": "Phương pháp không hội tụ sau 200 lần lặp."}
-        
-        try:
-            J_latex = [[latex(elem) for elem in row] for row in J.tolist()]
-        except Exception:
-            J_latex = [[str(elem) for elem in row] for row in J.tolist()]
-            
         return {
             "success": True,
-            "solution": [float(val) for val in X],
+            "solution": X.tolist(),
             "iterations": len(iterations_data),
-            "jacobian_matrix_latex": J_latex,
+            **result_extra,
             "steps": iterations_data,
             "message": f"Hội tụ sau {len(iterations_data)} lần lặp."
         }
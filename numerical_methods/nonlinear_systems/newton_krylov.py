@@ -0,0 +1,112 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, gmres
+
+from numerical_methods.nonlinear_systems.system_cache import get_system_artifacts
+
+def _forcing_term(eta_prev, F_norm, F_norm_prev, eta_max=0.9, gamma=0.9, alpha=2.0):
+    """Hệ số ép buộc η_k theo Eisenstat–Walker (lựa chọn 2, có chặn an toàn)."""
+    eta = gamma * (F_norm / F_norm_prev) ** alpha
+    safeguard = gamma * eta_prev ** alpha
+    if safeguard > 0.1:
+        eta = max(eta, safeguard)
+    return min(eta, eta_max)
+
+def solve_newton_krylov_system(n, expr_list, x0_list, stop_option, stop_value, norm_choice, eta0=0.5, max_inner=None):
+    """
+    Giải hệ phương trình phi tuyến F(X) = 0 bằng phương pháp Newton–Krylov không dùng ma trận Jacobi.
+
+    Tích J(X)·v được xấp xỉ bằng sai phân theo hướng
+        J(X)·v ≈ (F(X + εv) - F(X)) / ε,
+    và hệ J(X) ΔX = -F(X) ở mỗi bước được giải gần đúng bằng GMRES với
+    sai số tương đối η_k chọn theo Eisenstat–Walker.
+
+    Args:
+        (Các tham số tương tự như PP Newton chuẩn)
+        eta0 (float): Hệ số ép buộc ở bước đầu tiên.
+        max_inner (int, optional): Số lần lặp GMRES tối đa mỗi bước (mặc định n),
+            với GMRES khởi động lại sau mỗi 30 lần lặp.
+
+    Returns:
+        dict: Kết quả tính toán, kèm số lần lặp Krylov của từng bước.
+    """
+    try:
+        residual = get_system_artifacts(n, expr_list).residual
+        max_inner = int(max_inner) if max_inner else n
+        restart = min(n, 30)
+        max_cycles = max(1, -(-max_inner // restart))
+        sqrt_eps = np.sqrt(np.finfo(float).eps)
+
+        X = np.array(x0_list, dtype=float)
+        F_val = residual(X)
+        F_norm = float(np.linalg.norm(F_val))
+        eta = eta0
+        residual_evaluations = 1
+        iterations_data = []
+        max_iter = int(stop_value) if stop_option == 'iterations' else 200
+        tol = float(stop_value)
+
+        for k in range(max_iter):
+            def jac_vec(v, X=X, F_val=F_val):
+                nonlocal residual_evaluations
+                v = np.ravel(v)
+                v_norm = np.linalg.norm(v)
+                if v_norm == 0:
+                    return np.zeros_like(F_val)
+                eps = sqrt_eps * (1.0 + np.linalg.norm(X)) / v_norm
+                residual_evaluations += 1
+                return (residual(X + eps * v) - F_val) / eps
+
+            J_op = LinearOperator((n, n), matvec=jac_vec, dtype=float)
+            inner_counter = [0]
+
+            def count_inner(_):
+                inner_counter[0] += 1
+
+            delta, info = gmres(J_op, -F_val, rtol=eta, atol=0.0, restart=restart, maxiter=max_cycles,
+                                callback=count_inner, callback_type='pr_norm')
+            if not np.all(np.isfinite(delta)):
+                return {"success": False, "error": f"GMRES không giải được bước Newton tại bước lặp {k+1}."}
+
+            X_prev = X
+            X = X + delta
+            F_val = residual(X)
+            residual_evaluations += 1
+            F_norm_prev, F_norm = F_norm, float(np.linalg.norm(F_val))
+
+            step_info = {f"x{i+1}": float(X[i]) for i in range(n)}
+            step_info['k'] = k + 1
+            if stop_option != 'iterations':
+                if norm_choice == '1':
+                    abs_err = float(np.sum(np.abs(X - X_prev)))
+                    norm_X = float(np.sum(np.abs(X)))
+                else: # Mặc định là chuẩn vô cùng
+                    abs_err = float(np.max(np.abs(X - X_prev)))
+                    norm_X = float(np.max(np.abs(X)))
+                rel_err = abs_err / norm_X if norm_X > 1e-12 else float('inf')
+                step_info['error'] = abs_err if stop_option == 'absolute_error' else rel_err
+            step_info['krylov_iters'] = inner_counter[0]
+            step_info['eta'] = float(eta)
+            iterations_data.append(step_info)
+
+            if (stop_option == 'absolute_error' and abs_err < tol) or \
+               (stop_option == 'relative_error' and rel_err < tol):
+                break
+
+            if F_norm_prev > 0:
+                eta = _forcing_term(eta, F_norm, F_norm_prev)
+        else:
+            if stop_option != 'iterations':
+                return {"success": False, "error": "Phương pháp không hội tụ sau 200 lần lặp."}
+
+        return {
+            "success": True,
+            "solution": X.tolist(),
+            "iterations": len(iterations_data),
+            "total_krylov_iterations": int(sum(step['krylov_iters'] for step in iterations_data)),
+            "residual_evaluations": residual_evaluations,
+            "steps": iterations_data,
+            "message": f"Hội tụ sau {len(iterations_data)} lần lặp."
+        }
+    except Exception as e:
+        import traceback
+        return {"success": False, "error": f"Lỗi: {str(e)}\n{traceback.format_exc()}"}
@@ -1,7 +1,8 @@
 import numpy as np
-from sympy import symbols, sympify, Matrix, lambdify
 from scipy.optimize import differential_evolution
 
+from numerical_methods.nonlinear_systems.system_cache import get_system_artifacts
+
 def find_global_maximum_on_box(func, variables, bounds):
     """Tìm GTLN của hàm nhiều biến trên miền hộp bằng thuật toán di truyền."""
     objective_func = lambda x: -np.abs(func(*x))
@@ -17,17 +18,17 @@ def solve_simple_iteration_system(n, expr_list, x0_list, a0_list, b0_list, stop_
     Giải hệ phương trình phi tuyến X = phi(X) bằng phương pháp lặp đơn.
     """
     try:
-        variables = symbols(f'x1:{n+1}')
-        phi = Matrix([sympify(expr) for expr in expr_list])
-        X = Matrix(x0_list)
+        system = get_system_artifacts(n, expr_list)
+        variables = system.variables
+        phi = system.residual
+        X = np.array(x0_list, dtype=float)
         bounds = list(zip(a0_list, b0_list))
-        J = phi.jacobian(variables)
 
         # Tính ma trận GTLN của các đạo hàm riêng
         J_max_vals = np.zeros((n, n))
         for i in range(n):
             for j in range(n):
-                func_to_optimize = lambdify(variables, J[i, j], 'numpy')
+                func_to_optimize = system.jacobian_entry_funcs[i][j]
                 max_val = find_global_maximum_on_box(func_to_optimize, variables, bounds)
                 if max_val == -np.inf:
                     return {"success": False, "error": f"Không thể tìm GTLN cho ∂φ_{i+1}/∂x_{j+1}."}
@@ -51,7 +52,7 @@ def solve_simple_iteration_system(n, expr_list, x0_list, a0_list, b0_list, stop_
         if stop_option == 'iterations':
             max_iter = int(stop_value)
             for k in range(max_iter):
-                X = phi.subs({variables[i]: X[i] for i in range(n)}).evalf()
+                X = phi(X)
                 step_info = {f"x{i+1}": float(X[i]) for i in range(n)}
                 step_info['k'] = k + 1
                 iterations_data.append(step_info)
@@ -60,24 +61,22 @@ def solve_simple_iteration_system(n, expr_list, x0_list, a0_list, b0_list, stop_
             priori_tol = tol * (1 - K) / K if K > 1e-12 else tol
 
             for k in range(200):
-                X_prev = X.copy()
-                X = phi.subs({variables[i]: X[i] for i in range(n)}).evalf()
-                
-                current_vec = np.array(X.tolist(), dtype=float).flatten()
-                prev_vec = np.array(X_prev.tolist(), dtype=float).flatten()
+                prev_vec = X
+                X = phi(X)
+                current_vec = X
                 diff_vec_abs = np.abs(current_vec - prev_vec)
 
                 # Tính sai số hậu nghiệm theo chuẩn tương ứng
                 if norm_to_use == '1':
-                    abs_err = np.sum(diff_vec_abs)
-                    norm_X = np.sum(np.abs(current_vec))
+                    abs_err = float(np.sum(diff_vec_abs))
+                    norm_X = float(np.sum(np.abs(current_vec)))
                 else:
-                    abs_err = np.max(diff_vec_abs)
-                    norm_X = np.max(np.abs(current_vec))
+                    abs_err = float(np.max(diff_vec_abs))
+                    norm_X = float(np.max(np.abs(current_vec)))
                 
                 rel_err = abs_err / norm_X if norm_X > 1e-12 else float('inf')
 
-                step_info = {f"x{i+1}": val for i, val in enumerate(current_vec)}
+                step_info = {f"x{i+1}": float(val) for i, val in enumerate(current_vec)}
                 step_info['k'] = k + 1
                 step_info['error'] = abs_err if stop_option == 'absolute_error' else rel_err
                 iterations_data.append(step_info)
@@ -0,0 +1,100 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from sympy import lambdify
+
+def detect_sparsity_pattern(F, variables):
+    """
+    Xác định cấu trúc thưa của ma trận Jacobi từ các biến xuất hiện trong từng f_i.
+
+    Phần tử (i, j) có thể khác 0 khi và chỉ khi x_j xuất hiện trong biểu thức f_i,
+    nên không cần tính đạo hàm ký hiệu.
+
+    Returns:
+        csr_matrix: Ma trận bool kích thước (số phương trình, số ẩn).
+    """
+    index = {var: j for j, var in enumerate(variables)}
+    rows, cols = [], []
+    for i, expr in enumerate(F):
+        for sym in expr.free_symbols:
+            j = index.get(sym)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+    data = np.ones(len(rows), dtype=bool)
+    return csr_matrix((data, (rows, cols)), shape=(len(F), len(variables)))
+
+def color_columns(pattern):
+    """
+    Tô màu tham lam các cột của cấu trúc thưa (thuật toán Curtis–Powell–Reid).
+
+    Hai cột cùng màu không có chung hàng khác 0, nên có thể nhiễu đồng thời
+    trong cùng một lần tính F. Các cột được duyệt theo số phần tử khác 0 giảm dần.
+
+    Returns:
+        np.ndarray: Màu (0, 1, 2, ...) của từng cột.
+    """
+    csc = pattern.tocsc()
+    num_rows, num_cols = csc.shape
+    colors = np.full(num_cols, -1, dtype=int)
+    used_rows = []  # used_rows[c]: các hàng đã bị chiếm bởi màu c
+    order = np.argsort(-np.diff(csc.indptr), kind='stable')
+    for j in order:
+        rows_j = csc.indices[csc.indptr[j]:csc.indptr[j + 1]]
+        for c, mask in enumerate(used_rows):
+            if not mask[rows_j].any():
+                mask[rows_j] = True
+                colors[j] = c
+                break
+        else:
+            mask = np.zeros(num_rows, dtype=bool)
+            mask[rows_j] = True
+            used_rows.append(mask)
+            colors[j] = len(used_rows) - 1
+    return colors
+
+def compile_residual(F, variables):
+    """
+    Biên dịch F thành hàm số NumPy có thể tính đồng thời tại nhiều điểm.
+
+    Hàm trả về nhận X có dạng (n,) hoặc (n, k) (mỗi cột là một điểm) và
+    trả về mảng giá trị có dạng (m,) hoặc (m, k) tương ứng.
+    """
+    f = lambdify(variables, list(F), 'numpy')
+
+    def residual(X):
+        X = np.asarray(X, dtype=float)
+        values = f(*X)
+        return np.array([np.broadcast_to(np.asarray(v, dtype=float), X.shape[1:]) for v in values])
+
+    return residual
+
+def sparse_fd_jacobian(residual, x, f0, pattern, colors):
+    """
+    Tính ma trận Jacobi thưa bằng sai phân tiến theo nhóm cột cùng màu.
+
+    Mỗi màu chỉ cần một lần tính F, và tất cả các lần tính được gộp vào
+    một lời gọi vector hóa của `residual`.
+
+    Args:
+        residual (callable): Hàm do `compile_residual` trả về.
+        x (np.ndarray): Điểm tính Jacobi.
+        f0 (np.ndarray): Giá trị F(x) đã có sẵn.
+        pattern (csr_matrix): Cấu trúc thưa từ `detect_sparsity_pattern`.
+        colors (np.ndarray): Màu của các cột từ `color_columns`.
+
+    Returns:
+        csr_matrix: Xấp xỉ J(x).
+    """
+    n = x.size
+    num_colors = int(colors.max()) + 1 if n > 0 else 0
+    h = np.sqrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(x))
+    h = (x + h) - x  # Bước h biểu diễn chính xác trong dấu phẩy động
+
+    seeds = np.zeros((n, num_colors))
+    seeds[np.arange(n), colors] = h
+    F_pert = residual(x[:, None] + seeds)
+    diff = F_pert - f0[:, None]
+
+    coo = pattern.tocoo()
+    values = diff[coo.row, colors[coo.col]] / h[coo.col]
+    return csr_matrix((values, (coo.row, coo.col)), shape=pattern.shape)
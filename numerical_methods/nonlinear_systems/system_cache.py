@@ -0,0 +1,74 @@
+from functools import cached_property, lru_cache
+
+import numpy as np
+from sympy import symbols, sympify, Matrix, latex, lambdify
+
+from numerical_methods.nonlinear_systems.sparse_jacobian import detect_sparsity_pattern, color_columns, compile_residual
+
+class SystemArtifacts:
+    """
+    Các đối tượng ký hiệu và hàm số đã biên dịch của một hệ F(X) (hoặc φ(X)).
+
+    Mỗi thành phần chỉ được tính ở lần truy cập đầu tiên, nên các lần giải lại
+    cùng một hệ (ví dụ với X₀ khác) không phải lặp lại các phép biến đổi ký hiệu.
+    """
+
+    def __init__(self, n, expressions):
+        self.n = n
+        self.variables = symbols(f'x1:{n+1}')
+        self.F = Matrix([sympify(expr) for expr in expressions])
+
+    @cached_property
+    def jacobian(self):
+        """Ma trận Jacobi ký hiệu."""
+        return self.F.jacobian(self.variables)
+
+    @cached_property
+    def jacobian_latex(self):
+        """Biểu diễn LaTeX của từng phần tử của ma trận Jacobi."""
+        try:
+            return [[latex(elem) for elem in row] for row in self.jacobian.tolist()]
+        except Exception:
+            return [[str(elem) for elem in row] for row in self.jacobian.tolist()]
+
+    @cached_property
+    def residual(self):
+        """F(X) đã biên dịch, tính được đồng thời tại nhiều điểm (xem `compile_residual`)."""
+        return compile_residual(self.F, self.variables)
+
+    @cached_property
+    def jacobian_func(self):
+        """J(X) đã biên dịch, trả về ma trận NumPy (n, n)."""
+        f = lambdify(self.variables, self.jacobian, 'numpy')
+        return lambda X: np.array(f(*X), dtype=float)
+
+    @cached_property
+    def raw_funcs(self):
+        """F và J đã lambdify, không ép kiểu (dùng được với đối số phức)."""
+        return (lambdify(self.variables, list(self.F), 'numpy'),
+                lambdify(self.variables, self.jacobian, 'numpy'))
+
+    @cached_property
+    def jacobian_entry_funcs(self):
+        """Từng phần tử ∂f_i/∂x_j đã lambdify (dùng để tìm GTLN trên miền hộp)."""
+        return [[lambdify(self.variables, self.jacobian[i, j], 'numpy') for j in range(self.n)]
+                for i in range(self.n)]
+
+    @cached_property
+    def sparsity(self):
+        """Cấu trúc thưa của J và màu các cột: (pattern, colors)."""
+        pattern = detect_sparsity_pattern(self.F, self.variables)
+        return pattern, color_columns(pattern)
+
+@lru_cache(maxsize=64)
+def _cached_artifacts(n, expressions):
+    return SystemArtifacts(n, expressions)
+
+def get_system_artifacts(n, expr_list):
+    """
+    Lấy (hoặc tạo) các đối tượng của hệ từ bộ nhớ đệm.
+
+    Khóa của bộ nhớ đệm là n cùng bộ các biểu thức đã bỏ khoảng trắng.
+    """
+    key = tuple(''.join(str(expr).split()) for expr in expr_list)
+    return _cached_artifacts(int(n), key)
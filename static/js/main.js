@@ -1619,9 +1619,9 @@ function displayGaussJordanResults(result) {
         return displayInverseResults(result, 'gauss-jordan');
     }
     let html = displayGenericHptResults('Kết Quả Giải Hệ Bằng Gauss-Jordan', result);
-    if (result.intermediate_steps) {
+    if (result.intermediate_trace) {
         html += `<div class="mt-10"><h3 class="result-heading">Các Bước Biến Đổi Ma Trận</h3><div class="space-y-8">`;
-        result.intermediate_steps.forEach(step => {
+        forEachTraceStep(result.intermediate_trace, step => {
             html += `<div><h4 class="font-medium text-gray-700 mb-2">${step.message}</h4><div class="matrix-display">${formatMatrix(step.matrix)}</div></div>`;
         });
         html += `</div></div>`;
@@ -1634,9 +1634,9 @@ function displayGaussJordanResults(result) {
 function displayGaussEliminationResults(result) {
     const resultsArea = document.getElementById('results-area');
     let html = displayGenericHptResults('Kết Quả Giải Hệ Bằng Khử Gauss', result);
-    if (result.forward_steps) {
+    if (result.forward_trace) {
         html += `<div class="mt-10"><h3 class="result-heading">Quy Trình Thuận</h3><div class="space-y-8">`;
-        result.forward_steps.forEach(step => {
+        forEachTraceStep(result.forward_trace, step => {
             html += `<div><h4 class="font-medium text-gray-700 mb-2">${step.message}</h4><div class="matrix-display">${formatMatrix(step.matrix)}</div></div>`;
         });
         html += `</div></div>`;
@@ -1682,9 +1682,9 @@ function displayLuResults(result) {
                         <div class="matrix-display">${formatMatrix(result.decomposition.U)}</div>
                      </div>`;
         }
-        if (result.lu_steps && result.lu_steps.length > 0) {
+        if (result.lu_trace && result.lu_trace.steps.length > 0) {
             html += `<div class="mt-8"><h3 class="result-heading">Các bước trung gian phân tích LU</h3>`;
-            result.lu_steps.forEach(step => {
+            forEachTraceStep(result.lu_trace, step => {
                 html += `
                     <div class="mb-4 p-3 bg-gray-50 rounded border">
                         <div class="font-semibold text-indigo-700 mb-2">Bước ${step.step}</div>
@@ -1713,10 +1713,10 @@ function displayLuResults(result) {
 function displayCholeskyResults(result) {
     const resultsArea = document.getElementById('results-area');
     let html = displayGenericHptResults('Kết Quả Giải Hệ Bằng Phân Tách Cholesky', result);
-    if (result.decomposition.M && result.transformation_message.includes('không đối xứng')) {
+    if (result.decomposition && result.decomposition.M && result.transformation_message.includes('không đối xứng')) {
          html += `<div class="mt-6"><h4 class="font-medium text-center text-gray-700">Ma trận M = AᵀA</h4><div class="matrix-display">${formatMatrix(result.decomposition.M)}</div></div>`;
     }
-    if (result.decomposition.U && result.decomposition.Ut) {
+    if (result.decomposition && result.decomposition.U && result.decomposition.Ut) {
         html += `<div class="mt-10"><h3 class="result-heading">Các Bước Phân Tách (M = UᵀU)</h3>`;
         html += `<div class="grid grid-cols-1 md:grid-cols-2 gap-8 mt-4">`;
         html += `<div><h4 class="font-medium text-center text-gray-700">Ma trận U</h4><div class="matrix-display">${formatMatrix(result.decomposition.U)}</div></div>`;
@@ -1855,6 +1855,22 @@ function displayDanilevskyResults(result) {
     attachCopyMatrixEvents();
 }
 
+// Duyệt các bước của một trace dạng nén {initial, steps: [{..., changes}]}:
+// mỗi bước chỉ chứa khối [rows] × [cols] đã thay đổi, nên ma trận được cập nhật dần tại chỗ.
+function forEachTraceStep(trace, callback) {
+    const state = {};
+    Object.entries(trace.initial).forEach(([name, matrix]) => { state[name] = matrix.map(row => row.slice()); });
+    trace.steps.forEach((step, idx) => {
+        const { changes, ...meta } = step;
+        Object.entries(changes).forEach(([name, change]) => {
+            change.rows.forEach((r, a) => {
+                change.cols.forEach((c, b) => { state[name][r][c] = change.values[a][b]; });
+            });
+        });
+        callback({ ...meta, ...state }, idx);
+    });
+}
+
 // Hiển thị kết quả hệ phương trình dạng tổng quát (dùng cho Gauss, Gauss-Jordan, LU, Cholesky)
 function displayGenericHptResults(title, result) {
     let html = `<h3 class="result-heading">${title}</h3>`;
@@ -1878,8 +1894,8 @@ function displayGenericHptResults(title, result) {
         html += `<div class="flex justify-center items-center flex-wrap"><span class="text-2xl mr-4">X = </span><div class="matrix-display !inline-block" title="Nghiệm riêng Xp">${formatMatrix(particular_solution)}</div>${termHtml}</div>`;
         html += `<p class="text-center text-sm text-gray-500 mt-2">Với t<sub>k</sub> là các tham số tự do.</p></div>`;
     } else if (result.status === 'no_solution') {
-         if (result.solution_matrix || (result.forward_steps && result.forward_steps.length > 0) ) {
-            const last_matrix = result.solution_matrix || result.forward_steps[result.forward_steps.length - 1].matrix;
+         if (result.solution_matrix) {
+            const last_matrix = result.solution_matrix;
             html += `<div class="mb-8"><h4 class="font-semibold text-gray-700 text-center text-xl mb-2">Dạng ma trận cuối cùng cho thấy sự mâu thuẫn:</h4><div class="matrix-display">${formatMatrix(last_matrix)}</div></div>`;
         }
     }
@@ -1895,10 +1911,13 @@ function setupNonlinearSystemSolveEvents() {
     const expressionsLabel = document.getElementById('ns-expressions-label');
     const calculateBtn = document.getElementById('calculate-ns-btn');
     const normGroup = document.getElementById('ns-norm-selection-group');
+    const x0Group = document.getElementById('ns-x0-group');
 
     const placeholders = {
         newton: "x_1^2 + x_2^2 - 1\nx_1^2 - x_2",
         newton_modified: "x_1^2 + x_2^2 - 1\nx_1^2 - x_2",
+        newton_krylov: "x_1^2 + x_2^2 - 1\nx_1^2 - x_2",
+        homotopy: "x_1^2 + x_2^2 - 1\nx_1^2 - x_2",
         simple_iteration: "\\sqrt{1 - x_2^2}\n\\sqrt{x_1}"
     };
 
@@ -1935,8 +1954,10 @@ function setupNonlinearSystemSolveEvents() {
             domainGroup.style.display = 'none';
         }
         
-        const showNormSelector = (method === 'newton' || method === 'newton_modified');
+        const showNormSelector = (method !== 'simple_iteration' && method !== 'homotopy');
         normGroup.style.display = showNormSelector ? 'block' : 'none';
+        // PP đồng luân không cần X₀ và không dùng điều kiện dừng
+        x0Group.style.display = (method === 'homotopy') ? 'none' : 'block';
         
         renderSystemLatex();
     }
@@ -1968,10 +1989,13 @@ function setupNonlinearSystemSolveEvents() {
         const expressions = latexExpressions.map(latexToPython);
         const n = expressions.length;
 
-        const x0_lines = x0Input.value.trim().split('\n').filter(line => line.trim() !== '');
-        if (x0_lines.length !== n) return displayError(`Số lượng giá trị ban đầu (${x0_lines.length}) không khớp với số phương trình (${n}).`);
-        const x0 = x0_lines.map(val => parseFloat(val.trim()));
-        if (x0.some(isNaN)) return displayError('Giá trị ban đầu X₀ không hợp lệ.');
+        let x0 = [];
+        if (method !== 'homotopy') {
+            const x0_lines = x0Input.value.trim().split('\n').filter(line => line.trim() !== '');
+            if (x0_lines.length !== n) return displayError(`Số lượng giá trị ban đầu (${x0_lines.length}) không khớp với số phương trình (${n}).`);
+            x0 = x0_lines.map(val => parseFloat(val.trim()));
+            if (x0.some(isNaN)) return displayError('Giá trị ban đầu X₀ không hợp lệ.');
+        }
 
         const normChoiceEl = document.querySelector('input[name="ns-norm-option"]:checked');
         const normChoice = normChoiceEl ? normChoiceEl.value : 'infinity';
@@ -2018,6 +2042,12 @@ function displayNonlinearSystemResults(result) {
         html += `<div class="mb-8"><h4 class="font-semibold text-gray-700 text-center text-xl mb-2">Nghiệm X ≈</h4><div class="matrix-display">${formatMatrix(solMatrix)}</div></div>`;
     }
 
+    if (result.solutions && result.solutions.length > 0) {
+        // Mỗi cột là một nghiệm
+        const solMatrix = result.solutions[0].map((_, i) => result.solutions.map(sol => sol[i]));
+        html += `<div class="mb-8"><h4 class="font-semibold text-gray-700 text-center text-xl mb-2">Các nghiệm tìm được (mỗi cột một nghiệm, số Bézout = ${result.bezout_number})</h4><div class="matrix-display">${formatMatrix(solMatrix)}</div></div>`;
+    }
+
     if (result.J_max_vals) {
         html += `<div class="mt-8 p-4 border rounded-lg bg-gray-50">
                     <h4 class="font-semibold text-gray-700 text-lg mb-3 text-center">Phân Tích Hội Tụ</h4>
@@ -2057,7 +2087,10 @@ function displayNonlinearSystemResults(result) {
         const headers = Object.keys(result.steps[0]);
         // Sửa lại tên cột error cho thân thiện hơn
         const headerDisplayMap = {
-            'error': 'Sai số'
+            'error': 'Sai số',
+            'krylov_iters': 'Số lần lặp GMRES',
+            'eta': 'η',
+            'step_length': 'Độ dài bước t'
         }
         html += `<div class="overflow-x-auto"><table class=" collapsible-table min-w-full divide-y divide-gray-200">
                     <thead class="bg-gray-50"><tr>`;
@@ -0,0 +1,47 @@
+# /utils/matrix_parser.py
+import numpy as np
+import scipy.sparse as sp
+
+# Ma trận thưa có mật độ lớn hơn ngưỡng này (hoặc kích thước nhỏ) được chuyển về dạng đầy đủ
+SPARSE_DENSITY_THRESHOLD = 0.1
+SMALL_MATRIX_SIZE = 100
+# Kích thước tối đa để chuyển ma trận thưa suy biến về thuật toán đầy đủ (phân loại nghiệm)
+DENSE_FALLBACK_MAX_SIZE = 2000
+
+def parse_matrix(payload):
+    """
+    Chuyển dữ liệu ma trận từ JSON thành mảng NumPy hoặc ma trận thưa SciPy.
+
+    Chấp nhận:
+      - danh sách lồng nhau (ma trận đầy đủ) -> np.ndarray;
+      - {"format": "coo", "shape": [m, n], "row": [...], "col": [...], "data": [...]};
+      - {"format": "csr", "shape": [m, n], "indptr": [...], "indices": [...], "data": [...]}.
+    Hai dạng sau được giữ nguyên là scipy.sparse.csr_matrix (các phần tử trùng
+    chỉ số trong COO được cộng dồn).
+    """
+    if not isinstance(payload, dict):
+        return np.array(payload, dtype=float)
+    fmt = str(payload.get('format', 'coo')).lower()
+    shape = tuple(int(s) for s in payload['shape'])
+    data = np.asarray(payload['data'], dtype=float)
+    if fmt == 'coo':
+        matrix = sp.coo_matrix((data, (np.asarray(payload['row'], dtype=int), np.asarray(payload['col'], dtype=int))), shape=shape)
+    elif fmt == 'csr':
+        matrix = sp.csr_matrix((data, np.asarray(payload['indices'], dtype=int), np.asarray(payload['indptr'], dtype=int)), shape=shape)
+    else:
+        raise ValueError(f"Định dạng ma trận thưa '{fmt}' không được hỗ trợ (chỉ hỗ trợ 'coo' hoặc 'csr').")
+    matrix = matrix.tocsr()
+    matrix.sum_duplicates()
+    return matrix
+
+def should_densify(matrix, density_threshold=SPARSE_DENSITY_THRESHOLD, small_size=SMALL_MATRIX_SIZE):
+    """Ma trận thưa nên được xử lý ở dạng đầy đủ khi đủ dày hoặc đủ nhỏ."""
+    if not sp.issparse(matrix):
+        return False
+    m, n = matrix.shape
+    density = matrix.nnz / max(m * n, 1)
+    return density > density_threshold or max(m, n) <= small_size
+
+def densify(matrix):
+    """Chuyển ma trận thưa (nếu có) về mảng NumPy đầy đủ."""
+    return matrix.toarray() if sp.issparse(matrix) else matrix